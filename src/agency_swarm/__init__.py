@@ -25,8 +25,11 @@ from .context import MasterContext  # noqa: E402
 from .hooks import PersistenceHooks  # noqa: E402
 from .integrations.fastapi import run_fastapi  # noqa: E402
 from .integrations.mcp_server import run_mcp  # noqa: E402
+from .messages import HistoryPolicy  # noqa: E402
 from .tools import BaseTool  # noqa: E402
 from .tools.send_message import SendMessage  # noqa: E402
+from .utils.compaction import CompactionConfig  # noqa: E402
+from .utils.sqlite_store import SQLiteThreadStore  # noqa: E402
 from .utils.thread import ThreadManager  # noqa: E402
 
 __all__ = [
@@ -34,10 +37,13 @@ __all__ = [
     "Agency",
     "AgencyContext",
     "BaseTool",
+    "CompactionConfig",
+    "HistoryPolicy",
     "MasterContext",
     "ThreadManager",
     "PersistenceHooks",
     "SendMessage",
+    "SQLiteThreadStore",
     "run_fastapi",
     "run_mcp",
     # Re-exports from Agents SDK
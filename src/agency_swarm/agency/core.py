@@ -1,8 +1,11 @@
 # --- Core Agency class definition ---
+import asyncio
+import copy
+import dataclasses
 import logging
 import os
 import warnings
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Hashable
 from typing import Any
 
 from agents import RunConfig, RunHooks, RunResult, TResponseInputItem
@@ -11,7 +14,13 @@ from agency_swarm.agent.agent_flow import AgentFlow
 from agency_swarm.agent.core import AgencyContext, Agent
 from agency_swarm.hooks import PersistenceHooks
 from agency_swarm.streaming.utils import EventStreamMerger
-from agency_swarm.utils.thread import ThreadLoadCallback, ThreadManager, ThreadSaveCallback
+from agency_swarm.tools.cache import ToolResultCache
+from agency_swarm.tools.concurrency import ConcurrencyGroup, ToolConcurrencyManager
+from agency_swarm.tools.mcp_manager import MCPServerManager
+from agency_swarm.utils.compaction import CompactionConfig, ThreadCompactor
+from agency_swarm.utils.sqlite_store import SQLiteThreadStore
+from agency_swarm.utils.thread import ThreadAppendCallback, ThreadLoadCallback, ThreadManager, ThreadSaveCallback
+from agency_swarm.utils.write_behind import WriteBehindConfig
 
 # Import split module functions
 from .helpers import get_class_folder_path, handle_deprecated_agency_args, read_instructions
@@ -56,6 +65,11 @@ class Agency:
         shared_instructions (str | None): Optional instructions prepended to every agent's system prompt.
         user_context (dict[str, Any]): A dictionary for shared user-defined context within `MasterContext` during runs.
         send_message_tool_class (type | None): Default SendMessage tool class override.
+        mcp_manager (MCPServerManager): Keeps the agents' MCP servers connected across runs.
+        tool_concurrency_groups (dict[str, ConcurrencyGroup]): Agency-wide tool concurrency limits by group name.
+        tool_caches (dict[Hashable, ToolResultCache]): Outputs of tools cached with `scope="agency"`, by tool.
+        tool_schedulers (dict[str, ToolConcurrencyManager] | None): Tool schedulers of the agents, by agent name,
+            for copies made with `clone`. None means the agents' own `tool_concurrency_manager` is used.
     """
 
     agents: dict[str, Agent]
@@ -66,6 +80,10 @@ class Agency:
     shared_instructions: str | None
     user_context: dict[str, Any]  # Shared user context for MasterContext
     send_message_tool_class: type | None  # Custom SendMessage tool class for all agents
+    mcp_manager: MCPServerManager
+    tool_concurrency_groups: dict[str, ConcurrencyGroup]
+    tool_caches: dict[Hashable, ToolResultCache]
+    tool_schedulers: dict[str, ToolConcurrencyManager] | None
 
     # Context Factory Pattern - Agency owns agent contexts
     _agent_contexts: dict[str, AgencyContext]  # agent_name -> context mapping
@@ -83,6 +101,12 @@ class Agency:
         send_message_tool_class: type | None = None,
         load_threads_callback: ThreadLoadCallback | None = None,
         save_threads_callback: ThreadSaveCallback | None = None,
+        append_threads_callback: ThreadAppendCallback | None = None,
+        write_behind: bool | WriteBehindConfig = False,
+        thread_store: SQLiteThreadStore | None = None,
+        compaction: CompactionConfig | None = None,
+        mcp_manager: MCPServerManager | None = None,
+        tool_concurrency_limits: dict[str, int | ConcurrencyGroup] | None = None,
         user_context: dict[str, Any] | None = None,
         **kwargs: Any,
     ):
@@ -114,6 +138,24 @@ class Agency:
                 enabling custom inter-agent communication patterns.
             load_threads_callback (ThreadLoadCallback | None, optional): Callable to load conversation threads.
             save_threads_callback (ThreadSaveCallback | None, optional): Callable to save conversation threads.
+            append_threads_callback (ThreadAppendCallback | None, optional): Callable receiving only newly added
+                messages and their start index in the flat history. Takes precedence over `save_threads_callback`
+                for incremental saves.
+            write_behind (bool | WriteBehindConfig, optional): Run save callbacks on a background thread with
+                debouncing instead of inline on every added message. Pending saves are flushed at the end of
+                every agent run. Defaults to False.
+            thread_store (SQLiteThreadStore | None, optional): Built-in store used instead of the thread callbacks.
+                History is loaded lazily per conversation and new messages are appended incrementally.
+            compaction (CompactionConfig | None, optional): Automatically summarize older messages in the
+                background once the thread crosses a message or token threshold. Recent turns stay verbatim
+                and the compacted thread is persisted. Defaults to None (no compaction).
+            mcp_manager (MCPServerManager | None, optional): Manager that keeps MCP server sessions open across
+                runs. Pass the same manager to several agencies (e.g. per-request agencies in FastAPI) to share
+                their sessions. Defaults to a new manager owned by this agency.
+            tool_concurrency_limits (dict[str, int | ConcurrencyGroup] | None, optional): Maximum simultaneous
+                calls per concurrency group, shared by all tools (of any agent) whose `ToolConfig.concurrency_group`
+                names the group. Extra calls wait in line. Pass `ConcurrencyGroup` instances to share a limit
+                between agencies. Defaults to None (no agency-wide limits).
             user_context (dict[str, Any] | None, optional): Initial shared context accessible to all agents.
             **kwargs: Catches other deprecated parameters, issuing warnings if used.
 
@@ -191,10 +233,24 @@ class Agency:
         self.send_message_tool_class = send_message_tool_class
 
         # --- Initialize Core Components ---
+        self._write_behind = write_behind
+        self._thread_store = thread_store
+        self._compaction = compaction
         self.thread_manager = ThreadManager(
-            load_threads_callback=final_load_threads_callback, save_threads_callback=final_save_threads_callback
+            load_threads_callback=final_load_threads_callback,
+            save_threads_callback=final_save_threads_callback,
+            append_threads_callback=append_threads_callback,
+            write_behind=write_behind,
+            thread_store=thread_store,
         )
         self.event_stream_merger = EventStreamMerger()
+        self.mcp_manager = mcp_manager or MCPServerManager()
+        self.tool_concurrency_groups = {
+            group_name: limit if isinstance(limit, ConcurrencyGroup) else ConcurrencyGroup(group_name, limit)
+            for group_name, limit in (tool_concurrency_limits or {}).items()
+        }
+        self.tool_caches = {}
+        self.tool_schedulers = None
         self.persistence_hooks = None
         if final_load_threads_callback and final_save_threads_callback:
             self.persistence_hooks = PersistenceHooks(final_load_threads_callback, final_save_threads_callback)
@@ -214,6 +270,8 @@ class Agency:
         logger.info(f"Registered agents: {list(self.agents.keys())}")
         logger.info(f"Designated entry points: {[ep.name for ep in self.entry_points]}")
 
+        self._attach_compactor()
+
         # --- Store communication flows for visualization ---
         self._derived_communication_flows = _derived_communication_flows
         self._communication_tool_classes = _communication_tool_classes
@@ -227,6 +285,89 @@ class Agency:
 
         logger.info("Agency initialization complete.")
 
+    def clone(
+        self,
+        *,
+        load_threads_callback: ThreadLoadCallback | None = None,
+        save_threads_callback: ThreadSaveCallback | None = None,
+        append_threads_callback: ThreadAppendCallback | None = None,
+        thread_store: SQLiteThreadStore | None = None,
+        user_context: dict[str, Any] | None = None,
+    ) -> "Agency":
+        """
+        Create a copy of this agency with its own conversation thread.
+
+        The copy shares the configured agents, communication flows and MCP sessions, so it
+        costs a fraction of building a new `Agency`: nothing is re-instantiated, re-parsed or
+        fetched from the API. Per-run instructions and attachments are applied as overlays
+        rather than written to the agents, so copies can run concurrently. This is how
+        `run_fastapi(pooled=True)` serves each request.
+
+        Args:
+            load_threads_callback (ThreadLoadCallback | None, optional): Loads the copy's history.
+            save_threads_callback (ThreadSaveCallback | None, optional): Saves the copy's history.
+            append_threads_callback (ThreadAppendCallback | None, optional): Receives the copy's new messages.
+            thread_store (SQLiteThreadStore | None, optional): Store of the copy's history. Defaults to this
+                agency's `thread_store`, which then takes precedence over the callbacks, so that pooled
+                copies keep lazy loading and persisting through it.
+            user_context (dict[str, Any] | None, optional): Shared context of the copy. Defaults to a deep
+                copy of this agency's context.
+
+        Returns:
+            Agency: The copy, with a fresh `ThreadManager`.
+
+        Raises:
+            ValueError: If `thread_store` is combined with thread callbacks.
+        """
+        if thread_store is None and self._thread_store is not None:
+            thread_store = self._thread_store
+            if load_threads_callback or save_threads_callback or append_threads_callback:
+                logger.debug("Agency has a thread_store; the clone's thread callbacks are ignored.")
+                load_threads_callback = save_threads_callback = append_threads_callback = None
+        clone = copy.copy(self)
+        clone.user_context = copy.deepcopy(self.user_context) if user_context is None else user_context
+        clone.thread_manager = ThreadManager(
+            load_threads_callback=load_threads_callback,
+            save_threads_callback=save_threads_callback,
+            append_threads_callback=append_threads_callback,
+            write_behind=self._write_behind,
+            thread_store=thread_store,
+        )
+        clone._thread_store = thread_store
+        clone.event_stream_merger = EventStreamMerger()
+        # The agents are shared, so each copy schedules their tools separately: one_call_at_a_time
+        # and max_concurrency apply per conversation, not across all requests of a server.
+        clone.tool_schedulers = {}
+        clone.persistence_hooks = None
+        if load_threads_callback and save_threads_callback:
+            clone.persistence_hooks = PersistenceHooks(load_threads_callback, save_threads_callback)
+        clone._agent_contexts = {
+            agent_name: dataclasses.replace(
+                context,
+                agency_instance=clone,
+                thread_manager=clone.thread_manager,
+                subagents=dict(context.subagents),
+                load_threads_callback=load_threads_callback,
+                save_threads_callback=save_threads_callback,
+            )
+            for agent_name, context in self._agent_contexts.items()
+        }
+        clone._attach_compactor()
+        return clone
+
+    def _attach_compactor(self) -> None:
+        """Attach background compaction to the thread manager if it is configured."""
+        if self._compaction is None:
+            return
+        summary_agent = self.entry_points[0] if self.entry_points else next(iter(self.agents.values()))
+        self.thread_manager.set_compactor(
+            ThreadCompactor(
+                self._compaction,
+                client=lambda: summary_agent.client,
+                model=summary_agent.model if isinstance(summary_agent.model, str) else None,
+            )
+        )
+
     # Private helper methods that were missed during split
     def _get_agent_context(self, agent_name: str) -> AgencyContext:
         """Get the agency context for a specific agent."""
@@ -234,6 +375,26 @@ class Agency:
             raise ValueError(f"No context found for agent: {agent_name}")
         return self._agent_contexts[agent_name]
 
+    async def prepare(self) -> None:
+        """
+        Finish the setup that agents created with ``defer_file_setup=True`` skipped.
+
+        Sets up the files folders and vector stores of all agents concurrently. Runs also
+        prepare their agents on first use, so calling this is optional; servers call it at
+        startup to warm up and use `is_ready` as a readiness signal.
+        """
+        await asyncio.gather(*(agent.prepare() for agent in self.agents.values()))
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether every agent has finished its setup (see `prepare`)."""
+        return all(agent.is_prepared for agent in self.agents.values())
+
+    async def aclose(self) -> None:
+        """Close the MCP server sessions opened on the running event loop and flush pending thread saves."""
+        await self.mcp_manager.aclose()
+        await self.thread_manager.aclose()
+
     # Import and bind methods from split modules with proper type hints
     async def get_response(
         self,
@@ -412,6 +573,7 @@ class Agency:
         app_token_env: str = "APP_TOKEN",
         cors_origins: list[str] | None = None,
         enable_agui: bool = False,
+        pooled: bool = False,
     ):
         """Serve this agency via the FastAPI integration.
 
@@ -422,10 +584,13 @@ class Agency:
         cors_origins : list[str] | None
             Optional list of allowed CORS origins passed through to
             :func:`run_fastapi`.
+        pooled : bool
+            Serve every request from a cheap copy of this agency (see :meth:`clone`)
+            instead of constructing a new agency per request.
         """
         from .helpers import run_fastapi
 
-        return run_fastapi(self, host, port, app_token_env, cors_origins, enable_agui)
+        return run_fastapi(self, host, port, app_token_env, cors_origins, enable_agui, pooled)
 
     def get_agency_structure(self, include_tools: bool = True) -> dict[str, Any]:
         """Return a ReactFlow-compatible JSON structure describing the agency."""
@@ -172,6 +172,7 @@ def run_fastapi(
     app_token_env: str = "APP_TOKEN",
     cors_origins: list[str] | None = None,
     enable_agui: bool = False,
+    pooled: bool = False,
 ) -> None:
     """Serve this agency via the FastAPI integration.
 
@@ -182,11 +183,16 @@ def run_fastapi(
     cors_origins : list[str] | None
         Optional list of allowed CORS origins passed through to
         :func:`run_fastapi`.
+    pooled : bool
+        Serve every request from :meth:`Agency.clone` of this agency instead of
+        constructing a new agency per request.
     """
     from agency_swarm import Agency
     from agency_swarm.integrations.fastapi import run_fastapi
 
-    def agency_factory(*, load_threads_callback=None, save_threads_callback=None, **_: Any) -> Agency:
+    def agency_factory(
+        *, load_threads_callback=None, save_threads_callback=None, append_threads_callback=None, **_: Any
+    ) -> Agency:
         flows: list[Any] = []
         for sender, receiver in agency._derived_communication_flows:
             tool_cls = agency._communication_tool_classes.get((sender.name, receiver.name))
@@ -200,16 +206,22 @@ def run_fastapi(
             send_message_tool_class=agency.send_message_tool_class,
             load_threads_callback=load_threads_callback,
             save_threads_callback=save_threads_callback,
+            append_threads_callback=append_threads_callback,
+            mcp_manager=agency.mcp_manager,
             user_context=deepcopy(agency.user_context),
         )
 
+    def warm_agency_factory(**_: Any) -> Agency:
+        return agency
+
     run_fastapi(
-        agencies={agency.name or "agency": agency_factory},
+        agencies={agency.name or "agency": warm_agency_factory if pooled else agency_factory},
         host=host,
         port=port,
         app_token_env=app_token_env,
         cors_origins=cors_origins,
         enable_agui=enable_agui,
+        pooled=pooled,
     )
 
 
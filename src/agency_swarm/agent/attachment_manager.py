@@ -7,10 +7,14 @@ from agents import CodeInterpreterTool, TResponseInputItem
 from agents.exceptions import AgentsException
 from agents.items import ItemHelpers
 
+from agency_swarm.utils.file_metadata import get_file_metadata_cache
+from agency_swarm.utils.vector_store_cache import get_vector_store_cache
+
 if TYPE_CHECKING:
     from agency_swarm import Agent
 
 from .file_manager import CODE_INTERPRETER_FILE_EXTENSIONS, FILE_SEARCH_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS
+from .run_overlay import RunOverlay
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +38,9 @@ class AttachmentManager:
         """
         Create or retrieve a temporary vector store for attachments.
 
+        The id is cached per account, so the account's vector stores are only listed
+        the first time a name is resolved.
+
         Args:
             vs_name: Name for the temporary vector store
 
@@ -41,20 +48,16 @@ class AttachmentManager:
             str: Vector store ID
         """
         logger.info(f"Attachments vector store for agent {self.agent.name}: {vs_name}")
-        existing_vs = self.agent.client_sync.vector_stores.list()
-        existing_vs_names = [vs.name for vs in existing_vs.data]
-        if vs_name in existing_vs_names:
-            return existing_vs.data[existing_vs_names.index(vs_name)].id
-        else:
-            created_vs = self.agent.client_sync.vector_stores.create(name=vs_name)
-            return created_vs.id
-
-    async def sort_file_attachments(self, file_ids: list[str]) -> list[dict]:
+        return get_vector_store_cache().resolve(self.agent.client_sync, vs_name)
+
+    async def sort_file_attachments(self, file_ids: list[str], run_overlay: RunOverlay | None = None) -> list[dict]:
         """
         Sort file attachments by type and prepare them for processing.
 
         Args:
             file_ids: List of OpenAI file IDs
+            run_overlay: Overlay of the current run. Code interpreter files are added to it
+                instead of to the agent's tools, so concurrent runs do not share attachments.
 
         Returns:
             list: Content items for PDF files that can be directly attached to messages
@@ -63,8 +66,9 @@ class AttachmentManager:
         code_interpreter_ids = []
         image_file_ids = []
 
+        filenames = await self._get_filenames_by_ids(file_ids)
         for file_id in file_ids:
-            filename = self._get_filename_by_id(file_id)
+            filename = filenames[file_id]
             extension = Path(filename).suffix.lower()
             # Use code interpreter for all file types except .go, pdf, and images
             code_interpreter_extensions = [
@@ -108,7 +112,10 @@ class AttachmentManager:
                 logger.warning(f"Invalid file_id format: {file_id} for agent {self.agent.name}")
 
         # Add temporary tools for other file types
-        if code_interpreter_ids:
+        if code_interpreter_ids and run_overlay is not None:
+            logger.info(f"Adding file ids: {code_interpreter_ids} to {self.agent.name}'s code interpreter for this run")
+            run_overlay.code_interpreter_file_ids.extend(code_interpreter_ids)
+        elif code_interpreter_ids:
             logger.info(f"Adding file ids: {code_interpreter_ids} for {self.agent.name}'s code interpreter")
             self.agent.file_manager.add_code_interpreter_tool(code_interpreter_ids)  # type: ignore[union-attr]
             self._temp_code_interpreter_file_ids = code_interpreter_ids
@@ -144,8 +151,12 @@ class AttachmentManager:
 
     def _get_filename_by_id(self, file_id: str) -> str:
         """Get the filename of a file by its ID"""
-        file_data = self.agent.client_sync.files.retrieve(file_id)
-        return file_data.filename
+        return get_file_metadata_cache().retrieve(file_id, self.agent.client_sync).filename
+
+    async def _get_filenames_by_ids(self, file_ids: list[str]) -> dict[str, str]:
+        """Get the filenames of several files, retrieving the uncached ones concurrently"""
+        metadata = await get_file_metadata_cache().aretrieve_many(file_ids, self.agent.client)
+        return {file_id: file_metadata.filename for file_id, file_metadata in metadata.items()}
 
     async def prepare_and_attach_files(
         self,
@@ -153,6 +164,7 @@ class AttachmentManager:
         file_ids: list[str] | None,
         message_files: list[str] | None,
         kwargs: dict[str, Any],
+        run_overlay: RunOverlay | None = None,
     ) -> None:
         """Handle file attachments for messages."""
         files_to_attach = file_ids or message_files or kwargs.get("file_ids") or kwargs.get("message_files")
@@ -179,7 +191,7 @@ class AttachmentManager:
                     else:
                         content_list = []
 
-                    file_content_items = await self.sort_file_attachments(files_to_attach)
+                    file_content_items = await self.sort_file_attachments(files_to_attach, run_overlay)
                     content_list.extend(file_content_items)
 
                     # Update the message content
@@ -199,6 +211,7 @@ class AttachmentManager:
         message_files: list[str] | None,
         kwargs: dict[str, Any],
         method_name: str = "execution",
+        run_overlay: RunOverlay | None = None,
     ) -> list[TResponseInputItem]:
         """Process message and handle file attachments. Returns processed_items."""
         # Process current message items
@@ -209,6 +222,8 @@ class AttachmentManager:
             raise AgentsException(f"Failed to process input message for agent {self.agent.name}") from e
 
         # Handle file attachments
-        await self.prepare_and_attach_files(processed_current_message_items, file_ids, message_files, kwargs)
+        await self.prepare_and_attach_files(
+            processed_current_message_items, file_ids, message_files, kwargs, run_overlay
+        )
 
         return processed_current_message_items
@@ -1,13 +1,15 @@
+import asyncio
 import inspect
 import logging
 import os
+import threading
 import warnings
 from collections.abc import AsyncGenerator, Callable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, TypeVar
 
-from agents import Agent as BaseAgent, RunConfig, RunHooks, RunResult, Tool, TResponseInputItem
+from agents import Agent as BaseAgent, RunConfig, RunContextWrapper, RunHooks, RunResult, Tool, TResponseInputItem
 from openai import AsyncOpenAI, OpenAI
 
 from agency_swarm.agent import (
@@ -24,8 +26,10 @@ from agency_swarm.agent import (
 from agency_swarm.agent.agent_flow import AgentFlow
 from agency_swarm.agent.attachment_manager import AttachmentManager
 from agency_swarm.agent.file_manager import AgentFileManager
+from agency_swarm.agent.run_overlay import get_run_overlay
 from agency_swarm.agent.tools import _attach_one_call_guard
 from agency_swarm.context import MasterContext
+from agency_swarm.messages.history_window import HistoryPolicy
 from agency_swarm.tools.concurrency import ToolConcurrencyManager
 from agency_swarm.utils.thread import ThreadManager
 
@@ -44,6 +48,8 @@ AGENT_PARAMS = {
     "include_search_results",
     "validation_attempts",
     "throw_input_guardrail_error",
+    "history_policy",
+    "defer_file_setup",
     # Old/Deprecated (to check in kwargs)
     "id",
     "tool_resources",
@@ -96,6 +102,8 @@ class Agent(BaseAgent[MasterContext]):
     include_search_results: bool = False
     validation_attempts: int = 1
     throw_input_guardrail_error: bool = False
+    history_policy: HistoryPolicy | None = None  # Limits the history sent to the model each turn
+    defer_file_setup: bool = False  # Set up files_folder in prepare() instead of the constructor
 
     # --- Internal State ---
     _associated_vector_store_id: str | None = None
@@ -134,6 +142,12 @@ class Agent(BaseAgent[MasterContext]):
             validation_attempts (int): Number of retries when an output guardrail trips. Defaults to 1.
             throw_input_guardrail_error (bool): Whether to raise input guardrail errors as exceptions.
                 Defaults to False.
+            history_policy (HistoryPolicy | None): Token budget and pinned first/last items for the
+                conversation history sent to the model, applied to user and agent-to-agent threads.
+                Defaults to None (full history).
+            defer_file_setup (bool): Skip the files folder and vector store setup (filesystem and OpenAI
+                calls) during construction. It runs in ``prepare()``, which ``Agency.prepare()`` calls for
+                all agents concurrently, or on first use. Defaults to False.
 
         ## OpenAI Agents SDK Parameters:
             prompt (Prompt | DynamicPromptFunction | None): Dynamic prompt configuration.
@@ -210,11 +224,15 @@ class Agent(BaseAgent[MasterContext]):
         self.include_search_results = current_agent_params.get("include_search_results", False)
         self.validation_attempts = int(current_agent_params.get("validation_attempts", 1))
         self.throw_input_guardrail_error = bool(current_agent_params.get("throw_input_guardrail_error", False))
+        self.history_policy = current_agent_params.get("history_policy")
+        self.defer_file_setup = bool(current_agent_params.get("defer_file_setup", False))
 
         # Internal state
         self._openai_client = None
         self._openai_client_sync = None
         self._tool_concurrency_manager = ToolConcurrencyManager()
+        self._file_setup_lock = threading.Lock()
+        self._file_setup_done = threading.Event()
 
         # Initialize execution handler
         self._execution = Execution(self)
@@ -236,7 +254,10 @@ class Agent(BaseAgent[MasterContext]):
             raise RuntimeError(f"Agent {self.name} has no file manager configured")
 
         self.file_manager.read_instructions()
-        self.file_manager._parse_files_folder_for_vs_id()
+        if not self.files_folder:
+            self._file_setup_done.set()
+        elif not self.defer_file_setup:
+            self._setup_files()
         parse_schemas(self)
         load_tools_from_folder(self)
 
@@ -297,6 +318,19 @@ class Agent(BaseAgent[MasterContext]):
         """Provides access to the agent's tool concurrency manager."""
         return self._tool_concurrency_manager
 
+    # --- Per-run overlays ---
+    async def get_system_prompt(self, run_context: RunContextWrapper[MasterContext]) -> str | None:
+        """Resolve the instructions, including additions that belong to the current run only."""
+        instructions = await super().get_system_prompt(run_context)
+        overlay = get_run_overlay(self, run_context)
+        return overlay.apply_instructions(instructions) if overlay else instructions
+
+    async def get_all_tools(self, run_context: RunContextWrapper[MasterContext]) -> list[Tool]:
+        """Return the tools for a run, including tools added for the current run only."""
+        tools = await super().get_all_tools(run_context)
+        overlay = get_run_overlay(self, run_context)
+        return overlay.apply_tools(tools) if overlay else tools
+
     # --- Tool Management ---
     def add_tool(self, tool: Tool) -> None:
         """
@@ -325,10 +359,36 @@ class Agent(BaseAgent[MasterContext]):
         """Parse OpenAPI schemas from the schemas folder and create tools."""
         parse_schemas(self)
 
+    # --- Deferred Setup ---
+    @property
+    def is_prepared(self) -> bool:
+        """Whether the files folder and its vector store are set up."""
+        return self._file_setup_done.is_set()
+
+    async def prepare(self) -> None:
+        """
+        Set up the files folder and vector store if construction deferred it.
+
+        The blocking filesystem and OpenAI calls run in a worker thread. Safe to call
+        repeatedly and concurrently; runs call it on first use.
+        """
+        if not self._file_setup_done.is_set():
+            await asyncio.to_thread(self._setup_files)
+
+    def _setup_files(self) -> None:
+        with self._file_setup_lock:
+            if self._file_setup_done.is_set():
+                return
+            if self.file_manager is None:
+                raise RuntimeError(f"Agent {self.name} has no file manager configured")
+            self.file_manager._parse_files_folder_for_vs_id()
+            self._file_setup_done.set()
+
     # --- File Handling ---
     def upload_file(self, file_path: str, include_in_vector_store: bool = True) -> str:
         """Upload a file using the agent's file manager."""
         if self.file_manager:
+            self._setup_files()
             return self.file_manager.upload_file(file_path, include_in_vector_store)
         raise RuntimeError(f"Agent {self.name} has no file manager configured")
 
@@ -370,6 +430,7 @@ class Agent(BaseAgent[MasterContext]):
         Returns:
             RunResult: The complete execution result
         """
+        await self.prepare()
         # If no agency context provided, create a minimal one for standalone usage
         if agency_context is None:
             agency_context = self._create_minimal_context()
@@ -413,11 +474,12 @@ class Agent(BaseAgent[MasterContext]):
             message_files: DEPRECATED: Use file_ids instead. File IDs to attach to the message
             file_ids: List of OpenAI file IDs to attach to the message
             agency_context: AgencyContext for this execution (provided by Agency, or None for standalone use)
-            **kwargs: Additional keyword arguments
+            **kwargs: Additional keyword arguments including max_turns and stream_buffer_size
 
         Yields:
             Stream events from the agent's execution
         """
+        await self.prepare()
         # If no agency context provided, create a minimal one for standalone usage
         if agency_context is None:
             agency_context = self._create_minimal_context()
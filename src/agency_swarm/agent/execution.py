@@ -75,9 +75,7 @@ class Execution:
         logger.info(f"Agent '{self.agent.name}' starting run.")
 
         # Common setup and validation
-        original_instructions = setup_execution(
-            self.agent, sender_name, agency_context, additional_instructions, "get_response"
-        )
+        run_overlay = setup_execution(self.agent, sender_name, agency_context, additional_instructions, "get_response")
 
         master_context_for_run = None
         try:
@@ -86,7 +84,7 @@ class Execution:
             if self.agent.attachment_manager is None:
                 raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
             processed_current_message_items = await self.agent.attachment_manager.process_message_and_files(
-                message, file_ids, message_files, kwargs, "get_response"
+                message, file_ids, message_files, kwargs, "get_response", run_overlay=run_overlay
             )
             # Generate a unique run id for this agent execution (non-streaming)
             current_agent_run_id = f"agent_run_{uuid.uuid4().hex}"
@@ -103,7 +101,9 @@ class Execution:
             logger.debug(f"Running agent '{self.agent.name}' with history length {len(history_for_runner)}")
 
             # Prepare context and store reference for potential sync-back
-            master_context_for_run = prepare_master_context(self.agent, context_override, agency_context)
+            master_context_for_run = prepare_master_context(
+                self.agent, context_override, agency_context, run_overlay=run_overlay
+            )
             try:
                 master_context_for_run._current_agent_run_id = current_agent_run_id
                 master_context_for_run._parent_run_id = parent_run_id
@@ -197,12 +197,10 @@ class Execution:
         finally:
             # Cleanup execution state
             if "master_context_for_run" in locals() and master_context_for_run is not None:  # type: ignore[used-before-def]
-                cleanup_execution(
-                    self.agent, original_instructions, context_override, agency_context, master_context_for_run
-                )
-            else:
-                # Ensure instructions are restored even if context was not prepared
-                self.agent.instructions = original_instructions
+                cleanup_execution(self.agent, context_override, agency_context, master_context_for_run)
+            # Make sure write-behind persistence has caught up before the caller sees the result
+            if agency_context and agency_context.thread_manager:
+                await agency_context.thread_manager.aflush()
 
     async def get_response_stream(
         self,
@@ -235,7 +233,8 @@ class Execution:
             file_ids: List of OpenAI file IDs to attach to the message
             additional_instructions: Additional instructions to be appended to
                 the agent's instructions for this run only
-            **kwargs: Additional keyword arguments including max_turns
+            **kwargs: Additional keyword arguments including max_turns and stream_buffer_size
+                (events buffered between the run and the consumer, default 64)
 
         Yields:
             RunItemStreamEvent: Events generated during the agent's execution
@@ -253,7 +252,7 @@ class Execution:
         logger.info(f"Agent '{self.agent.name}' starting streaming run.")
 
         # Common setup and validation
-        original_instructions = setup_execution(
+        run_overlay = setup_execution(
             self.agent, sender_name, agency_context, additional_instructions, "get_response_stream"
         )
 
@@ -264,7 +263,7 @@ class Execution:
             if self.agent.attachment_manager is None:
                 raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
             processed_current_message_items = await self.agent.attachment_manager.process_message_and_files(
-                message, file_ids, message_files, kwargs, "get_response_stream"
+                message, file_ids, message_files, kwargs, "get_response_stream", run_overlay=run_overlay
             )
             # Assign a run id for the current active agent in the stream (may change on handoff/new-agent)
             current_agent_run_id = f"agent_run_{uuid.uuid4().hex}"
@@ -284,7 +283,9 @@ class Execution:
             )
 
             # Prepare context for streaming and delegate to helper generator
-            master_context_for_run = prepare_master_context(self.agent, context_override, agency_context)
+            master_context_for_run = prepare_master_context(
+                self.agent, context_override, agency_context, run_overlay=run_overlay
+            )
             async for event in run_stream_with_guardrails(
                 agent=self.agent,
                 initial_history_for_runner=history_for_runner,
@@ -304,12 +305,9 @@ class Execution:
         finally:
             # Cleanup execution state
             if master_context_for_run is not None:
-                cleanup_execution(
-                    self.agent, original_instructions, context_override, agency_context, master_context_for_run
-                )
-            else:
-                # Ensure instructions are restored even if context was not prepared
-                self.agent.instructions = original_instructions
+                cleanup_execution(self.agent, context_override, agency_context, master_context_for_run)
             if self.agent.attachment_manager is None:
                 raise RuntimeError(f"attachment_manager not initialized for agent {self.agent.name}")
             self.agent.attachment_manager.attachments_cleanup()
+            if agency_context and agency_context.thread_manager:
+                await agency_context.thread_manager.aflush()
@@ -1,8 +1,6 @@
-import asyncio
-import inspect
 import logging
-from collections.abc import AsyncGenerator, Callable
-from contextlib import AsyncExitStack, suppress
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import AsyncExitStack, asynccontextmanager
 from typing import TYPE_CHECKING, Any, cast
 
 from agents import (
@@ -23,9 +21,11 @@ from openai.types.responses import (
     ResponseOutputText,
 )
 
+from agency_swarm.agent.run_overlay import RunOverlay
 from agency_swarm.context import MasterContext
 from agency_swarm.messages import MessageFilter, MessageFormatter
-from agency_swarm.streaming.utils import add_agent_name_to_event
+from agency_swarm.streaming.utils import DEFAULT_STREAM_BUFFER_SIZE, add_agent_name_to_event
+from agency_swarm.tools.mcp_manager import MCPServerManager
 from agency_swarm.utils.citation_extractor import extract_direct_file_annotations
 
 if TYPE_CHECKING:
@@ -34,6 +34,28 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def mcp_sessions(agent: "Agent", agency_context: "AgencyContext | None" = None) -> AsyncIterator[None]:
+    """Make the agent's MCP servers available for the duration of a run.
+
+    Servers are kept connected by the agency's ``MCPServerManager`` when there is one,
+    otherwise they are connected for this run only and cleaned up afterwards.
+    """
+    if not agent.mcp_servers:
+        yield
+        return
+    agency_instance = agency_context.agency_instance if agency_context else None
+    manager = getattr(agency_instance, "mcp_manager", None)
+    if isinstance(manager, MCPServerManager):
+        await manager.ensure_connected(agent.mcp_servers)
+        yield
+        return
+    async with AsyncExitStack() as mcp_stack:
+        for server in agent.mcp_servers:
+            await mcp_stack.enter_async_context(server)  # type: ignore[arg-type]
+        yield
+
+
 async def perform_single_run(
     *,
     agent: "Agent",
@@ -42,17 +64,15 @@ async def perform_single_run(
     hooks_override: Any,
     run_config_override: RunConfig | None,
     kwargs: dict[str, Any],
+    agency_context: "AgencyContext | None" = None,
 ) -> RunResult:
-    """Execute a single Runner.run with MCP stack setup.
+    """Execute a single Runner.run with MCP servers connected.
 
     This is the core execution primitive intentionally separated from guardrail orchestration
     so that tests and future features can reuse the bare run without coupling to retries.
     """
     result: RunResult
-    async with AsyncExitStack() as mcp_stack:
-        for server in agent.mcp_servers:
-            await mcp_stack.enter_async_context(server)  # type: ignore[arg-type]
-
+    async with mcp_sessions(agent, agency_context):
         result = await Runner.run(
             starting_agent=agent,
             input=history_for_runner,
@@ -110,6 +130,7 @@ async def run_sync_with_guardrails(
                 hooks_override=hooks_override,
                 run_config_override=run_config_override,
                 kwargs=kwargs,
+                agency_context=agency_context,
             )
             return run_result, master_context_for_run
         except OutputGuardrailTripwireTriggered as e:
@@ -190,7 +211,10 @@ def run_item_to_tresponse_input_item(item: RunItem) -> TResponseInputItem | None
 
 
 def prepare_master_context(
-    agent: "Agent", context_override: dict[str, Any] | None, agency_context: "AgencyContext | None" = None
+    agent: "Agent",
+    context_override: dict[str, Any] | None,
+    agency_context: "AgencyContext | None" = None,
+    run_overlay: RunOverlay | None = None,
 ) -> MasterContext:
     """Constructs the MasterContext for the current run."""
     if not agency_context or not agency_context.thread_manager:
@@ -207,6 +231,7 @@ def prepare_master_context(
             user_context=context_override or {},
             current_agent_name=agent.name,
             shared_instructions=agency_context.shared_instructions,
+            _run_overlay=run_overlay,
         )
 
     # Use reference for persistence, or create merged copy if override provided
@@ -219,6 +244,11 @@ def prepare_master_context(
         user_context=user_context,
         current_agent_name=agent.name,
         shared_instructions=agency_context.shared_instructions,
+        _run_overlay=run_overlay,
+        _tool_concurrency_groups=getattr(agency_instance, "tool_concurrency_groups", {}),
+        _tool_caches=getattr(agency_instance, "tool_caches", None),
+        _tool_schedulers=getattr(agency_instance, "tool_schedulers", None),
+        _mcp_manager=getattr(agency_instance, "mcp_manager", None),
     )
 
 
@@ -254,48 +284,24 @@ def setup_execution(
     agency_context: "AgencyContext | None",
     additional_instructions: str | None,
     method_name: str = "execution",
-) -> str | Callable | None:
-    """Common setup logic for both get_response and get_response_stream."""
+) -> RunOverlay:
+    """Common setup logic for both get_response and get_response_stream.
+
+    Returns the run's overlay. Additional instructions are applied through it, so the shared
+    agent is left untouched and concurrent runs cannot see each other's additions.
+    """
     # Validate agency instance exists if this is agent-to-agent communication
     _validate_agency_for_delegation(agent, sender_name, agency_context)
 
-    # Store original instructions for restoration
-    original_instructions = agent.instructions
-
-    # Temporarily modify instructions if additional_instructions provided
     if additional_instructions:
         if not isinstance(additional_instructions, str):
             raise ValueError("additional_instructions must be a string")
         logger.debug(f"Appending additional instructions to agent '{agent.name}': {additional_instructions[:100]}...")
-        if isinstance(agent.instructions, str) and agent.instructions:
-            # Only append if it's a non-empty string
-            agent.instructions = agent.instructions + "\n\n" + additional_instructions
-        elif callable(agent.instructions):
-            # Create a wrapper function that calls original callable and appends additional instructions
-            original_callable = agent.instructions
-
-            async def combined_instructions(run_context, agent_instance):
-                # Call the original callable instructions (handle both sync and async)
-                if inspect.iscoroutinefunction(original_callable):
-                    base_instructions = await original_callable(run_context, agent_instance)
-                else:
-                    base_instructions = original_callable(run_context, agent_instance)
-
-                # Append additional instructions
-                if base_instructions:
-                    return str(base_instructions) + "\n\n" + additional_instructions
-                else:
-                    return additional_instructions
-
-            agent.instructions = combined_instructions
-        else:
-            # Replace if it's None or empty string
-            agent.instructions = additional_instructions
 
     # Log the conversation context
     logger.info(f"Agent '{agent.name}' handling {method_name} from sender: {sender_name}")
 
-    return original_instructions
+    return RunOverlay(agent_name=agent.name, additional_instructions=additional_instructions or None)
 
 
 def _validate_agency_for_delegation(
@@ -323,7 +329,6 @@ def _validate_agency_for_delegation(
 
 def cleanup_execution(
     agent: "Agent",
-    original_instructions: str | Callable | None,
     context_override: dict[str, Any] | None,
     agency_context: "AgencyContext | None",
     master_context_for_run: MasterContext,
@@ -337,9 +342,6 @@ def cleanup_execution(
             if key not in context_override:  # Don't sync back override keys
                 base_user_context[key] = value
 
-    # Always restore original instructions
-    agent.instructions = original_instructions
-
 
 def _extract_guardrail_texts(e: BaseException) -> tuple[Any, str]:
     """Return (assistant_output, guidance_text) from a guardrail exception."""
@@ -451,19 +453,26 @@ async def run_stream_with_guardrails(
         except Exception:
             pass
 
-        from agency_swarm.streaming import StreamingContext
+        from agency_swarm.streaming import StreamingContext, StreamMultiplexer
+
+        # Primary run events and forwarded sub-agent events share one buffer
+        multiplexer = StreamMultiplexer(kwargs.get("stream_buffer_size", DEFAULT_STREAM_BUFFER_SIZE))
+
+        async def _forward_subagent_event(sub_event: Any, multiplexer=multiplexer) -> None:
+            if hasattr(sub_event, "__dict__"):
+                sub_event._forwarded = True
+            await multiplexer.put(sub_event)
 
-        streaming_context = StreamingContext()
+        streaming_context = StreamingContext(sink=_forward_subagent_event)
         master_context_for_run._streaming_context = streaming_context
 
-        event_queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=10)
         guardrail_exception: BaseException | None = None
         collected_items: list[RunItem] = []
 
         async def _streaming_worker(
             history_for_runner=history_for_runner,
             master_context_for_run=master_context_for_run,
-            event_queue=event_queue,
+            multiplexer=multiplexer,
             current_agent_run_id=current_agent_run_id,
             parent_run_id=parent_run_id,
             agency_context=agency_context,
@@ -472,10 +481,7 @@ async def run_stream_with_guardrails(
             nonlocal guardrail_exception
             local_result = None
             try:
-                async with AsyncExitStack() as mcp_stack:
-                    for server in agent.mcp_servers:
-                        await mcp_stack.enter_async_context(server)  # type: ignore[arg-type]
-
+                async with mcp_sessions(agent, agency_context):
                     local_result = perform_streamed_run(
                         agent=agent,
                         history_for_runner=history_for_runner,
@@ -486,7 +492,7 @@ async def run_stream_with_guardrails(
                     )
 
                     async for ev in local_result.stream_events():
-                        await event_queue.put(ev)
+                        await multiplexer.put(ev)
             except OutputGuardrailTripwireTriggered as e:
                 guardrail_exception = e
             except InputGuardrailTripwireTriggered as e:
@@ -506,49 +512,23 @@ async def run_stream_with_guardrails(
                 except Exception:
                     guidance_text = str(e)
                 if throw_input_guardrail_error:
-                    await event_queue.put({"type": "error", "content": guidance_text})
+                    await multiplexer.put({"type": "error", "content": guidance_text})
                 else:
-                    await event_queue.put({"type": "input_guardrail_guidance", "content": guidance_text})
+                    await multiplexer.put({"type": "input_guardrail_guidance", "content": guidance_text})
             except Exception as e:
-                await event_queue.put({"type": "error", "content": str(e)})
+                await multiplexer.put({"type": "error", "content": str(e)})
             finally:
                 try:
                     if local_result is not None:
                         local_result.cancel()
                 except Exception:
                     pass
-                await event_queue.put(None)
-
-        worker_task = asyncio.create_task(_streaming_worker())
 
-        async def _forward_subagent_events(
-            streaming_context=streaming_context,
-            event_queue=event_queue,
-        ):
-            while True:
-                try:
-                    sub_event = await streaming_context.get_event()
-                    if sub_event is None:
-                        break
-                    if hasattr(sub_event, "__dict__"):
-                        sub_event._forwarded = True
-                    await event_queue.put(sub_event)
-                except Exception:
-                    break
-
-        forward_task = asyncio.create_task(_forward_subagent_events())
+        multiplexer.add_producer(_streaming_worker, name=f"stream-worker-{agent.name}")
 
         try:
             current_stream_agent_name = agent.name
-            while True:
-                if worker_task.done() and event_queue.empty():
-                    break
-                try:
-                    event = await asyncio.wait_for(event_queue.get(), timeout=0.25)
-                except asyncio.TimeoutError:  # noqa: UP041
-                    continue
-                if event is None:
-                    break
+            async for event in multiplexer.events():
                 if isinstance(event, dict) and event.get("type") == "error":
                     yield event  # type: ignore[misc]
                     continue
@@ -664,13 +644,6 @@ async def run_stream_with_guardrails(
 
         finally:
             try:
-                if not worker_task.done():
-                    worker_task.cancel()
-                    with suppress(asyncio.CancelledError):
-                        await worker_task
-                if not forward_task.done():
-                    forward_task.cancel()
-                    with suppress(asyncio.CancelledError):
-                        await forward_task
+                await multiplexer.aclose()
             except Exception:
                 pass
@@ -1,6 +1,7 @@
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +10,10 @@ from agents.exceptions import AgentsException
 from openai import NotFoundError
 from openai.types.responses.tool_param import CodeInterpreter
 
+from agency_swarm.utils.file_metadata import FileMetadata, get_file_metadata_cache
+
+from .file_manifest import FileManifest, hash_file
+
 logger = logging.getLogger(__name__)
 
 # Shared constants
@@ -38,10 +43,22 @@ FILE_SEARCH_FILE_EXTENSIONS = [".doc", ".docx", ".go", ".md", ".pdf", ".pptx", "
 
 IMAGE_FILE_EXTENSIONS = [".jpeg", ".jpg", ".gif", ".png"]
 
+# Most files the vector store file batches endpoint accepts per call
+_VECTOR_STORE_BATCH_SIZE = 500
+
+
+def _check_extension(path: Path) -> None:
+    extension = path.suffix.lower()
+    if extension not in CODE_INTERPRETER_FILE_EXTENSIONS + IMAGE_FILE_EXTENSIONS + FILE_SEARCH_FILE_EXTENSIONS:
+        raise AgentsException(f"Unsupported file extension: {extension} for file {path.name}")
+
 
 class AgentFileManager:
     """Manages permanent file operations for agents, including uploads and vector store management."""
 
+    # Files uploaded at once when syncing the files folder
+    upload_concurrency: int = 8
+
     def __init__(self, agent):
         self.agent = agent
 
@@ -51,8 +68,9 @@ class AgentFileManager:
         Vector Store if `self.agent._associated_vector_store_id` is set (derived from
         `files_folder` using the `_vs_<id>` naming convention).
 
-        The file is renamed to include the OpenAI File ID (e.g., `original_name_<file_id>.ext`)
-        after successful upload to prevent re-uploading the same file.
+        The file's content hash and File ID are recorded in the files folder's manifest, so
+        the same content is not uploaded again, even under another name. Files outside the
+        files folder are moved into it.
 
         Args:
             file_path (str): The path to the local file to upload.
@@ -78,15 +96,61 @@ class AgentFileManager:
             )
 
         # Check if file has already been uploaded
-        existing_file_id = self.get_id_from_file(fpath)
+        manifest = FileManifest.load(self.agent.files_folder_path)
+        sha256 = hash_file(fpath)
+        known_entry = manifest.find_by_hash(sha256)
+        existing_file_id = known_entry.file_id if known_entry else self.get_id_from_file(fpath)
         logger.info(f"Existing file ID: {existing_file_id}")
         if existing_file_id:
             logger.info(f"File {fpath.name} with ID {existing_file_id} is already uploaded, skipping...")
             return existing_file_id
 
+        file_id = self._create_file(fpath)
+
+        # Keep the file in the files folder
+        if fpath.resolve().parent != self.agent.files_folder_path:
+            destination_path = self.agent.files_folder_path / fpath.name
+            try:
+                fpath = fpath.rename(destination_path)
+                logger.info(f"Agent {self.agent.name}: Moved uploaded file to {destination_path}")
+            except Exception as e:
+                logger.warning(f"Agent {self.agent.name}: Failed to move file {fpath.name} to {destination_path}: {e}")
+                # Not raising an exception here as the file is uploaded to OpenAI,
+                # but the local move failed. The File ID is still returned.
+        entry = manifest.record(fpath, sha256, file_id, vector_store_id=None)
+
+        # Associate with Vector Store if one is linked to this agent via files_folder
+        if self.agent._associated_vector_store_id and include_in_vector_store:
+            if self._attach_to_vector_store([file_id]):
+                entry.vector_store_id = self.agent._associated_vector_store_id
+
+        manifest.save()
+        return file_id
+
+    def get_id_from_file(self, f_path):
+        """Get file id from the files folder's manifest or, for files uploaded by older versions, the file name"""
+        if not os.path.isfile(f_path):
+            raise FileNotFoundError(f"File not found: {f_path}")
+        path = Path(f_path)
+        entry = FileManifest.load(path.parent).entries.get(path.name)
+        if entry is not None:
+            return entry.file_id
+        return self._get_id_from_file_name(path)
+
+    @staticmethod
+    def _get_id_from_file_name(path: Path) -> str | None:
+        """File id from the `name_<file_id>.ext` names older versions renamed uploaded files to"""
+        file_name = path.stem.split("_")
+        if len(file_name) > 1:
+            return file_name[-1] if "file-" in file_name[-1] else None
+        return None
+
+    def _create_file(self, fpath: Path) -> str:
+        """Upload one file to OpenAI and return its File ID."""
         try:
             with open(fpath, "rb") as f:
                 uploaded_file = self.agent.client_sync.files.create(file=f, purpose="assistants")
+            get_file_metadata_cache().put(FileMetadata.from_file_object(uploaded_file))
             logger.info(
                 f"Agent {self.agent.name}: Successfully uploaded file {fpath.name} to OpenAI. "
                 f"File ID: {uploaded_file.id}"
@@ -94,67 +158,137 @@ class AgentFileManager:
         except Exception as e:
             logger.error(f"Agent {self.agent.name}: Failed to upload file {fpath.name} to OpenAI: {e}")
             raise AgentsException(f"Failed to upload file {fpath.name} to OpenAI: {e}") from e
+        return uploaded_file.id
 
-        # Rename the original file to include the OpenAI ID
-        try:
-            new_filename = f"{fpath.stem}_{uploaded_file.id}{fpath.suffix}"
-            destination_path = self.agent.files_folder_path / new_filename
-            fpath.rename(destination_path)
-            logger.info(f"Agent {self.agent.name}: Renamed uploaded file to {destination_path}")
-        except Exception as e:
-            logger.warning(f"Agent {self.agent.name}: Failed to rename file {fpath.name} to {destination_path}: {e}")
-            # Not raising an exception here as the file is uploaded to OpenAI,
-            # but local rename failed. The File ID is still returned.
+    def _attach_to_vector_store(self, file_ids: list[str]) -> bool:
+        """
+        Attach files to the agent's Vector Store in file batches.
 
-        # Associate with Vector Store if one is linked to this agent via files_folder
-        if self.agent._associated_vector_store_id and include_in_vector_store:
+        Returns:
+            bool: Whether the files were attached. Failures are logged, not raised.
+        """
+        vector_store_id = self.agent._associated_vector_store_id
+        try:
+            # First, check if the vector store still exists.
             try:
-                # First, check if the vector store still exists.
-                try:
-                    self.agent.client_sync.vector_stores.retrieve(
-                        vector_store_id=self.agent._associated_vector_store_id
-                    )
-                    logger.debug(
-                        f"Agent {self.agent.name}: Confirmed Vector Store {self.agent._associated_vector_store_id} "
-                        f"exists before associating file {uploaded_file.id}."
-                    )
-                except NotFoundError:
-                    logger.warning(
-                        f"Agent {self.agent.name}: Vector Store {self.agent._associated_vector_store_id} "
-                        f"not found during file {uploaded_file.id} association. "
-                        "It might have been deleted after agent initialization. Skipping association."
+                self.agent.client_sync.vector_stores.retrieve(vector_store_id=vector_store_id)
+            except NotFoundError:
+                logger.warning(
+                    f"Agent {self.agent.name}: Vector Store {vector_store_id} not found during association of "
+                    f"files {file_ids}. It might have been deleted after agent initialization. Skipping association."
+                )
+                return False
+
+            for start in range(0, len(file_ids), _VECTOR_STORE_BATCH_SIZE):
+                batch = file_ids[start : start + _VECTOR_STORE_BATCH_SIZE]
+                if len(batch) == 1:
+                    self.agent.client_sync.vector_stores.files.create(vector_store_id=vector_store_id, file_id=batch[0])
+                else:
+                    self.agent.client_sync.vector_stores.file_batches.create(
+                        vector_store_id=vector_store_id, file_ids=batch
                     )
-                    return uploaded_file.id  # File is uploaded, but association is skipped. Early exit.
+            logger.info(f"Agent {self.agent.name}: Associated files {file_ids} with Vector Store {vector_store_id}.")
+            return True
+        except Exception as e:
+            logger.error(
+                f"Agent {self.agent.name}: Failed to associate files {file_ids} "
+                f"with Vector Store {vector_store_id}: {e}"
+            )
+            # Don't raise an exception here if association fails.
+            return False
 
-                # If VS exists, proceed to associate the file
-                self.agent.client_sync.vector_stores.files.create(
-                    vector_store_id=self.agent._associated_vector_store_id, file_id=uploaded_file.id
-                )
-                logger.info(
-                    f"Agent {self.agent.name}: Associated file {uploaded_file.id} "
-                    f"with Vector Store {self.agent._associated_vector_store_id}."
-                )
-            except Exception as e:
-                logger.error(
-                    f"Agent {self.agent.name}: Failed to associate file {uploaded_file.id} "
-                    f"with Vector Store {self.agent._associated_vector_store_id}: {e}"
-                )
-                # Don't raise an exception here if association fails.
+    def sync_files_folder(self, new_files: list[Path] | None = None) -> list[str]:
+        """
+        Bring OpenAI in line with the files folder, uploading only what changed.
 
-        return uploaded_file.id
+        Files are matched to earlier uploads by content hash through the folder's manifest.
+        New or changed files are uploaded concurrently (``upload_concurrency``), files for
+        file search are attached to the Vector Store in batches, and files removed from the
+        folder are detached from it.
 
-    def get_id_from_file(self, f_path):
-        """Get file id from file name"""
-        if os.path.isfile(f_path):
-            file_name, file_ext = os.path.splitext(f_path)
-            file_name = os.path.basename(file_name)
-            file_name = file_name.split("_")
-            if len(file_name) > 1:
-                return file_name[-1] if "file-" in file_name[-1] else None
+        Args:
+            new_files: Files outside the folder to move into it first.
+
+        Returns:
+            list[str]: File IDs of the files for the code interpreter.
+
+        Raises:
+            AgentsException: If a file has an unsupported extension or cannot be uploaded.
+        """
+        folder = self.agent.files_folder_path
+        vector_store_id = self.agent._associated_vector_store_id
+        for new_file in new_files or []:
+            _check_extension(new_file)
+            logger.info(f"Agent {self.agent.name}: Processing new file {new_file.name}")
+            new_file.replace(folder / new_file.name)
+
+        local_files = sorted(path for path in folder.iterdir() if path.is_file() and not path.name.startswith("."))
+        for path in local_files:
+            _check_extension(path)
+
+        manifest = FileManifest.load(folder)
+        previous_entries = dict(manifest.entries)
+        entries_by_hash = {entry.sha256: entry for entry in previous_entries.values()}
+        hashes = {path: manifest.current_hash(path) for path in local_files}
+
+        file_ids: dict[Path, str] = {}
+        attached: dict[Path, str | None] = {}
+        to_upload: dict[str, Path] = {}
+        for path, sha256 in hashes.items():
+            known_entry = entries_by_hash.get(sha256)
+            legacy_file_id = None if known_entry else self._get_id_from_file_name(path)
+            if known_entry:
+                file_ids[path], attached[path] = known_entry.file_id, known_entry.vector_store_id
+            elif legacy_file_id:
+                # Older versions attached every file search file when uploading it
+                file_ids[path], attached[path] = legacy_file_id, vector_store_id
             else:
-                return None
-        else:
-            raise FileNotFoundError(f"File not found: {f_path}")
+                to_upload.setdefault(sha256, path)
+                attached[path] = None
+
+        if to_upload:
+            logger.info(f"Agent {self.agent.name}: Uploading {len(to_upload)} new or changed files")
+            with ThreadPoolExecutor(max_workers=self.upload_concurrency) as executor:
+                uploaded = dict(zip(to_upload, executor.map(self._create_file, to_upload.values()), strict=True))
+            for path, sha256 in hashes.items():
+                file_ids.setdefault(path, uploaded.get(sha256, ""))
+
+        manifest.entries = {}
+        for path in local_files:
+            manifest.record(path, hashes[path], file_ids[path], attached[path])
+
+        if vector_store_id:
+            to_attach = [
+                path
+                for path in local_files
+                if path.suffix.lower() in FILE_SEARCH_FILE_EXTENSIONS and attached[path] != vector_store_id
+            ]
+            attach_ids = list(dict.fromkeys(file_ids[path] for path in to_attach))
+            if attach_ids and self._attach_to_vector_store(attach_ids):
+                for path in to_attach:
+                    manifest.entries[path.name].vector_store_id = vector_store_id
+
+        current_ids = set(file_ids.values())
+        for name, entry in previous_entries.items():
+            if entry.file_id not in current_ids and entry.vector_store_id:
+                self._detach_from_vector_store(entry.file_id, entry.vector_store_id, name)
+
+        manifest.save()
+        code_interpreter_file_ids = [
+            file_ids[path]
+            for path in local_files
+            if path.suffix.lower() in CODE_INTERPRETER_FILE_EXTENSIONS + IMAGE_FILE_EXTENSIONS
+        ]
+        return list(dict.fromkeys(code_interpreter_file_ids))
+
+    def _detach_from_vector_store(self, file_id: str, vector_store_id: str, name: str) -> None:
+        try:
+            self.agent.client_sync.vector_stores.files.delete(file_id, vector_store_id=vector_store_id)
+            logger.info(f"Agent {self.agent.name}: Detached removed file {name} ({file_id}) from {vector_store_id}.")
+        except NotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Agent {self.agent.name}: Failed to detach file {file_id} from {vector_store_id}: {e}")
 
     def _parse_files_folder_for_vs_id(self) -> None:
         """Synchronously parses files_folder for VS ID and sets path."""
@@ -231,57 +365,18 @@ class AgentFileManager:
 
         self.agent.files_folder_path = Path(base_path_str).resolve()
 
-        # Check for new files in the original directory when reusing vector store
-        is_reusing_vector_store = candidates and original_folder_path.exists()
+        # Files added to the original directory when reusing the vector store are moved into it
         new_files_to_process = []
-
-        if is_reusing_vector_store:
+        if candidates and original_folder_path.exists():
             logger.info(
                 f"Agent {self.agent.name}: Checking for new files in original directory '{original_folder_path}'"
             )
+            new_files_to_process = [
+                file for file in original_folder_path.iterdir() if file.is_file() and not file.name.startswith(".")
+            ]
 
-            # Get list of files already processed (have _file-<id> suffix) in vector store directory
-            processed_files = set()
-            for vs_file in self.agent.files_folder_path.iterdir():
-                if vs_file.is_file() and "_file-" in vs_file.name:
-                    # Extract original filename: "name_file-<id>.ext" -> "name.ext"
-                    original_name = vs_file.name.split("_file-")[0] + vs_file.suffix
-                    processed_files.add(original_name)
-
-            # Check original directory for new files (not yet processed)
-            for original_file in original_folder_path.iterdir():
-                if original_file.is_file() and original_file.name not in processed_files:
-                    logger.info(f"Agent {self.agent.name}: Found new file to process: {original_file.name}")
-                    new_files_to_process.append(original_file)
-
-        code_interpreter_file_ids = []
-
-        # Process existing files in vector store directory
-        for file in os.listdir(self.agent.files_folder_path):
-            # Ideally images should be provided as attachments, but code interpreter tool can also handle images.
-            if Path(file).suffix.lower() in CODE_INTERPRETER_FILE_EXTENSIONS + IMAGE_FILE_EXTENSIONS:
-                file_id = self.upload_file(
-                    os.path.join(self.agent.files_folder_path, file), include_in_vector_store=False
-                )
-                code_interpreter_file_ids.append(file_id)
-            elif Path(file).suffix.lower() in FILE_SEARCH_FILE_EXTENSIONS:
-                self.upload_file(os.path.join(self.agent.files_folder_path, file))
-            else:
-                raise AgentsException(f"Unsupported file extension: {Path(file).suffix.lower()} for file {file}")
-
-        # Process new files found in original directory
-        for new_file in new_files_to_process:
-            logger.info(f"Agent {self.agent.name}: Processing new file {new_file.name}")
-
-            # Upload the new file (this will automatically rename it with file ID and move to vector store dir)
-            if new_file.suffix.lower() in CODE_INTERPRETER_FILE_EXTENSIONS + IMAGE_FILE_EXTENSIONS:
-                file_id = self.upload_file(str(new_file), include_in_vector_store=False)
-                code_interpreter_file_ids.append(file_id)
-            elif Path(new_file).suffix.lower() in FILE_SEARCH_FILE_EXTENSIONS:
-                self.upload_file(str(new_file))
-            else:
-                ext = Path(new_file).suffix.lower()
-                raise AgentsException(f"Unsupported file extension: {ext} for file {new_file}")
+        # Ideally images should be provided as attachments, but code interpreter tool can also handle images.
+        code_interpreter_file_ids = self.sync_files_folder(new_files_to_process)
 
         # Add FileSearchTool if VS ID is parsed.
         if self.agent._associated_vector_store_id:
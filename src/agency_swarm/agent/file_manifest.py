@@ -0,0 +1,116 @@
+"""
+Content-hash manifest of an agent's ``files_folder``.
+
+The manifest is a hidden JSON file inside the files folder. It records, for every local
+file, the SHA-256 of its content, the OpenAI file id it was uploaded as and the vector
+store it is attached to, so unchanged or renamed files are never uploaded again and
+files removed from the folder can be detached from the vector store.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = ".agency_swarm_files.json"
+_MANIFEST_VERSION = 1
+
+
+@dataclass
+class ManifestEntry:
+    """A local file and the OpenAI file uploaded from it.
+
+    Attributes:
+        sha256 (str): Hash of the file content.
+        file_id (str): OpenAI file id.
+        size (int): File size when it was hashed.
+        mtime_ns (int): Modification time when it was hashed; the hash is reused while
+            size and mtime are unchanged.
+        vector_store_id (str | None): Vector store the file is attached to.
+    """
+
+    sha256: str
+    file_id: str
+    size: int
+    mtime_ns: int
+    vector_store_id: str | None = None
+
+
+def hash_file(path: Path) -> str:
+    """Return the SHA-256 of a file's content."""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class FileManifest:
+    """
+    Manifest of the files in one folder, keyed by file name.
+
+    Args:
+        folder: The agent's files folder.
+    """
+
+    def __init__(self, folder: Path):
+        self.folder = folder
+        self.path = folder / MANIFEST_FILENAME
+        self.entries: dict[str, ManifestEntry] = {}
+
+    @classmethod
+    def load(cls, folder: Path) -> "FileManifest":
+        """Read the manifest of ``folder``; a missing or unreadable manifest is empty."""
+        manifest = cls(folder)
+        if not manifest.path.exists():
+            return manifest
+        try:
+            data = json.loads(manifest.path.read_text())
+            if data.get("version") == _MANIFEST_VERSION:
+                manifest.entries = {name: ManifestEntry(**entry) for name, entry in data["files"].items()}
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable file manifest {manifest.path}: {e}")
+        return manifest
+
+    def save(self) -> None:
+        """Write the manifest atomically. Failures are logged, not raised."""
+        data = {
+            "version": _MANIFEST_VERSION,
+            "files": {name: asdict(entry) for name, entry in sorted(self.entries.items())},
+        }
+        try:
+            content = json.dumps(data, indent=2)
+            fd, tmp_name = tempfile.mkstemp(dir=self.folder, prefix=".manifest-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(content)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write file manifest {self.path}: {e}")
+
+    def current_hash(self, path: Path) -> str:
+        """Hash of ``path``, reusing the recorded hash while its size and mtime are unchanged."""
+        stat = path.stat()
+        entry = self.entries.get(path.name)
+        if entry is not None and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            return entry.sha256
+        return hash_file(path)
+
+    def find_by_hash(self, sha256: str) -> ManifestEntry | None:
+        """Entry of any file with this content, e.g. a renamed or copied file."""
+        return next((entry for entry in self.entries.values() if entry.sha256 == sha256), None)
+
+    def record(self, path: Path, sha256: str, file_id: str, vector_store_id: str | None) -> ManifestEntry:
+        """Record that ``path`` with content ``sha256`` was uploaded as ``file_id``."""
+        stat = path.stat()
+        entry = ManifestEntry(sha256, file_id, stat.st_size, stat.st_mtime_ns, vector_store_id)
+        self.entries[path.name] = entry
+        return entry
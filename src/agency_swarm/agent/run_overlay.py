@@ -0,0 +1,87 @@
+"""
+Per-run instruction and tool additions.
+
+Agents are shared between concurrent runs (e.g. one warm Agency serving many threads),
+so additions that belong to a single run are kept on the run's ``MasterContext`` and
+applied when the SDK asks the agent for its system prompt and tools, instead of being
+written to the ``Agent`` itself.
+"""
+
+import dataclasses
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from agents import CodeInterpreterTool, Tool
+from openai.types.responses.tool_param import CodeInterpreter
+
+if TYPE_CHECKING:
+    from agency_swarm.agent.core import Agent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunOverlay:
+    """Instructions and tools added to one agent for the duration of a single run.
+
+    Attributes:
+        agent_name (str): Agent the overlay applies to. Agents reached through a handoff
+            keep their own configuration.
+        additional_instructions (str | None): Text appended to the agent's instructions.
+        code_interpreter_file_ids (list[str]): Attached files made available to the code
+            interpreter for this run only.
+    """
+
+    agent_name: str
+    additional_instructions: str | None = None
+    code_interpreter_file_ids: list[str] = field(default_factory=list)
+
+    def apply_instructions(self, instructions: str | None) -> str | None:
+        """Return the agent's resolved instructions with the run's additions appended."""
+        if not self.additional_instructions:
+            return instructions
+        if instructions:
+            return f"{instructions}\n\n{self.additional_instructions}"
+        return self.additional_instructions
+
+    def apply_tools(self, tools: list[Tool]) -> list[Tool]:
+        """Return the run's tool list. ``tools`` and the tools in it are left unchanged."""
+        if not self.code_interpreter_file_ids:
+            return tools
+        run_tools = list(tools)
+        for index, tool in enumerate(run_tools):
+            if not isinstance(tool, CodeInterpreterTool):
+                continue
+            container: Any = tool.tool_config.get("container", {})
+            if isinstance(container, str):
+                logger.warning(
+                    f"Agent {self.agent_name}: Cannot add files to container for code interpreter, "
+                    "add them manually or switch to using file_ids list."
+                )
+                return run_tools
+            if not isinstance(container, dict):
+                container = {}
+            file_ids = list(container.get("file_ids", []))
+            file_ids.extend(file_id for file_id in self.code_interpreter_file_ids if file_id not in file_ids)
+            tool_config = {**tool.tool_config, "container": {**container, "file_ids": file_ids}}
+            run_tools[index] = dataclasses.replace(tool, tool_config=tool_config)  # type: ignore[arg-type]
+            return run_tools
+
+        run_tools.append(
+            CodeInterpreterTool(
+                tool_config=CodeInterpreter(
+                    container={"type": "auto", "file_ids": list(self.code_interpreter_file_ids)},
+                    type="code_interpreter",
+                )
+            )
+        )
+        return run_tools
+
+
+def get_run_overlay(agent: "Agent", run_context: Any) -> RunOverlay | None:
+    """Return the overlay of the run ``run_context`` belongs to, if it targets ``agent``."""
+    overlay = getattr(getattr(run_context, "context", None), "_run_overlay", None)
+    if isinstance(overlay, RunOverlay) and overlay.agent_name == agent.name:
+        return overlay
+    return None
@@ -68,40 +68,37 @@ def register_subagent(agent: "Agent", recipient_agent: "Agent", send_message_too
 
     # --- Create or update the unified send_message tool --- #
 
-    # Check if we already have a send_message tool of the specific class
-    send_message_tool = None
-    for tool in agent.tools:
-        if hasattr(tool, "name") and tool.name.startswith("send_message"):
-            if send_message_tool_class:
-                # If a specific tool class is requested, only match that exact class
-                if isinstance(tool, send_message_tool_class):
-                    send_message_tool = tool
-                    break
-            else:
-                # If no specific class is requested, only match the default SendMessage class
-                if isinstance(tool, SendMessage):
-                    send_message_tool = tool
-                    break
+    # Reuse the agent's tool of the requested class if it already has one
+    effective_tool_class = send_message_tool_class or agent.send_message_tool_class or SendMessage
+    send_message_tool = next((tool for tool in agent.tools if type(tool) is effective_tool_class), None)
 
     if send_message_tool is None:
         # Create a new send_message tool
-        effective_tool_class = send_message_tool_class or agent.send_message_tool_class or SendMessage
-
-        send_message_tool = effective_tool_class(
+        new_tool = effective_tool_class(
             sender_agent=agent,
             recipients={recipient_key: recipient_agent},
         )
 
-        # Add the unified tool to this agent's tools
-        agent.add_tool(send_message_tool)
-        logger.debug(f"Created unified 'send_message' tool for agent '{agent.name}'")
+        # Tool names are unique per agent, so a tool of another class with the same name (e.g. the
+        # default SendMessage next to a subclass of it) takes the recipient instead of being shadowed.
+        # Tools with other names, such as send_message_broadcast, are kept side by side.
+        send_message_tool = next((tool for tool in agent.tools if getattr(tool, "name", None) == new_tool.name), None)
+        if send_message_tool is None:
+            # Add the unified tool to this agent's tools
+            agent.add_tool(new_tool)
+            logger.debug(f"Created unified '{new_tool.name}' tool for agent '{agent.name}'")
+            return
+        logger.warning(
+            f"Agent '{agent.name}' already has a '{new_tool.name}' tool of class {type(send_message_tool).__name__}. "
+            f"Recipient '{recipient_name}' is added to it instead of a new {effective_tool_class.__name__} tool."
+        )
+
+    # Update existing tool with new recipient
+    if hasattr(send_message_tool, "add_recipient"):
+        send_message_tool.add_recipient(recipient_agent)
+        logger.debug(f"Updated 'send_message' tool with recipient '{recipient_name}' for agent '{agent.name}'")
     else:
-        # Update existing tool with new recipient
-        if hasattr(send_message_tool, "add_recipient"):
-            send_message_tool.add_recipient(recipient_agent)
-            logger.debug(f"Updated 'send_message' tool with recipient '{recipient_name}' for agent '{agent.name}'")
-        else:
-            logger.warning(
-                f"Could not update send_message tool with new recipient '{recipient_name}'. "
-                f"Tool does not have add_recipient method."
-            )
+        logger.warning(
+            f"Could not update send_message tool with new recipient '{recipient_name}'. "
+            f"Tool does not have add_recipient method."
+        )
@@ -8,20 +8,44 @@ and OpenAPI schema parsing for the Agent class.
 import inspect
 import logging
 import os
+import time
 import typing
+from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, get_args
 
 from agents import FunctionTool, Tool
 
-from agency_swarm.tools import BaseTool, ToolFactory, validate_openapi_spec
+from agency_swarm.tools import BaseTool, SendMessage, ToolFactory, validate_openapi_spec
+from agency_swarm.tools.cache import get_tool_cache, resolve_cache_config
+from agency_swarm.tools.concurrency import DEFAULT_QUEUE_TIMEOUT, ToolConcurrencyManager
 
 logger = logging.getLogger(__name__)
 
 
+def _get_scheduler(agent: "Agent", ctx) -> ToolConcurrencyManager:
+    """Return the scheduler of ``agent`` for the agency the call runs in (see ``Agency.clone``)."""
+    schedulers = getattr(getattr(ctx, "context", None), "_tool_schedulers", None)
+    if schedulers is None:
+        return agent.tool_concurrency_manager
+    scheduler = schedulers.get(agent.name)
+    if scheduler is None:
+        scheduler = schedulers.setdefault(agent.name, ToolConcurrencyManager())
+    return scheduler
+
+
 def _attach_one_call_guard(tool: Tool, agent: "Agent") -> None:
-    """Attach a one-call-at-a-time guard to a FunctionTool in-place (idempotent)."""
-    if not isinstance(tool, FunctionTool):
+    """Route a FunctionTool's calls through the agent's concurrency scheduler in-place (idempotent).
+
+    Calls wait for a free slot according to the tool's ``one_call_at_a_time``, ``max_concurrency``,
+    ``concurrency_group`` and ``queue_timeout`` settings instead of failing while the tool is busy.
+    Tools with a ``cache`` setting return stored outputs for repeated identical calls.
+
+    Send message tools are not scheduled: they wait for the recipient's run, which may call back
+    into this agent (A -> B -> A), so holding a slot would block the nested run's exclusive tools.
+    Their messages are queued per recipient by the tool itself.
+    """
+    if not isinstance(tool, FunctionTool) or isinstance(tool, SendMessage):
         return
 
     original_on_invoke = getattr(tool, "on_invoke_tool", None)
@@ -31,43 +55,59 @@ def _attach_one_call_guard(tool: Tool, agent: "Agent") -> None:
     one_call = bool(getattr(tool, "one_call_at_a_time", False))
     if one_call:
         tool.description = (
-            f"{tool.description} This tool can only be used sequentially. "
-            "Do not try to run it in parallel with other tools."
+            f"{tool.description} This tool runs sequentially: parallel calls to it are queued until "
+            "the running call finishes."
         )
 
-    async def guarded_on_invoke(ctx, input_json: str):
-        concurrency_manager = agent.tool_concurrency_manager
-
-        # First, block if any one_call tool is currently running for this agent
-        busy, owner = concurrency_manager.is_lock_active()
-        if busy:
-            return (
-                f"Error: Tool concurrency violation. '{owner or 'unknown'}' tool is still running. "
-                f"No other tools may run until it finishes. Wait for the tool to finish before running another one."
-            )
+    async def scheduled_on_invoke(ctx, input_json: str):
+        tool_name = getattr(tool, "name", "FunctionTool")
+        max_concurrency = getattr(tool, "max_concurrency", None)
+        timeout = getattr(tool, "queue_timeout", DEFAULT_QUEUE_TIMEOUT)
+        group_name = getattr(tool, "concurrency_group", None)
+        groups = getattr(getattr(ctx, "context", None), "_tool_concurrency_groups", None) or {}
+        group = groups.get(group_name) if group_name else None
 
-        # If this tool enforces one_call and ANY tool is already running for this agent, block
-        if one_call and concurrency_manager.get_active_count() > 0:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        started = False
+        try:
+            async with AsyncExitStack() as stack:
+                # Group slots are taken before the agent's slot so an exclusive call never
+                # blocks the agent while it waits for a shared resource.
+                if group is not None:
+                    await stack.enter_async_context(group.slot(timeout=timeout))
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0.0)
+                await stack.enter_async_context(
+                    _get_scheduler(agent, ctx).slot(
+                        tool_name, exclusive=one_call, max_concurrency=max_concurrency, timeout=remaining
+                    )
+                )
+                started = True
+                return await original_on_invoke(ctx, input_json)
+        except TimeoutError:
+            if started:
+                raise
+            logger.warning(f"Agent {agent.name}: tool '{tool_name}' waited {timeout}s for a free slot.")
             return (
-                f"Error: Tool concurrency violation. Tool {tool.name} can only be used sequentially. "
-                "Make sure no other tools are running while using this tool."
+                f"Error: Tool {tool_name} could not start within {timeout} seconds because other calls "
+                "are still running. Try again later."
             )
 
-        # Track that a tool is starting for this agent
-        concurrency_manager.increment_active_count()
-
-        # If this tool enforces one_call, acquire the lock for the duration of this run
-        if one_call:
-            concurrency_manager.acquire_lock(getattr(tool, "name", "FunctionTool"))
+    # Outputs are cached per BaseTool class, or per agent for other tools: tools of different
+    # agents may share a name (e.g. generated OpenAPI tools) without being the same tool
+    base_tool_class = getattr(tool, "_base_tool_class", None)
+    if base_tool_class is not None:
+        cache_owner = f"{base_tool_class.__module__}.{base_tool_class.__qualname__}"
+    else:
+        cache_owner = f"agent:{agent.name}"
 
-        try:
-            return await original_on_invoke(ctx, input_json)
-        finally:
-            # Release lock if held
-            if one_call:
-                concurrency_manager.release_lock()
-            # Decrement active tool count
-            concurrency_manager.decrement_active_count()
+    async def guarded_on_invoke(ctx, input_json: str):
+        # Cache hits are answered before scheduling so they never wait for a slot
+        cache_config = resolve_cache_config(getattr(tool, "cache", None))
+        key = cache_config.make_key(input_json) if cache_config else None
+        if cache_config is None or key is None:
+            return await scheduled_on_invoke(ctx, input_json)
+        cache = get_tool_cache(tool.name, cache_config, getattr(ctx, "context", None), owner=cache_owner)
+        return await cache.get_or_call(key, lambda: scheduled_on_invoke(ctx, input_json))
 
     tool.on_invoke_tool = guarded_on_invoke  # type: ignore[attr-defined]
     tool._one_call_guard_installed = True  # type: ignore[attr-defined]
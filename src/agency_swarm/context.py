@@ -34,6 +34,11 @@ class MasterContext:
     _parent_run_id: str | None = None  # Parent run ID for nested agent calls
     _is_streaming: bool = False  # Flag to indicate if we're in streaming mode
     _streaming_context: Any = None  # Streaming context for passing state
+    _run_overlay: Any = None  # Per-run instruction and tool additions (RunOverlay)
+    _tool_concurrency_groups: dict[str, Any] = field(default_factory=dict)  # Agency-wide ConcurrencyGroups
+    _tool_caches: dict[Any, Any] | None = None  # Agency-scoped ToolResultCaches by tool
+    _tool_schedulers: dict[str, Any] | None = None  # Per-agency ToolConcurrencyManagers by agent name
+    _mcp_manager: Any = None  # Agency's MCPServerManager, kept for recipients of send_message
 
     def __post_init__(self):
         """Basic validation after initialization."""
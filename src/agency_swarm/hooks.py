@@ -1,4 +1,5 @@
 import logging
+import weakref
 from collections.abc import Callable
 from typing import Any
 
@@ -49,7 +50,7 @@ class PersistenceHooks(RunHooks[MasterContext]):  # type: ignore[misc]
             load_threads_callback (Callable[[], list[TResponseInputItem]]):
                 The function to call at the start of a run to load all messages.
                 It should return a flat list of message dictionaries with
-                'agent', 'callerAgent', 'timestamp' and other OpenAI fields.
+                'agent', 'callerAgent', 'seq', 'timestamp' and other OpenAI fields.
             save_threads_callback (Callable[[list[TResponseInputItem]], None]):
                 The function to call at the end of a run to save all messages.
                 It receives a flat list of message dictionaries.
@@ -61,6 +62,8 @@ class PersistenceHooks(RunHooks[MasterContext]):  # type: ignore[misc]
             raise TypeError("load_threads_callback and save_threads_callback must be callable.")
         self._load_threads_callback = load_threads_callback
         self._save_threads_callback = save_threads_callback
+        # Cursor of each ThreadManager at its last successful save
+        self._saved_cursors: weakref.WeakKeyDictionary[Any, int] = weakref.WeakKeyDictionary()
         logger.info("PersistenceHooks initialized with flat message structure.")
 
     def on_run_start(self, *, context: MasterContext, **kwargs) -> None:
@@ -86,8 +89,9 @@ class PersistenceHooks(RunHooks[MasterContext]):  # type: ignore[misc]
     def on_run_end(self, *, context: MasterContext, result: RunResult, **kwargs) -> None:
         """Saves all messages from the `ThreadManager` at the end of a run.
 
-        Calls the `save_threads_callback` provided during initialization, passing
-        the complete flat list of messages from the `ThreadManager`.
+        Calls the `save_threads_callback` provided during initialization, passing the complete
+        flat list of messages from the `ThreadManager`. The save is skipped when the
+        `ThreadManager` cursor shows no messages were added since the previous save.
         Logs errors during saving but does not prevent run completion.
 
         Args:
@@ -97,11 +101,19 @@ class PersistenceHooks(RunHooks[MasterContext]):  # type: ignore[misc]
         """
         logger.debug("PersistenceHooks: on_run_end triggered.")
         try:
+            thread_manager = context.thread_manager
+            cursor = thread_manager.cursor()
+            saved_cursor = self._saved_cursors.get(thread_manager)
+            if saved_cursor is not None and saved_cursor == cursor:
+                logger.debug("No messages added since the last save; skipping save_threads_callback.")
+                return
             # Get flat message list from ThreadManager
-            all_messages = context.thread_manager.get_all_messages()
+            all_messages = thread_manager.get_all_messages()
 
             self._save_threads_callback(all_messages)
-            logger.info(f"Saved {len(all_messages)} messages via save_threads_callback.")
+            self._saved_cursors[thread_manager] = cursor
+            new_count = len(all_messages) if saved_cursor is None else len(thread_manager.messages_since(saved_cursor))
+            logger.info(f"Saved {len(all_messages)} messages ({new_count} new) via save_threads_callback.")
         except Exception as e:
             logger.error(f"Error during save_threads_callback execution: {e}", exc_info=True)
             # Log error but don't prevent run completion.
@@ -1,11 +1,15 @@
+import asyncio
 import logging
 import os
+import time
 from collections.abc import Callable, Mapping
+from contextlib import asynccontextmanager
 
 from agents.tool import FunctionTool
 
 from agency_swarm.agency import Agency
 from agency_swarm.agent.core import Agent
+from agency_swarm.tools.http_pool import aclose_http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +25,7 @@ def run_fastapi(
     enable_agui: bool = False,
     enable_logging: bool = False,
     logs_dir: str = "activity-logs",
+    pooled: bool = False,
 ):
     """Launch a FastAPI server exposing endpoints for multiple agencies and tools.
 
@@ -42,6 +47,17 @@ def run_fastapi(
     logs_dir : str
         Directory to store log files when logging is enabled.
         Defaults to 'activity-logs'.
+    pooled : bool
+        Call each factory once at startup and serve every request from a cheap
+        copy of that agency with a fresh thread (see :meth:`Agency.clone`)
+        instead of calling the factory per request. Adds a
+        ``/{agency}/get_pool_stats`` endpoint with startup and per-request
+        timings. Defaults to False.
+
+    In pooled mode, agents created with ``defer_file_setup=True`` are prepared in the
+    background once the server starts (see :meth:`Agency.prepare`). ``GET /ready`` answers
+    503 until every pooled agency is warmed up and 200 afterwards, for use as a readiness
+    probe. It is not exposed without ``pooled``, as each request then builds new agents.
     """
     if (agencies is None or len(agencies) == 0) and (tools is None or len(tools) == 0):
         logger.warning("No endpoints to deploy. Please provide at least one agency or tool.")
@@ -52,16 +68,20 @@ def run_fastapi(
         from fastapi import FastAPI
         from fastapi.middleware.cors import CORSMiddleware
 
+        from .fastapi_utils.agency_pool import AgencyPool
         from .fastapi_utils.endpoint_handlers import (
             exception_handler,
             get_verify_token,
             make_agui_chat_endpoint,
             make_logs_endpoint,
             make_metadata_endpoint,
+            make_pool_stats_endpoint,
+            make_ready_endpoint,
             make_response_endpoint,
             make_stream_endpoint,
             make_tool_endpoint,
         )
+        from .fastapi_utils.file_handler import FileUploadPipeline
         from .fastapi_utils.logging_middleware import (
             RequestTracker,
             setup_enhanced_logging,
@@ -76,7 +96,33 @@ def run_fastapi(
         logger.warning("App token is not set. Authentication will be disabled.")
     verify_token = get_verify_token(app_token)
 
-    app = FastAPI()
+    # Downloads and uploads the file_urls of requests with shared clients and caches
+    upload_pipeline = FileUploadPipeline()
+    # Agencies whose deferred agent setup runs in the background at startup
+    warmup_agencies: dict[str, Agency] = {}
+
+    async def warm_up(app: FastAPI) -> None:
+        started = time.perf_counter()
+        try:
+            await asyncio.gather(*(agency.prepare() for agency in warmup_agencies.values()))
+        except Exception as e:
+            # Agents retry their setup on first use
+            logger.error(f"Agency warm-up failed: {e}", exc_info=True)
+            app.state.warmup_error = str(e)
+            return
+        logger.info(f"Agencies warmed up in {time.perf_counter() - started:.2f}s")
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        warmup = asyncio.create_task(warm_up(app))
+        yield
+        warmup.cancel()
+        # Pooled clients of OpenAPI tools and file uploads live on the server's event loop
+        await upload_pipeline.aclose()
+        await aclose_http_clients()
+
+    app = FastAPI(lifespan=lifespan)
+    app.state.upload_pipeline = upload_pipeline
 
     # Setup logging if enabled
     if enable_logging:
@@ -110,7 +156,15 @@ def run_fastapi(
             agency_names.append(agency_name)
 
             # Store agent instances for easy lookup
-            preview_instance = agency_factory(load_threads_callback=lambda: [])
+            pool = None
+            if pooled:
+                pool = AgencyPool(agency_factory)
+                agency_factory = pool
+                preview_instance = pool.agency
+                # Only pooled requests reuse the agents prepared here
+                warmup_agencies[agency_name] = preview_instance
+            else:
+                preview_instance = agency_factory(load_threads_callback=lambda: [])
             AGENT_INSTANCES: dict[str, Agent] = dict(preview_instance.agents.items())
             AgencyRequest = add_agent_validator(BaseRequest, AGENT_INSTANCES)
             agency_metadata = preview_instance.get_agency_structure()
@@ -125,12 +179,12 @@ def run_fastapi(
             else:
                 app.add_api_route(
                     f"/{agency_name}/get_response",
-                    make_response_endpoint(AgencyRequest, agency_factory, verify_token),
+                    make_response_endpoint(AgencyRequest, agency_factory, verify_token, upload_pipeline),
                     methods=["POST"],
                 )
                 app.add_api_route(
                     f"/{agency_name}/get_response_stream",
-                    make_stream_endpoint(AgencyRequest, agency_factory, verify_token),
+                    make_stream_endpoint(AgencyRequest, agency_factory, verify_token, upload_pipeline),
                     methods=["POST"],
                 )
                 endpoints.append(f"/{agency_name}/get_response")
@@ -143,6 +197,18 @@ def run_fastapi(
             )
             endpoints.append(f"/{agency_name}/get_metadata")
 
+            if pool is not None:
+                app.add_api_route(
+                    f"/{agency_name}/get_pool_stats",
+                    make_pool_stats_endpoint(pool, verify_token),
+                    methods=["GET"],
+                )
+                endpoints.append(f"/{agency_name}/get_pool_stats")
+
+    if warmup_agencies:
+        app.add_api_route("/ready", make_ready_endpoint(warmup_agencies), methods=["GET"])
+        endpoints.append("/ready")
+
     if tools:
         for tool in tools:
             tool_name = tool.name if hasattr(tool, "name") else tool.__name__
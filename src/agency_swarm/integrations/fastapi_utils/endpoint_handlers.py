@@ -11,7 +11,8 @@ from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from agency_swarm.agency import Agency
-from agency_swarm.integrations.fastapi_utils.file_handler import upload_from_urls
+from agency_swarm.integrations.fastapi_utils.agency_pool import AgencyPool
+from agency_swarm.integrations.fastapi_utils.file_handler import FileUploadPipeline, upload_from_urls
 from agency_swarm.integrations.fastapi_utils.logging_middleware import get_logs_endpoint_impl
 from agency_swarm.messages import MessageFilter
 from agency_swarm.ui.core.agui_adapter import AguiAdapter, serialize
@@ -32,7 +33,12 @@ def get_verify_token(app_token):
 
 
 # Non‑streaming response endpoint
-def make_response_endpoint(request_model, agency_factory: Callable[..., Agency], verify_token):
+def make_response_endpoint(
+    request_model,
+    agency_factory: Callable[..., Agency],
+    verify_token,
+    upload_pipeline: FileUploadPipeline | None = None,
+):
     async def handler(request: request_model, token: str = Depends(verify_token)):
         if request.chat_history is not None:
             # Chat history is now a flat list
@@ -47,15 +53,15 @@ def make_response_endpoint(request_model, agency_factory: Callable[..., Agency],
         file_ids_map = None
         if request.file_urls is not None:
             try:
-                file_ids_map = await upload_from_urls(request.file_urls)
+                file_ids_map = await upload_from_urls(request.file_urls, upload_pipeline)
                 combined_file_ids = (combined_file_ids or []) + list(file_ids_map.values())
             except Exception as e:
                 return {"error": f"Error downloading file from provided urls: {e}"}
 
         agency_instance = agency_factory(load_threads_callback=load_callback)
 
-        # Capture initial message count to identify new messages
-        initial_message_count = len(agency_instance.thread_manager.get_all_messages())
+        # Watermark to identify messages added during this request
+        cursor = agency_instance.thread_manager.cursor()
 
         response = await agency_instance.get_response(
             message=request.message,
@@ -64,8 +70,7 @@ def make_response_endpoint(request_model, agency_factory: Callable[..., Agency],
             file_ids=combined_file_ids,
         )
         # Get only new messages added during this request
-        all_messages = agency_instance.thread_manager.get_all_messages()
-        new_messages = all_messages[initial_message_count:]  # Only messages added during this request
+        new_messages = agency_instance.thread_manager.messages_since(cursor)
         filtered_messages = MessageFilter.filter_messages(new_messages)
         result = {"response": response.final_output, "new_messages": filtered_messages}
         if request.file_urls is not None and file_ids_map is not None:
@@ -76,7 +81,12 @@ def make_response_endpoint(request_model, agency_factory: Callable[..., Agency],
 
 
 # Streaming SSE endpoint
-def make_stream_endpoint(request_model, agency_factory: Callable[..., Agency], verify_token):
+def make_stream_endpoint(
+    request_model,
+    agency_factory: Callable[..., Agency],
+    verify_token,
+    upload_pipeline: FileUploadPipeline | None = None,
+):
     async def handler(request: request_model, token: str = Depends(verify_token)):
         if request.chat_history is not None:
             # Chat history is now a flat list
@@ -91,7 +101,7 @@ def make_stream_endpoint(request_model, agency_factory: Callable[..., Agency], v
         file_ids_map = None
         if request.file_urls is not None:
             try:
-                file_ids_map = await upload_from_urls(request.file_urls)
+                file_ids_map = await upload_from_urls(request.file_urls, upload_pipeline)
                 combined_file_ids = (combined_file_ids or []) + list(file_ids_map.values())
             except Exception as e:
                 error_msg = str(e)
@@ -117,8 +127,8 @@ def make_stream_endpoint(request_model, agency_factory: Callable[..., Agency], v
         agency_instance = agency_factory(load_threads_callback=load_callback)
 
         async def event_generator():
-            # Capture initial message count to identify new messages
-            initial_message_count = len(agency_instance.thread_manager.get_all_messages())
+            # Watermark to identify messages added during this request
+            cursor = agency_instance.thread_manager.cursor()
 
             try:
                 async for event in agency_instance.get_response_stream(
@@ -148,8 +158,7 @@ def make_stream_endpoint(request_model, agency_factory: Callable[..., Agency], v
                     yield "data: " + json.dumps({"error": str(exc)}) + "\n\n"
 
             # Get only new messages added during this request
-            all_messages = agency_instance.thread_manager.get_all_messages()
-            new_messages = all_messages[initial_message_count:]  # Only messages added during this request
+            new_messages = agency_instance.thread_manager.messages_since(cursor)
             # Preserve agent_run_id grouping for UI correlation
             filtered_messages = MessageFilter.filter_messages(new_messages)
             result = {"new_messages": filtered_messages}
@@ -199,8 +208,11 @@ def make_tool_endpoint(tool, verify_token, context=None):
 
 
 def make_agui_chat_endpoint(request_model, agency_factory: Callable[..., Agency], verify_token):
+    default_agent_name: str | None = None
+
     async def handler(request: request_model, token: str = Depends(verify_token)):
         """Accepts AG-UI `RunAgentInput`, returns an AG-UI event stream."""
+        nonlocal default_agent_name
 
         encoder = EventEncoder()
 
@@ -210,9 +222,9 @@ def make_agui_chat_endpoint(request_model, agency_factory: Callable[..., Agency]
                 return request.chat_history
 
         elif request.messages is not None:
-            # Pull the default agent from the agency
-            agency = agency_factory()
-            default_agent = agency.entry_points[0]
+            # Pull the default agent from the agency once instead of building an extra agency per request
+            if default_agent_name is None:
+                default_agent_name = agency_factory().entry_points[0].name
 
             # Convert AG-UI messages to flat chat history with metadata
             def load_callback() -> list:
@@ -220,7 +232,7 @@ def make_agui_chat_endpoint(request_model, agency_factory: Callable[..., Agency]
                 # Add agency metadata to each message
                 for msg in agui_messages:
                     if "agent" not in msg:
-                        msg["agent"] = default_agent.name
+                        msg["agent"] = default_agent_name
                     if "callerAgent" not in msg:
                         msg["callerAgent"] = None
                     if "timestamp" not in msg:
@@ -298,6 +310,33 @@ def make_metadata_endpoint(agency_metadata: dict, verify_token):
     return handler
 
 
+def make_pool_stats_endpoint(pool: AgencyPool, verify_token):
+    async def handler(token: str = Depends(verify_token)):
+        stats = pool.stats
+        return {
+            "startup_seconds": stats.startup_seconds,
+            "requests": stats.requests,
+            "average_request_seconds": stats.average_request_seconds,
+            "last_request_seconds": stats.last_request_seconds,
+        }
+
+    return handler
+
+
+def make_ready_endpoint(agencies: dict[str, Agency]):
+    """Readiness probe: 200 once every agency finished warming up, 503 before."""
+
+    async def handler(request: Request):
+        pending = [name for name, agency in agencies.items() if not agency.is_ready]
+        body: dict = {"ready": not pending, "pending": pending}
+        error = getattr(request.app.state, "warmup_error", None)
+        if pending and error:
+            body["error"] = error
+        return JSONResponse(body, status_code=503 if pending else 200)
+
+    return handler
+
+
 def make_logs_endpoint(request_model, logs_dir: str, verify_token):
     """Create a logs endpoint handler following the same pattern as other endpoints."""
 
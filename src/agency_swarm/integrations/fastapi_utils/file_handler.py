@@ -1,21 +1,53 @@
+"""
+Upload pipeline for the ``file_urls`` of FastAPI requests.
+
+``FileUploadPipeline`` downloads files through the pooled HTTP clients of
+``agency_swarm.tools.http_pool`` and uploads them with one shared ``AsyncOpenAI`` client.
+Downloads are spooled in memory (large ones overflow to a temporary file) and uploaded
+from there without being written to a named file. The number of files transferred at
+once is bounded, downloads over ``max_file_size`` are rejected, and status polling backs
+off exponentially.
+
+Previously uploaded files are reused: a URL whose server sent an ``ETag`` or
+``Last-Modified`` header is revalidated with a conditional request, and downloaded
+content is matched by its SHA-256 hash, so repeated requests skip the upload and the
+processing wait.
+"""
+
 import asyncio
+import hashlib
 import logging
 import os
 import tempfile
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Any
 from urllib.parse import urlparse
 
-import aiofiles
 import filetype
 import httpx
 from openai import AsyncOpenAI
 
-logger = logging.getLogger(__name__)
+from agency_swarm.tools.http_pool import HTTPClientConfig, get_http_client
+from agency_swarm.utils.file_metadata import FileMetadata, get_file_metadata_cache
 
+logger = logging.getLogger(__name__)
 
-def _get_openai_client() -> AsyncOpenAI:
-    """Get OpenAI client lazily to avoid import-time instantiation."""
-    return AsyncOpenAI()
+# OpenAI's limit for a single file
+DEFAULT_MAX_FILE_SIZE = 512 * 1024 * 1024
+# Downloads larger than this are spooled to a temporary file instead of memory
+_SPOOL_MAX_SIZE = 16 * 1024 * 1024
+# Bytes filetype needs to recognize a file
+_HEAD_SIZE = 261
+_DOWNLOAD_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+}
 
 
 def get_extension_from_name(name):
@@ -36,6 +68,275 @@ def get_extension_from_filetype(file_path):
     return None
 
 
+def _get_extension_from_head(head: bytes) -> str | None:
+    kind = filetype.guess(head) if head else None
+    return f".{kind.extension}" if kind else None
+
+
+class FileTooLargeError(ValueError):
+    """Raised when a downloaded file exceeds the pipeline's ``max_file_size``."""
+
+
+@dataclass
+class UploadPipelineStats:
+    """Metrics of a ``FileUploadPipeline``.
+
+    Attributes:
+        downloads (int): Files downloaded.
+        uploads (int): Files uploaded to OpenAI.
+        url_cache_hits (int): Files reused after the server confirmed the URL is unchanged.
+        content_cache_hits (int): Downloads whose content was uploaded before.
+        bytes_downloaded (int): Total size of the downloaded files.
+    """
+
+    downloads: int = 0
+    uploads: int = 0
+    url_cache_hits: int = 0
+    content_cache_hits: int = 0
+    bytes_downloaded: int = 0
+
+
+@dataclass(frozen=True)
+class _UrlEntry:
+    file_id: str
+    etag: str | None
+    last_modified: str | None
+
+
+class _LRU:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Any, Any] = OrderedDict()
+
+    def get(self, key: Any) -> Any:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class FileUploadPipeline:
+    """
+    Downloads files from URLs and uploads them to OpenAI for an app's lifetime.
+
+    Args:
+        client: ``AsyncOpenAI`` client used for uploads. Defaults to one client per event loop.
+        max_concurrency: Files downloaded and uploaded at once, across all requests.
+        max_file_size: Largest accepted download in bytes.
+        download_timeout: httpx timeout of the download clients.
+        processing_timeout: Seconds to wait for OpenAI to process an uploaded file.
+        cache_size: URLs and content hashes remembered.
+        http_client: Pooling and retry settings of the download clients.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAI | None = None,
+        *,
+        max_concurrency: int = 4,
+        max_file_size: int = DEFAULT_MAX_FILE_SIZE,
+        download_timeout: float = 30.0,
+        processing_timeout: float = 60.0,
+        cache_size: int = 1024,
+        http_client: HTTPClientConfig | None = None,
+    ):
+        self._client = client
+        self.max_concurrency = max_concurrency
+        self.max_file_size = max_file_size
+        self.download_timeout = download_timeout
+        self.processing_timeout = processing_timeout
+        self.http_client = http_client
+        self._url_cache = _LRU(cache_size)
+        self._content_cache = _LRU(cache_size)
+        self._stats = UploadPipelineStats()
+        # The semaphore and the default client are bound to the loop they are used on
+        self._semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI] = weakref.WeakKeyDictionary()
+
+    @property
+    def client(self) -> AsyncOpenAI:
+        """The OpenAI client of the running event loop."""
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = self._clients[loop] = AsyncOpenAI()
+        return client
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def upload_from_urls(self, file_map: dict[str, str]) -> dict[str, str]:
+        """
+        Upload files from URLs to OpenAI and wait until they are processed.
+
+        Args:
+            file_map: A dictionary mapping file names to URLs.
+
+        Returns:
+            A dictionary mapping file names to file IDs.
+        """
+        file_ids = await asyncio.gather(*(self.upload_from_url(name, url) for name, url in file_map.items()))
+        return dict(zip(file_map.keys(), file_ids, strict=True))
+
+    async def upload_from_url(self, name: str, url: str) -> str:
+        """
+        Upload one file from a URL, reusing the file id of an unchanged URL or content.
+
+        Args:
+            name: File name; its extension takes precedence over the URL's.
+            url: URL of the file.
+
+        Returns:
+            The id of the processed OpenAI file.
+
+        Raises:
+            FileTooLargeError: If the file exceeds ``max_file_size``.
+            ValueError: If the file type cannot be determined.
+            httpx.HTTPStatusError: If the download fails.
+        """
+        async with self._semaphore():
+            cached: _UrlEntry | None = self._url_cache.get(url)
+            headers = dict(_DOWNLOAD_HEADERS)
+            if cached is not None and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached is not None and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+            http = get_http_client(url, timeout=self.download_timeout, config=self.http_client)
+            async with http.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and cached is not None:
+                    self._stats.url_cache_hits += 1
+                    logger.debug(f"Reusing file {cached.file_id} for unchanged {url}")
+                    return cached.file_id
+                response.raise_for_status()
+                spooled, digest, head = await self._spool(response, name)
+                url_entry = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+
+            with spooled:
+                ext = get_extension_from_name(name) or get_extension_from_url(url) or _get_extension_from_head(head)
+                if not ext:
+                    raise ValueError(f"No extension found for file: {url}")
+                filename = f"{os.path.splitext(name)[0]}{ext}"
+                content_key = (digest, filename)
+                file_id = self._content_cache.get(content_key)
+                uploaded = file_id is None
+                if uploaded:
+                    file_id = await self._upload((filename, spooled))
+                else:
+                    self._stats.content_cache_hits += 1
+                    logger.debug(f"Reusing file {file_id} for already uploaded content of {url}")
+
+        # Processing is waited for outside the semaphore so it does not hold up other transfers
+        if uploaded:
+            await self.wait_for_processed(file_id)
+            self._content_cache.put(content_key, file_id)
+        if any(url_entry):
+            self._url_cache.put(url, _UrlEntry(file_id, *url_entry))
+        return file_id
+
+    async def upload_file(self, file_path: str | Path) -> str:
+        """Upload a local file to OpenAI and return its id."""
+        with open(file_path, "rb") as f:
+            return await self._upload(f)
+
+    async def wait_for_processed(self, file_id: str) -> None:
+        """
+        Poll OpenAI with exponential backoff until an uploaded file is processed.
+
+        Raises:
+            RuntimeError: If processing failed.
+            TimeoutError: If the file is not processed within ``processing_timeout``.
+        """
+        deadline = time.monotonic() + self.processing_timeout
+        delay = 0.25
+        while True:
+            try:
+                file_info = await self.client.files.retrieve(file_id)
+            except Exception as e:  # pragma: no cover - network issues
+                logger.warning(f"Error retrieving status for file {file_id}: {e}")
+            else:
+                status = getattr(file_info, "status", None)
+                if status == "processed":
+                    return
+                if status == "error":
+                    raise RuntimeError(f"File processing failed: {file_id}")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"File processing timed out for {file_id}")
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, 5.0)
+
+    def get_stats(self) -> UploadPipelineStats:
+        """Snapshot of the pipeline's metrics."""
+        return replace(self._stats)
+
+    async def aclose(self) -> None:
+        """Close the OpenAI client the pipeline created on the running event loop."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
+
+    async def _spool(self, response: httpx.Response, name: str) -> tuple[tempfile.SpooledTemporaryFile, str, bytes]:
+        """Stream a response into a spooled file, enforcing ``max_file_size``."""
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > self.max_file_size:
+            raise FileTooLargeError(f"File {name} is {length} bytes, above the {self.max_file_size} byte limit")
+
+        spooled = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
+        sha256 = hashlib.sha256()
+        head = b""
+        size = 0
+        try:
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+                if size > self.max_file_size:
+                    raise FileTooLargeError(f"File {name} is larger than the {self.max_file_size} byte limit")
+                if len(head) < _HEAD_SIZE:
+                    head += chunk[: _HEAD_SIZE - len(head)]
+                sha256.update(chunk)
+                spooled.write(chunk)
+        except BaseException:
+            spooled.close()
+            raise
+        spooled.seek(0)
+        self._stats.downloads += 1
+        self._stats.bytes_downloaded += size
+        return spooled, sha256.hexdigest(), head
+
+    async def _upload(self, file: Any) -> str:
+        try:
+            uploaded_file = await self.client.files.create(file=file, purpose="assistants")
+        except Exception as e:
+            name = file[0] if isinstance(file, tuple) else getattr(file, "name", "")
+            logger.error(f"Error uploading file {name} to OpenAI: {e}")
+            raise
+        self._stats.uploads += 1
+        get_file_metadata_cache().put(FileMetadata.from_file_object(uploaded_file))
+        return uploaded_file.id
+
+
+_default_pipeline = FileUploadPipeline()
+
+
+def get_upload_pipeline() -> FileUploadPipeline:
+    """Return the pipeline used when no app-owned pipeline is given."""
+    return _default_pipeline
+
+
 async def download_file(url, name, save_dir):
     """
     Helper function to download file from url to local path.
@@ -46,80 +347,34 @@ async def download_file(url, name, save_dir):
     Returns:
         The local path of the downloaded file.
     """
-    # Prioritize user-provided extension
-    ext = get_extension_from_name(name) or get_extension_from_url(url)
-    base_name = os.path.splitext(name)[0]
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        ),
-    }
-    temp_path = Path(save_dir) / f"{base_name}.tmp"
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        async with client.stream("GET", url, headers=headers) as r:
-            r.raise_for_status()
-            async with aiofiles.open(temp_path, "wb") as f:
-                async for chunk in r.aiter_bytes():
-                    await f.write(chunk)
-    if not ext:
-        ext = get_extension_from_filetype(temp_path)
-    if not ext:
-        raise ValueError(f"No extension found for file: {url}")
-    filename = f"{base_name}{ext}"
-    local_path = Path(save_dir) / filename
-    if local_path.exists():
-        os.remove(local_path)
-    os.rename(temp_path, local_path)
+    pipeline = get_upload_pipeline()
+    http = get_http_client(url, timeout=pipeline.download_timeout, config=pipeline.http_client)
+    async with http.stream("GET", url, headers=_DOWNLOAD_HEADERS) as r:
+        r.raise_for_status()
+        spooled, _, head = await pipeline._spool(r, name)
+    with spooled:
+        ext = get_extension_from_name(name) or get_extension_from_url(url) or _get_extension_from_head(head)
+        if not ext:
+            raise ValueError(f"No extension found for file: {url}")
+        local_path = Path(save_dir) / f"{os.path.splitext(name)[0]}{ext}"
+        with open(local_path, "wb") as f:
+            while chunk := spooled.read(1024 * 1024):
+                f.write(chunk)
     return str(local_path)
 
 
 async def upload_to_openai(file_path):
-    try:
-        client = _get_openai_client()
-        with open(file_path, "rb") as f:
-            uploaded_file = await client.files.create(file=f, purpose="assistants")
-    except Exception as e:
-        logger.error(f"Error uploading file {file_path} to OpenAI: {e}")
-        raise e
-    return uploaded_file.id
+    return await get_upload_pipeline().upload_file(file_path)
 
 
-async def _wait_for_file_processed(file_id: str, timeout: int = 60) -> None:
-    """Poll OpenAI until the uploaded file is processed."""
-    client = _get_openai_client()
-    for _ in range(timeout):
-        try:
-            file_info = await client.files.retrieve(file_id)
-        except Exception as e:  # pragma: no cover - network issues
-            logger.warning(f"Error retrieving status for file {file_id}: {e}")
-            await asyncio.sleep(1)
-            continue
-        if getattr(file_info, "status", None) == "processed":
-            return
-        if getattr(file_info, "status", None) == "error":
-            raise RuntimeError(f"File processing failed: {file_id}")
-        await asyncio.sleep(1)
-    raise TimeoutError(f"File processing timed out for {file_id}")
-
-
-async def upload_from_urls(file_map: dict[str, str]) -> dict[str, str]:
+async def upload_from_urls(file_map: dict[str, str], pipeline: FileUploadPipeline | None = None) -> dict[str, str]:
     """
     Helper function to upload files from urls to OpenAI.
     Args:
         file_map: A dictionary mapping file names to URLs.
         in a format of {"file_name": "url", ...}
+        pipeline: Pipeline to use. Defaults to the process-wide pipeline.
     Returns:
         A dictionary mapping file names to file IDs.
     """
-    file_ids = []
-    with tempfile.TemporaryDirectory() as temp_dir:
-        download_tasks = [download_file(url, name, temp_dir) for name, url in file_map.items()]
-        file_paths = await asyncio.gather(*download_tasks)
-        upload_tasks = [upload_to_openai(path) for path in file_paths]
-        file_ids = await asyncio.gather(*upload_tasks)
-
-    # Wait for all uploaded files to be processed before returning
-    await asyncio.gather(*[_wait_for_file_processed(fid) for fid in file_ids])
-
-    return dict(zip(file_map.keys(), file_ids, strict=True))
+    return await (pipeline or get_upload_pipeline()).upload_from_urls(file_map)
@@ -18,7 +18,7 @@ class RunAgentInputCustom(RunAgentInput):
         default=None,
         description=(
             "Entire chat history as a flat list of messages. "
-            "Each message should contain 'agent', 'callerAgent', 'timestamp' and other OpenAI fields."
+            "Each message should contain 'agent', 'callerAgent', 'seq', 'timestamp' and other OpenAI fields."
         ),
     )
     additional_instructions: str | None = None
@@ -30,7 +30,7 @@ class BaseRequest(BaseModel):
         default=None,
         description=(
             "Entire chat history as a flat list of messages. "
-            "Each message should contain 'agent', 'callerAgent', 'timestamp' and other OpenAI fields."
+            "Each message should contain 'agent', 'callerAgent', 'seq', 'timestamp' and other OpenAI fields."
         ),
     )
     recipient_agent: str | None = None
@@ -1,9 +1,12 @@
 """Message handling utilities for Agency Swarm."""
 
+from .history_window import HistoryPolicy, HistoryWindowStats
 from .message_filter import MessageFilter
 from .message_formatter import MessageFormatter
 
 __all__ = [
+    "HistoryPolicy",
+    "HistoryWindowStats",
     "MessageFilter",
     "MessageFormatter",
 ]
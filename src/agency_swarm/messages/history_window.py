@@ -0,0 +1,215 @@
+"""Token-budgeted windowing of conversation history sent to the model."""
+
+import json
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import TResponseInputItem
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English text with OpenAI tokenizers; good enough for budgeting
+_CHARS_PER_TOKEN = 4
+# Per-item overhead (role, separators) added by the API
+_ITEM_OVERHEAD_TOKENS = 4
+# Fields added by Agency Swarm that the OpenAI API does not accept
+AGENCY_METADATA_FIELDS = frozenset(
+    {"agent", "callerAgent", "timestamp", "seq", "citations", "agent_run_id", "parent_run_id"}
+)
+
+TokenCounter = Callable[[TResponseInputItem], int]
+
+
+def estimate_message_tokens(message: TResponseInputItem) -> int:
+    """Estimate the number of tokens a history item costs when sent to the model.
+
+    Args:
+        message: History item (agency metadata fields are ignored)
+
+    Returns:
+        int: Approximate token count
+    """
+    if not isinstance(message, dict):
+        return _ITEM_OVERHEAD_TOKENS
+    payload = {k: v for k, v in message.items() if k not in AGENCY_METADATA_FIELDS}
+    text = json.dumps(payload, default=str, ensure_ascii=False)
+    return _ITEM_OVERHEAD_TOKENS + len(text) // _CHARS_PER_TOKEN
+
+
+@dataclass
+class HistoryWindowStats:
+    """Cumulative metrics of a ``HistoryPolicy``.
+
+    Attributes:
+        windows (int): Histories the policy was applied to.
+        trimmed_windows (int): Histories that were actually shortened.
+        trimmed_items (int): Items left out across all histories.
+        trimmed_tokens (int): Estimated tokens left out across all histories.
+        last_kept_tokens (int): Estimated tokens of the most recent window.
+        last_trimmed_tokens (int): Estimated tokens left out of the most recent window.
+    """
+
+    windows: int = 0
+    trimmed_windows: int = 0
+    trimmed_items: int = 0
+    trimmed_tokens: int = 0
+    last_kept_tokens: int = 0
+    last_trimmed_tokens: int = 0
+
+
+@dataclass
+class HistoryPolicy:
+    """Limits how much conversation history an agent sends to the model on each turn.
+
+    The window keeps the first ``keep_first`` items (e.g. the task statement), then as
+    many of the most recent items as fit in ``max_tokens``. The last ``keep_last`` items
+    are always kept, even over budget. Items that belong together, such as a
+    ``function_call`` and its ``function_call_output`` or a reasoning item and the item
+    it precedes, are kept or dropped as a unit.
+
+    Attributes:
+        max_tokens (int | None): Estimated token budget for the whole window. ``None`` keeps
+            everything unless ``keep_last`` is set.
+        keep_first (int): Leading items that are always kept.
+        keep_last (int | None): Trailing items that are always kept. Without ``max_tokens``
+            the window is exactly the first ``keep_first`` and last ``keep_last`` items.
+        stats (HistoryWindowStats): Cumulative trimming metrics.
+    """
+
+    max_tokens: int | None = None
+    keep_first: int = 0
+    keep_last: int | None = None
+    stats: HistoryWindowStats = field(default_factory=HistoryWindowStats, init=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.max_tokens is not None and self.max_tokens <= 0:
+            raise ValueError("max_tokens must be a positive integer")
+        if self.keep_first < 0 or (self.keep_last is not None and self.keep_last < 0):
+            raise ValueError("keep_first and keep_last must not be negative")
+
+    def apply(
+        self, history: list[TResponseInputItem], count_tokens: TokenCounter = estimate_message_tokens
+    ) -> list[TResponseInputItem]:
+        """Return the part of ``history`` that should be sent to the model.
+
+        Walks backwards from the newest item and stops as soon as the budget is used
+        up, so the cost depends on the size of the window rather than the thread.
+
+        Args:
+            history: Conversation history in chronological order
+            count_tokens: Token estimator, ideally cached per message
+                (see :meth:`ThreadManager.estimate_tokens`)
+
+        Returns:
+            list[TResponseInputItem]: ``history`` itself when nothing is trimmed,
+            otherwise a new list with the head and tail of the history
+        """
+        self.stats.windows += 1
+        if self.max_tokens is None and self.keep_last is None:
+            return history
+
+        head_end = _head_boundary(history, self.keep_first)
+        head_tokens = sum(count_tokens(m) for m in history[:head_end])
+        min_tail = max(self.keep_last or 0, 1)
+        tail_start = _tail_boundary(history, head_end, min_tail, self.max_tokens, head_tokens, count_tokens)
+
+        if tail_start <= head_end:
+            self.stats.last_kept_tokens = head_tokens + sum(count_tokens(m) for m in history[head_end:])
+            self.stats.last_trimmed_tokens = 0
+            return history
+
+        trimmed = history[head_end:tail_start]
+        trimmed_tokens = sum(count_tokens(m) for m in trimmed)
+        window = history[:head_end] + history[tail_start:]
+        self.stats.trimmed_windows += 1
+        self.stats.trimmed_items += len(trimmed)
+        self.stats.trimmed_tokens += trimmed_tokens
+        self.stats.last_kept_tokens = head_tokens + sum(count_tokens(m) for m in history[tail_start:])
+        self.stats.last_trimmed_tokens = trimmed_tokens
+        logger.info(
+            f"History window kept {len(window)}/{len(history)} items "
+            f"(~{self.stats.last_kept_tokens} tokens), trimmed ~{trimmed_tokens} tokens."
+        )
+        return window
+
+
+def recent_items_start(history: list[TResponseInputItem], min_items: int) -> int:
+    """Return where the last ``min_items`` items of ``history`` start, without splitting tool call pairs.
+
+    The returned index is moved earlier when needed so that everything from it onwards is
+    self-contained. It is 0 when no such cut exists.
+    """
+    return _tail_boundary(history, 0, max(min_items, 1), None, 0, lambda _message: 0)
+
+
+def _item_type(message: Any) -> str | None:
+    return message.get("type") if isinstance(message, dict) else None
+
+
+def _call_id(message: Any) -> str | None:
+    return message.get("call_id") if isinstance(message, dict) else None
+
+
+def _is_tool_output(message: Any) -> bool:
+    item_type = _item_type(message)
+    return bool(item_type and item_type.endswith("_output") and _call_id(message))
+
+
+def _head_boundary(history: list[TResponseInputItem], keep_first: int) -> int:
+    """Return the smallest self-contained prefix length that covers ``keep_first`` items."""
+    open_calls: set[str] = set()
+    end = 0
+    while end < len(history):
+        if end >= keep_first and not open_calls and (end == 0 or _item_type(history[end - 1]) != "reasoning"):
+            break
+        message = history[end]
+        call_id = _call_id(message)
+        if call_id:
+            if _is_tool_output(message):
+                open_calls.discard(call_id)
+            else:
+                open_calls.add(call_id)
+        end += 1
+    return end
+
+
+def _tail_boundary(
+    history: list[TResponseInputItem],
+    head_end: int,
+    min_items: int,
+    max_tokens: int | None,
+    head_tokens: int,
+    count_tokens: TokenCounter,
+) -> int:
+    """Return the start index of the longest self-contained suffix that fits the budget.
+
+    The suffix always holds at least ``min_items`` items (rounded out to a unit boundary).
+    """
+    budget = None if max_tokens is None else max_tokens - head_tokens
+    pending_outputs: set[str] = set()
+    tokens = 0
+    best = len(history)
+    start = len(history)
+    while start > head_end:
+        message = history[start - 1]
+        tokens += count_tokens(message)
+        call_id = _call_id(message)
+        if call_id:
+            if _is_tool_output(message):
+                pending_outputs.add(call_id)
+            else:
+                pending_outputs.discard(call_id)
+        start -= 1
+
+        # A cut before ``start`` must not orphan an output or separate a reasoning item
+        is_boundary = not pending_outputs and (start == 0 or _item_type(history[start - 1]) != "reasoning")
+        if not is_boundary or len(history) - start < min_items:
+            continue
+        if best == len(history) or (budget is not None and tokens <= budget):
+            best = start
+            continue
+        break
+    # No valid cut (e.g. orphaned tool outputs): keep everything rather than break pairs
+    return head_end if best == len(history) else best
@@ -13,6 +13,8 @@ from agents import (
 )
 from openai.types.responses import ResponseFileSearchToolCall, ResponseFunctionWebSearch
 
+from .history_window import AGENCY_METADATA_FIELDS, HistoryPolicy
+
 if TYPE_CHECKING:
     from agency_swarm.agent.core import AgencyContext, Agent
 
@@ -49,8 +51,7 @@ class MessageFormatter:
             modified_message["agent_run_id"] = agent_run_id  # type: ignore[typeddict-unknown-key]
         if parent_run_id is not None:
             modified_message["parent_run_id"] = parent_run_id  # type: ignore[typeddict-unknown-key]
-        # Use microsecond precision to reduce timestamp collisions
-        # time.time() returns seconds since epoch; multiply to get microseconds
+        # Wall-clock time for display only; ordering uses the `seq` assigned by ThreadManager
         modified_message["timestamp"] = int(time.time() * 1_000_000)  # type: ignore[typeddict-unknown-key]
         # Add type field if not present (for easier parsing/navigation)
         if "type" not in modified_message:
@@ -66,7 +67,10 @@ class MessageFormatter:
         agent_run_id: str | None = None,
         parent_run_id: str | None = None,
     ) -> list[TResponseInputItem]:
-        """Prepare conversation history for the runner."""
+        """Prepare conversation history for the runner.
+
+        When the agent has a ``history_policy``, only the window it selects is sent.
+        """
         # Get thread manager from context (required)
         if not agency_context or not agency_context.thread_manager:
             raise RuntimeError(f"Agent '{agent.name}' missing ThreadManager in agency context.")
@@ -91,13 +95,88 @@ class MessageFormatter:
 
         # Get relevant conversation history for this agent pair
         full_history = thread_manager.get_conversation_history(agent.name, sender_name)
+        history_policy = getattr(agent, "history_policy", None)
+        if isinstance(history_policy, HistoryPolicy):
+            full_history = history_policy.apply(full_history, thread_manager.estimate_tokens)
+
+        # Sanitize tool calls, ensure content safety and strip agency metadata in one pass
+        cache = getattr(thread_manager, "runner_item_cache", None)
+        return MessageFormatter.clean_history_for_runner(  # type: ignore[return-value]
+            full_history,  # type: ignore[arg-type]
+            cache=cache if isinstance(cache, dict) else None,
+        )
+
+    @staticmethod
+    def clean_history_for_runner(
+        history: list[dict[str, Any]], cache: dict[int, tuple] | None = None
+    ) -> list[dict[str, Any]]:
+        """Prepare stored messages for the OpenAI API in a single pass.
+
+        Equivalent to :meth:`sanitize_tool_calls_in_history`, then
+        :meth:`ensure_tool_calls_content_safety`, then :meth:`strip_agency_metadata`.
+
+        Args:
+            history: Stored messages in chronological order
+            cache: Optional memo of cleaned messages keyed by ``id(message)``. An entry keeps
+                its message alive and a snapshot of the message's fields, and is reused only
+                while every field is unchanged, so adding, removing or replacing any field
+                invalidates it. The cleaned dicts are shared between turns and must not be mutated.
+
+        Returns:
+            list[dict[str, Any]]: Cleaned copies of the messages
+        """
+        last_assistant_idx = None
+        for i in reversed(range(len(history))):
+            if history[i].get("role") == "assistant":
+                last_assistant_idx = i
+                break
+
+        cleaned = []
+        for idx, msg in enumerate(history):
+            drop_tool_calls = idx != last_assistant_idx and "tool_calls" in msg and msg.get("role") == "assistant"
+            if cache is None:
+                cleaned.append(MessageFormatter._clean_message(msg, drop_tool_calls))
+                continue
+            keys, values = tuple(msg), tuple(msg.values())
+            entry = cache.get(id(msg))
+            if (
+                entry is not None
+                and entry[0] is msg
+                and entry[1] == drop_tool_calls
+                and entry[2] == keys
+                and entry[3] == values
+            ):
+                cleaned.append(entry[4])
+                continue
+            clean_msg = MessageFormatter._clean_message(msg, drop_tool_calls)
+            cache[id(msg)] = (msg, drop_tool_calls, keys, values, clean_msg)
+            cleaned.append(clean_msg)
+        return cleaned
+
+    @staticmethod
+    def _clean_message(msg: dict[str, Any], drop_tool_calls: bool) -> dict[str, Any]:
+        clean_msg = {k: v for k, v in msg.items() if k not in AGENCY_METADATA_FIELDS}
+        if drop_tool_calls:
+            clean_msg.pop("tool_calls", None)
+        elif clean_msg.get("role") == "assistant" and clean_msg.get("tool_calls") and clean_msg.get("content") is None:
+            MessageFormatter._describe_tool_calls(clean_msg)
+        return clean_msg
+
+    @staticmethod
+    def _describe_tool_calls(msg: dict[str, Any]) -> None:
+        """Fill in descriptive content for an assistant message that only has tool calls."""
+        tool_descriptions = []
+        for tc in msg["tool_calls"]:
+            if isinstance(tc, dict):
+                func_name = tc.get("function", {}).get("name", "unknown")
+                tool_descriptions.append(func_name)
+
+        if tool_descriptions:
+            msg["content"] = f"Using tools: {', '.join(tool_descriptions)}"
+        else:
+            msg["content"] = "Executing tool calls"
 
-        # Prepare history for runner (sanitize and ensure content safety)
-        history_for_runner = MessageFormatter.sanitize_tool_calls_in_history(full_history)  # type: ignore[arg-type]
-        history_for_runner = MessageFormatter.ensure_tool_calls_content_safety(history_for_runner)
-        # Strip agency metadata before sending to OpenAI
-        history_for_runner = MessageFormatter.strip_agency_metadata(history_for_runner)
-        return history_for_runner  # type: ignore[return-value]
+        logger.debug(f"Fixed null content for assistant message with tool calls: {msg.get('content')}")
 
     @staticmethod
     def strip_agency_metadata(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -112,19 +191,7 @@ class MessageFormatter:
         cleaned = []
         for msg in messages:
             # Create a copy without agency fields (including citations which OpenAI doesn't accept)
-            clean_msg = {
-                k: v
-                for k, v in msg.items()
-                if k
-                not in [
-                    "agent",
-                    "callerAgent",
-                    "timestamp",
-                    "citations",
-                    "agent_run_id",
-                    "parent_run_id",
-                ]
-            }
+            clean_msg = {k: v for k, v in msg.items() if k not in AGENCY_METADATA_FIELDS}
             cleaned.append(clean_msg)
         return cleaned
 
@@ -162,19 +229,7 @@ class MessageFormatter:
             if msg.get("role") == "assistant" and msg.get("tool_calls") and msg.get("content") is None:
                 # Create a copy to avoid modifying the original
                 msg = dict(msg)
-                # Generate descriptive content for tool calls
-                tool_descriptions = []
-                for tc in msg["tool_calls"]:
-                    if isinstance(tc, dict):
-                        func_name = tc.get("function", {}).get("name", "unknown")
-                        tool_descriptions.append(func_name)
-
-                if tool_descriptions:
-                    msg["content"] = f"Using tools: {', '.join(tool_descriptions)}"
-                else:
-                    msg["content"] = "Executing tool calls"
-
-                logger.debug(f"Fixed null content for assistant message with tool calls: {msg.get('content')}")
+                MessageFormatter._describe_tool_calls(msg)
 
             sanitized.append(msg)
         return sanitized
@@ -1,11 +1,13 @@
 from .utils import (
     EventStreamMerger as EventStreamMerger,
     StreamingContext as StreamingContext,
+    StreamMultiplexer as StreamMultiplexer,
     add_agent_name_to_event as add_agent_name_to_event,
 )
 
 __all__ = [
     "EventStreamMerger",
     "StreamingContext",
+    "StreamMultiplexer",
     "add_agent_name_to_event",
 ]
@@ -7,13 +7,18 @@ from sub-agents to maintain full visibility during streaming operations.
 
 import asyncio
 import logging
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncGenerator, AsyncIterable, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Events buffered between producers and the consumer before producers wait
+DEFAULT_STREAM_BUFFER_SIZE = 64
+
+_SOURCE_DONE = object()
+
 
 def add_agent_name_to_event(
     event: Any,
@@ -115,16 +120,124 @@ def add_agent_name_to_event(
     return event
 
 
+@dataclass
+class _SourceFailed:
+    error: Exception
+
+
+class StreamMultiplexer:
+    """
+    Merges events from concurrent producers into a single stream.
+
+    Producers write into one bounded buffer and the consumer is woken only when an event
+    is available, so there is no timeout polling and no intermediate queue per source.
+    Events of one producer keep their order. The stream ends once every producer has
+    finished and the buffer is drained; events put after that are dropped. A producer
+    that raises ends the stream with its exception.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE):
+        """
+        Args:
+            buffer_size: Events buffered before producers wait for the consumer. 0 means unbounded.
+        """
+        if buffer_size < 0:
+            raise ValueError("buffer_size must not be negative")
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=buffer_size)
+        self._tasks: list[asyncio.Task] = []
+        self._active = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        """True once the stream has ended or was closed."""
+        return self._closed
+
+    async def put(self, event: Any) -> None:
+        """Push an event into the stream, waiting while the buffer is full."""
+        if self._closed:
+            logger.debug("Dropping event put after the stream ended")
+            return
+        await self._queue.put(event)
+
+    def add_producer(self, produce: Callable[[], Awaitable[None]], name: str | None = None) -> asyncio.Task:
+        """Run ``produce`` as a task that feeds the stream through :meth:`put`.
+
+        The stream stays open until the coroutine returns.
+        """
+        self._active += 1
+        task = asyncio.create_task(self._run_producer(produce), name=name)
+        self._tasks.append(task)
+        return task
+
+    def add_source(self, source: AsyncIterable[Any], name: str | None = None) -> asyncio.Task:
+        """Forward every event of an async iterable into the stream."""
+
+        async def pump() -> None:
+            async for event in source:
+                await self.put(event)
+
+        return self.add_producer(pump, name=name)
+
+    async def events(self) -> AsyncGenerator[Any]:
+        """Yield events as they arrive until all producers have finished."""
+        try:
+            while self._active:
+                item = await self._queue.get()
+                if item is _SOURCE_DONE:
+                    self._active -= 1
+                elif isinstance(item, _SourceFailed):
+                    raise item.error
+                else:
+                    yield item
+            self._closed = True
+            # Events that raced with the last producer finishing
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _SOURCE_DONE and not isinstance(item, _SourceFailed):
+                    yield item
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        """End the stream and cancel producers that are still running."""
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        # Unblock producers waiting on a full buffer so they can observe the cancellation
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        for task in self._tasks:
+            with suppress(asyncio.CancelledError, Exception):
+                await task
+        self._tasks.clear()
+
+    async def _run_producer(self, produce: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await produce()
+        except Exception as e:
+            await self._queue.put(_SourceFailed(e))
+        await self._queue.put(_SOURCE_DONE)
+
+
 @dataclass
 class StreamingContext:
-    """Context for managing event streaming across nested agent calls."""
+    """Context for managing event streaming across nested agent calls.
+
+    When ``sink`` is set, events are handed to it directly (e.g. ``StreamMultiplexer.put``)
+    instead of being queued for a separate forwarder.
+    """
 
     event_queue: asyncio.Queue = field(default_factory=asyncio.Queue)
     is_streaming: bool = True
     _merge_task: asyncio.Task | None = None
+    sink: Callable[[Any], Awaitable[None]] | None = None
 
     async def put_event(self, event: Any) -> None:
-        """Add an event to the queue."""
+        """Add an event to the stream."""
+        if self.sink is not None:
+            await self.sink(event)
+            return
         await self.event_queue.put(event)
 
     async def get_event(self) -> Any:
@@ -157,65 +270,25 @@ class EventStreamMerger:
         self,
         primary_stream: AsyncGenerator[Any],
         context: StreamingContext,
+        buffer_size: int = DEFAULT_STREAM_BUFFER_SIZE,
     ) -> AsyncGenerator[Any]:
         """
         Merge events from the primary stream and the context's event queue.
 
         This allows sub-agent events to be interleaved with the main agent's events.
+        The merged stream ends with the primary stream.
         """
-        # Create tasks for both sources
-        primary_task = asyncio.create_task(self._consume_primary(primary_stream))
-        queue_task = asyncio.create_task(self._consume_queue(context))
-
-        pending = {primary_task, queue_task}
-
+        # Events queued before merging started go first
+        while not context.event_queue.empty():
+            event = context.event_queue.get_nowait()
+            if event is not None:
+                yield event
+        multiplexer = StreamMultiplexer(buffer_size)
+        context.sink = multiplexer.put
+        multiplexer.add_source(primary_stream, name="primary-stream")
         try:
-            while pending:
-                # Wait for the first task to produce an event
-                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
-
-                for task in done:
-                    try:
-                        event = task.result()
-                        if event is None:
-                            # Stream ended
-                            if task == primary_task:
-                                logger.debug("Primary stream ended")
-                                # Cancel queue task if primary is done
-                                queue_task.cancel()
-                                return
-                            else:
-                                logger.debug("Queue stream ended")
-                                # Queue ended, but primary might still have events
-                                continue
-                        else:
-                            yield event
-
-                            # Restart the task to get the next event
-                            if task == primary_task:
-                                primary_task = asyncio.create_task(self._consume_primary(primary_stream))
-                                pending.add(primary_task)
-                            else:
-                                queue_task = asyncio.create_task(self._consume_queue(context))
-                                pending.add(queue_task)
-                    except asyncio.CancelledError:
-                        pass
-                    except Exception as e:
-                        logger.error(f"Error in stream merger: {e}")
-                        raise
+            async for event in multiplexer.events():
+                yield event
         finally:
-            # Clean up any remaining tasks
-            for task in pending:
-                task.cancel()
-
-    async def _consume_primary(self, stream: AsyncGenerator[Any]) -> Any:
-        """Consume one event from the primary stream."""
-        try:
-            return await stream.__anext__()
-        except StopAsyncIteration:
-            return None
-
-    async def _consume_queue(self, context: StreamingContext) -> Any:
-        """Consume one event from the queue."""
-        event = await context.get_event()
-        return event  # None is sentinel for end
+            context.sink = None
+            logger.debug("Primary stream ended")
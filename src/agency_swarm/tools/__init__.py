@@ -1,6 +1,17 @@
 from .base_tool import BaseTool
-from .concurrency import ToolConcurrencyManager
-from .send_message import SendMessage, SendMessageHandoff
+from .cache import ToolCacheConfig, ToolCacheStats, clear_tool_caches, get_tool_cache_stats
+from .concurrency import ConcurrencyGroup, ToolConcurrencyManager, ToolQueueStats
+from .executors import (
+    ToolExecutor,
+    ToolExecutorStats,
+    get_tool_executor_stats,
+    register_tool_executor,
+    shutdown_tool_executors,
+)
+from .http_pool import HTTPClientConfig, aclose_http_clients
+from .mcp_manager import MCPServerManager
+from .schema_cache import SchemaCacheStats, clear_schema_cache, configure_schema_cache, get_schema_cache_stats
+from .send_message import SendMessage, SendMessageBroadcast, SendMessageHandoff
 from .tool_factory import ToolFactory
 from .utils import validate_openapi_spec
 
@@ -8,7 +19,26 @@ __all__ = [
     "BaseTool",
     "ToolFactory",
     "ToolConcurrencyManager",
+    "ConcurrencyGroup",
+    "ToolQueueStats",
+    "MCPServerManager",
+    "HTTPClientConfig",
+    "aclose_http_clients",
+    "ToolCacheConfig",
+    "ToolCacheStats",
+    "get_tool_cache_stats",
+    "clear_tool_caches",
+    "SchemaCacheStats",
+    "configure_schema_cache",
+    "get_schema_cache_stats",
+    "clear_schema_cache",
+    "ToolExecutor",
+    "ToolExecutorStats",
+    "register_tool_executor",
+    "get_tool_executor_stats",
+    "shutdown_tool_executors",
     "SendMessage",
+    "SendMessageBroadcast",
     "SendMessageHandoff",
     "validate_openapi_spec",
 ]
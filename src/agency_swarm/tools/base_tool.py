@@ -15,6 +15,8 @@ from docstring_parser import parse
 from pydantic import BaseModel
 
 from ..context import MasterContext
+from .cache import ToolCacheConfig
+from .concurrency import DEFAULT_QUEUE_TIMEOUT
 
 
 class classproperty:
@@ -51,9 +53,21 @@ class BaseTool(BaseModel, ABC):
 
     class ToolConfig:
         strict: bool = False
-        # When True, this tool runs with a one-call-at-a-time policy per agent; any concurrent
-        # tool call for the same agent will immediately error until completion.
+        # When True, this tool runs with a one-call-at-a-time policy per agent; concurrent
+        # tool calls for the same agent wait until it completes.
         one_call_at_a_time: bool = False
+        # Maximum simultaneous calls of this tool per agent (None = unlimited); extra calls wait in line.
+        max_concurrency: int | None = None
+        # Agency-wide limit shared with other tools, configured via Agency(tool_concurrency_limits=...).
+        concurrency_group: str | None = None
+        # Seconds a call may wait for a free slot before returning an error (None = wait indefinitely).
+        queue_timeout: float | None = DEFAULT_QUEUE_TIMEOUT
+        # Backend for a sync run(): None (shared default thread pool), "inline", "process" (picklable
+        # CPU-bound tools, no run context) or the name of a dedicated thread pool (see register_tool_executor).
+        executor: str | None = None
+        # Cache outputs of identical calls: True or a ToolCacheConfig (TTL, max entries, key, scope).
+        # Only for read-only tools whose output depends on their arguments alone.
+        cache: bool | ToolCacheConfig | None = None
 
     @classproperty
     def openai_schema(cls) -> dict[str, Any]:
@@ -0,0 +1,356 @@
+"""
+Result caching for read-only tools.
+
+A tool opts in with ``ToolConfig.cache`` (``BaseTool``) or a ``cache`` attribute
+(``FunctionTool``), set to ``True`` or a ``ToolCacheConfig``. Identical calls within the
+configured scope then return the stored output instead of running the tool again, and
+identical calls made while the first one is still running wait for its result
+(single-flight) instead of running in parallel.
+
+Caches belong to one tool: a ``BaseTool`` class, or the tool of that name on one agent
+for other tools (e.g. generated OpenAPI tools), and to one cache configuration.
+
+Scopes:
+- ``"process"``: shared by every agent and agency in the process using the tool,
+  optionally backed by a SQLite file that survives restarts,
+- ``"agency"``: shared by the runs of one agency and its clones,
+- ``"thread"``: limited to one conversation thread.
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Literal
+
+logger = logging.getLogger(__name__)
+
+CacheScope = Literal["thread", "agency", "process"]
+
+# Default failure message of Agents SDK function tools
+_SDK_TOOL_ERROR_PREFIX = "An error occurred while running the tool"
+
+
+@dataclass
+class ToolCacheConfig:
+    """Declarative result cache settings for a tool.
+
+    Outputs that look like errors (starting with "Error" or the Agents SDK's default tool
+    error message) are never cached.
+
+    Attributes:
+        ttl (float | None): Seconds an output stays valid. None keeps it until evicted.
+        max_entries (int): Outputs kept in memory per tool and scope; least recently used
+            ones are evicted first.
+        key (Callable[[dict[str, Any]], Hashable] | None): Builds the cache key from the
+            parsed tool arguments, e.g. to ignore arguments that do not affect the output.
+            Defaults to the arguments as canonical JSON.
+        scope (str): "thread", "agency" or "process".
+        disk_path (str | Path | None): SQLite file persisting outputs across restarts.
+            Only supported with the "process" scope; outputs must be JSON serializable.
+        should_cache (Callable[[Any], bool] | None): Extra check deciding whether an output
+            is stored, e.g. to skip error payloads a tool returns as regular output.
+    """
+
+    ttl: float | None = 300.0
+    max_entries: int = 1024
+    key: Callable[[dict[str, Any]], Hashable] | None = None
+    scope: CacheScope = "process"
+    disk_path: str | Path | None = None
+    should_cache: Callable[[Any], bool] | None = None
+
+    def __post_init__(self):
+        if self.scope not in ("thread", "agency", "process"):
+            raise ValueError(f"Unknown tool cache scope '{self.scope}'. Use 'thread', 'agency' or 'process'.")
+        if self.max_entries < 1:
+            raise ValueError(f"Tool cache max_entries must be >= 1, got {self.max_entries}.")
+        if self.disk_path is not None and self.scope != "process":
+            raise ValueError("Tool cache disk_path is only supported with scope='process'.")
+
+    def make_key(self, input_json: str) -> Hashable | None:
+        """Cache key for a call, or None if the arguments cannot be parsed."""
+        try:
+            args = json.loads(input_json) if input_json else {}
+        except (TypeError, ValueError):
+            return None
+        if self.key is not None:
+            return self.key(args)
+        return json.dumps(args, sort_keys=True, separators=(",", ":"))
+
+    def identity(self) -> tuple:
+        """Hashable value of the settings; tools with different settings get separate caches."""
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+
+@dataclass
+class ToolCacheStats:
+    """Hit/miss metrics of a tool cache.
+
+    Attributes:
+        hits (int): Calls answered from the cache (memory or disk).
+        misses (int): Calls that ran the tool.
+        coalesced (int): Calls that waited for an identical call already running.
+        evictions (int): Outputs dropped to stay within ``max_entries``.
+        expirations (int): Outputs dropped because their TTL passed.
+        size (int): Outputs currently held in memory.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.coalesced + self.misses
+        return (self.hits + self.coalesced) / total if total else 0.0
+
+
+class _DiskCache:
+    """SQLite table of tool outputs shared by the process-scoped caches of one file."""
+
+    def __init__(self, path: str | Path):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tool_cache ("
+                "tool TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL, "
+                "PRIMARY KEY (tool, key))"
+            )
+            self._conn.execute("DELETE FROM tool_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    def get(self, tool: str, key: str) -> tuple[bool, Any, float | None]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM tool_cache WHERE tool = ? AND key = ?", (tool, key)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return False, None, None
+        return True, json.loads(row[0]), row[1]
+
+    def set(self, tool: str, key: str, value: Any, expires_at: float | None) -> None:
+        try:
+            data = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_cache (tool, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (tool, key, data, expires_at),
+            )
+            self._conn.commit()
+
+
+_disk_caches: dict[str, _DiskCache] = {}
+# Guards the module registries; reentrant because creating a cache opens its disk tier
+_registry_lock = threading.RLock()
+
+
+def _get_disk_cache(path: str | Path) -> _DiskCache:
+    resolved = str(Path(path).expanduser().resolve())
+    with _registry_lock:
+        if resolved not in _disk_caches:
+            _disk_caches[resolved] = _DiskCache(resolved)
+        return _disk_caches[resolved]
+
+
+class ToolResultCache:
+    """
+    In-memory LRU of one tool's outputs with TTL, single-flight and an optional disk tier.
+
+    Args:
+        tool_name: Name of the cached tool.
+        config: Cache settings.
+        namespace: Identifies the tool's outputs in the disk tier. Defaults to ``tool_name``.
+    """
+
+    def __init__(self, tool_name: str, config: ToolCacheConfig, namespace: str | None = None):
+        self.tool_name = tool_name
+        self.config = config
+        self.namespace = namespace or tool_name
+        self._entries: OrderedDict[Hashable, tuple[Any, float | None]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._stats = ToolCacheStats()
+        self._lock = threading.Lock()
+        self._disk = _get_disk_cache(config.disk_path) if config.disk_path is not None else None
+
+    def get(self, key: Hashable) -> tuple[bool, Any]:
+        """Return ``(found, output)`` for ``key`` without running the tool."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats.hits += 1
+                    return True, value
+                del self._entries[key]
+                self._stats.expirations += 1
+        if self._disk is not None:
+            found, value, disk_expires_at = self._disk.get(self.namespace, str(key))
+            if found:
+                remaining = None if disk_expires_at is None else disk_expires_at - time.time()
+                self._store(key, value, None if remaining is None else now + remaining)
+                with self._lock:
+                    self._stats.hits += 1
+                return True, value
+        return False, None
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store an output for ``key``."""
+        ttl = self.config.ttl
+        self._store(key, value, None if ttl is None else time.monotonic() + ttl)
+        if self._disk is not None:
+            self._disk.set(self.namespace, str(key), value, None if ttl is None else time.time() + ttl)
+
+    def _store(self, key: Hashable, value: Any, expires_at: float | None) -> None:
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    async def get_or_call(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached output for ``key``, or run ``call`` once for all concurrent callers."""
+        loop = asyncio.get_running_loop()
+        while True:
+            found, value = self.get(key)
+            if found:
+                return value
+            running = self._inflight.get(key)
+            if running is None or running.get_loop() is not loop:
+                break
+            with self._lock:
+                self._stats.coalesced += 1
+            try:
+                return await asyncio.shield(running)
+            except asyncio.CancelledError:
+                if not running.cancelled():
+                    raise
+                # The call we waited for was cancelled; try again ourselves.
+
+        future = loop.create_future()
+        self._inflight[key] = future
+        with self._lock:
+            self._stats.misses += 1
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark as retrieved when nobody is waiting
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        if not _is_error_output(value) and (self.config.should_cache is None or self.config.should_cache(value)):
+            self.set(key, value)
+        future.set_result(value)
+        return value
+
+    def clear(self) -> None:
+        """Drop all in-memory outputs."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> ToolCacheStats:
+        """Snapshot of the cache's metrics."""
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+
+def _is_error_output(value: Any) -> bool:
+    return isinstance(value, str) and (value.startswith("Error") or value.startswith(_SDK_TOOL_ERROR_PREFIX))
+
+
+_process_caches: dict[Hashable, ToolResultCache] = {}
+_thread_caches: "weakref.WeakKeyDictionary[Any, dict[Hashable, ToolResultCache]]" = weakref.WeakKeyDictionary()
+_all_caches: "weakref.WeakSet[ToolResultCache]" = weakref.WeakSet()
+
+
+def resolve_cache_config(value: Any) -> ToolCacheConfig | None:
+    """Normalize a ``cache`` setting (None/False, True, dict or ToolCacheConfig)."""
+    if not value:
+        return None
+    if value is True:
+        return ToolCacheConfig()
+    if isinstance(value, dict):
+        return ToolCacheConfig(**value)
+    if isinstance(value, ToolCacheConfig):
+        return value
+    raise TypeError(f"Tool cache must be a bool, dict or ToolCacheConfig, got {type(value).__name__}.")
+
+
+def get_tool_cache(
+    tool_name: str, config: ToolCacheConfig, master_context: Any = None, owner: str | None = None
+) -> ToolResultCache:
+    """
+    Return the cache a call of ``tool_name`` uses in the given run.
+
+    Thread and agency scopes need the run's ``MasterContext``; without one (e.g. a tool
+    invoked outside an agent run) the process scope is used.
+
+    Args:
+        tool_name: Name of the tool.
+        config: Cache settings of the tool; other settings use a separate cache.
+        master_context: ``MasterContext`` of the run.
+        owner: What the tool belongs to, e.g. its ``BaseTool`` class or its agent, so that
+            different tools with the same name do not share outputs.
+    """
+    cache_key = (owner, tool_name, config.identity())
+    caches: dict[Hashable, ToolResultCache] | None = None
+    with _registry_lock:
+        if config.scope == "thread" and getattr(master_context, "thread_manager", None) is not None:
+            caches = _thread_caches.setdefault(master_context.thread_manager, {})
+        elif config.scope == "agency":
+            caches = getattr(master_context, "_tool_caches", None)
+        if caches is None:
+            caches = _process_caches
+        cache = caches.get(cache_key)
+        if cache is None:
+            namespace = f"{owner}:{tool_name}" if owner else tool_name
+            cache = caches[cache_key] = ToolResultCache(tool_name, config, namespace=namespace)
+            _all_caches.add(cache)
+        return cache
+
+
+def get_tool_cache_stats() -> dict[str, ToolCacheStats]:
+    """Metrics of all live caches, summed per tool name."""
+    with _registry_lock:
+        caches = list(_all_caches)
+    totals: dict[str, ToolCacheStats] = {}
+    for cache in caches:
+        stats = cache.get_stats()
+        total = totals.setdefault(cache.tool_name, ToolCacheStats())
+        total.hits += stats.hits
+        total.misses += stats.misses
+        total.coalesced += stats.coalesced
+        total.evictions += stats.evictions
+        total.expirations += stats.expirations
+        total.size += stats.size
+    return totals
+
+
+def clear_tool_caches() -> None:
+    """Drop the in-memory outputs of every cache (disk tiers are kept)."""
+    with _registry_lock:
+        caches = list(_all_caches)
+    for cache in caches:
+        cache.clear()
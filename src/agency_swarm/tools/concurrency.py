@@ -1,12 +1,25 @@
 """
 Tool concurrency management for agents.
 
-This module provides the ToolConcurrencyManager class for managing one-call-at-a-time
-tool execution constraints within individual agent instances.
+This module provides the ToolConcurrencyManager class, an async FIFO scheduler for the
+tool calls of a single agent instance, and ConcurrencyGroup for limits shared by tools
+of several agents (e.g. one database connection pool used across an agency).
+
+Calls that cannot start yet wait in line instead of failing, so parallel tool calls
+issued by the model are serialized transparently.
 """
 
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, replace
 from typing import NamedTuple
 
+# Seconds a tool call waits for a free slot before the model gets an error instead
+DEFAULT_QUEUE_TIMEOUT = 300.0
+
 
 class LockState(NamedTuple):
     """Represents the state of a concurrency lock."""
@@ -15,17 +28,62 @@ class LockState(NamedTuple):
     owner: str | None
 
 
+@dataclass
+class ToolQueueStats:
+    """Scheduling metrics of one tool (or concurrency group).
+
+    Attributes:
+        active (int): Calls currently running.
+        waiting (int): Calls currently waiting for a slot.
+        calls (int): Calls that were granted a slot.
+        timeouts (int): Calls that gave up waiting.
+        total_wait_seconds (float): Time granted calls spent waiting.
+        max_wait_seconds (float): Longest wait of a granted call.
+    """
+
+    active: int = 0
+    waiting: int = 0
+    calls: int = 0
+    timeouts: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+    @property
+    def average_wait_seconds(self) -> float:
+        return self.total_wait_seconds / self.calls if self.calls else 0.0
+
+
+@dataclass
+class _Waiter:
+    tool_name: str
+    exclusive: bool
+    max_concurrency: int | None
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
 class ToolConcurrencyManager:
     """
-    Manages tool concurrency for a single agent instance.
+    Schedules the tool calls of a single agent instance.
+
+    Supports three kinds of limits:
+    - exclusive calls (``one_call_at_a_time``) that run while no other tool of the agent runs,
+    - a per-tool maximum number of simultaneous calls (``max_concurrency``),
+    - an optional wait timeout per call.
 
-    Provides tracking of tool execution state to enforce
-    one-call-at-a-time constraints for tools that require sequential execution.
+    Waiting calls are granted in FIFO order. A waiting exclusive call holds back the calls
+    queued behind it so it cannot be starved; calls of a tool that is at its limit do not
+    hold back calls of other tools. The manager may be shared by runs on different event
+    loops (e.g. sync ``get_response`` from several threads).
     """
 
     def __init__(self) -> None:
         self._lock_state = LockState(busy=False, owner=None)
         self._active_count = 0
+        self._running: dict[str, int] = {}
+        self._queue: deque[_Waiter] = deque()
+        self._stats: dict[str, ToolQueueStats] = {}
+        self._mutex = threading.Lock()
 
     def is_lock_active(self) -> tuple[bool, str | None]:
         """
@@ -48,6 +106,7 @@ class ToolConcurrencyManager:
     def release_lock(self) -> None:
         """Release the one-call lock."""
         self._lock_state = LockState(busy=False, owner=None)
+        self._wake_waiters()
 
     def get_active_count(self) -> int:
         """Get the current number of active tool executions."""
@@ -61,3 +120,191 @@ class ToolConcurrencyManager:
         """Decrement the active tool count, ensuring it doesn't go below zero."""
         if self._active_count > 0:
             self._active_count -= 1
+        self._wake_waiters()
+
+    # --- Scheduling ---
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        tool_name: str,
+        *,
+        exclusive: bool = False,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Wait for a slot to run ``tool_name`` and hold it for the duration of the block.
+
+        Args:
+            tool_name: Name of the tool being called.
+            exclusive: Run only while no other tool of the agent is running.
+            max_concurrency: Maximum simultaneous calls of this tool. None means unlimited.
+            timeout: Seconds to wait for a slot. None waits indefinitely.
+
+        Raises:
+            TimeoutError: If no slot became available within ``timeout``.
+        """
+        await self.acquire(tool_name, exclusive=exclusive, max_concurrency=max_concurrency, timeout=timeout)
+        try:
+            yield
+        finally:
+            self.release(tool_name, exclusive=exclusive)
+
+    async def acquire(
+        self,
+        tool_name: str,
+        *,
+        exclusive: bool = False,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """Wait for a slot to run ``tool_name``. See ``slot`` for the arguments."""
+        waiter = _Waiter(tool_name, exclusive, max_concurrency, asyncio.get_running_loop().create_future())
+        with self._mutex:
+            stats = self._stats.setdefault(tool_name, ToolQueueStats())
+            if not self._queue and self._can_start(waiter):
+                self._start(waiter)
+                return
+            self._queue.append(waiter)
+            stats.waiting += 1
+        self._wake_waiters()
+
+        try:
+            await asyncio.wait_for(waiter.future, timeout)
+        except (TimeoutError, asyncio.CancelledError) as e:
+            granted = waiter.future.done() and not waiter.future.cancelled()
+            with self._mutex:
+                if waiter in self._queue:
+                    self._queue.remove(waiter)
+                    stats.waiting -= 1
+                if isinstance(e, TimeoutError):
+                    stats.timeouts += 1
+            if granted:
+                self.release(tool_name, exclusive=exclusive)
+            else:
+                self._wake_waiters()
+            raise
+
+    def release(self, tool_name: str, *, exclusive: bool = False) -> None:
+        """Release a slot obtained with ``acquire`` and admit the next waiting calls."""
+        with self._mutex:
+            if exclusive:
+                self._lock_state = LockState(busy=False, owner=None)
+            if self._active_count > 0:
+                self._active_count -= 1
+            if self._running.get(tool_name, 0) > 0:
+                self._running[tool_name] -= 1
+                self._stats[tool_name].active -= 1
+        self._wake_waiters()
+
+    def _can_start(self, waiter: _Waiter) -> bool:
+        if self._lock_state.busy:
+            return False
+        if waiter.exclusive:
+            return self._active_count == 0
+        if waiter.max_concurrency is not None and self._running.get(waiter.tool_name, 0) >= waiter.max_concurrency:
+            return False
+        return True
+
+    def _start(self, waiter: _Waiter) -> None:
+        if waiter.exclusive:
+            self._lock_state = LockState(busy=True, owner=waiter.tool_name)
+        self._active_count += 1
+        self._running[waiter.tool_name] = self._running.get(waiter.tool_name, 0) + 1
+        stats = self._stats[waiter.tool_name]
+        stats.active += 1
+        stats.calls += 1
+        waited = time.perf_counter() - waiter.enqueued_at
+        stats.total_wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    def _wake_waiters(self) -> None:
+        granted: list[_Waiter] = []
+        with self._mutex:
+            held_back: set[str] = set()
+            for waiter in list(self._queue):
+                if waiter.future.done():
+                    continue
+                if waiter.tool_name in held_back:
+                    continue
+                if self._can_start(waiter):
+                    self._queue.remove(waiter)
+                    self._stats[waiter.tool_name].waiting -= 1
+                    self._start(waiter)
+                    granted.append(waiter)
+                elif waiter.exclusive or self._lock_state.busy:
+                    break
+                else:
+                    held_back.add(waiter.tool_name)
+
+        for waiter in granted:
+            self._grant(waiter)
+
+    def _grant(self, waiter: _Waiter) -> None:
+        loop = waiter.future.get_loop()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            self._resolve(waiter)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._resolve, waiter)
+            except RuntimeError:
+                # The waiting call's loop is gone; hand its slot back.
+                self.release(waiter.tool_name, exclusive=waiter.exclusive)
+
+    def _resolve(self, waiter: _Waiter) -> None:
+        if waiter.future.done():
+            # Cancelled between being granted and being resolved.
+            self.release(waiter.tool_name, exclusive=waiter.exclusive)
+        else:
+            waiter.future.set_result(None)
+
+    # --- Introspection ---
+
+    def get_queue_depth(self, tool_name: str | None = None) -> int:
+        """Number of calls waiting for a slot, for one tool or for all tools."""
+        with self._mutex:
+            return sum(1 for waiter in self._queue if tool_name is None or waiter.tool_name == tool_name)
+
+    def get_stats(self) -> dict[str, ToolQueueStats]:
+        """Snapshot of the scheduling metrics per tool name."""
+        with self._mutex:
+            return {name: replace(stats) for name, stats in self._stats.items()}
+
+
+class ConcurrencyGroup:
+    """
+    Limit on simultaneous tool calls shared by every tool in the group, across agents.
+
+    Tools join a group with ``ToolConfig.concurrency_group`` (or a ``concurrency_group``
+    attribute on a ``FunctionTool``); groups are configured on the agency with
+    ``Agency(tool_concurrency_limits={"database": 2})``. Share one instance between
+    agencies to share the limit.
+
+    Args:
+        name: Group name referenced by tools.
+        max_concurrency: Maximum simultaneous calls of all tools in the group.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError(f"Concurrency group '{name}' needs max_concurrency >= 1, got {max_concurrency}.")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._scheduler = ToolConcurrencyManager()
+
+    def slot(self, timeout: float | None = None):
+        """Wait for a slot in the group and hold it for the duration of the ``async with`` block."""
+        return self._scheduler.slot(self.name, max_concurrency=self.max_concurrency, timeout=timeout)
+
+    def get_queue_depth(self) -> int:
+        """Number of calls waiting for a slot in the group."""
+        return self._scheduler.get_queue_depth()
+
+    def get_stats(self) -> ToolQueueStats:
+        """Snapshot of the group's scheduling metrics."""
+        return self._scheduler.get_stats().get(self.name, ToolQueueStats())
@@ -0,0 +1,232 @@
+"""
+Execution backends for synchronous ``BaseTool.run`` methods.
+
+By default sync tools run through ``asyncio.to_thread``, i.e. in the event loop's shared
+default executor. A tool can pick a dedicated backend with ``ToolConfig.executor``:
+
+- ``"inline"``: run on the event loop thread (only for very fast tools),
+- ``"process"``: a shared process pool for CPU-bound tools whose class and arguments can
+  be pickled; the tool has no access to the run context there,
+- any other name: a named, bounded thread pool, created on first use or configured up
+  front with ``register_tool_executor``.
+
+Every backend records saturation metrics, see ``get_tool_executor_stats``.
+"""
+
+import asyncio
+import contextvars
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Any, Literal
+
+if TYPE_CHECKING:
+    from .base_tool import BaseTool
+
+logger = logging.getLogger(__name__)
+
+ExecutorKind = Literal["thread", "process", "inline"]
+
+DEFAULT_THREAD_POOL_WORKERS = 4
+
+
+@dataclass
+class ToolExecutorStats:
+    """Saturation metrics of one tool executor.
+
+    Attributes:
+        name (str): Executor name used in ``ToolConfig.executor``.
+        kind (str): "thread", "process" or "inline".
+        max_workers (int): Calls that can run at the same time.
+        in_flight (int): Calls submitted and not finished yet (running or queued).
+        peak_in_flight (int): Highest ``in_flight`` seen.
+        submitted (int): Calls submitted.
+        completed (int): Calls finished, including failed ones.
+        failed (int): Calls that raised.
+        saturated (int): Calls submitted while all workers were busy, i.e. that had to queue.
+        total_seconds (float): Time from submission to completion, summed over finished calls.
+    """
+
+    name: str
+    kind: str
+    max_workers: int
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    saturated: int = 0
+    total_seconds: float = 0.0
+
+    @property
+    def queued(self) -> int:
+        return max(self.in_flight - self.max_workers, 0)
+
+    @property
+    def utilization(self) -> float:
+        return min(self.in_flight, self.max_workers) / self.max_workers if self.max_workers else 0.0
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.completed if self.completed else 0.0
+
+
+def _run_in_process(tool_class: type["BaseTool"], args: dict[str, Any]) -> Any:
+    """Instantiate and run a tool in a worker process."""
+    return tool_class(**args).run()
+
+
+class ToolExecutor:
+    """
+    A named backend running synchronous tool code, with saturation metrics.
+
+    Args:
+        name: Name referenced by ``ToolConfig.executor``.
+        kind: "thread" for a bounded thread pool, "process" for a process pool,
+            "inline" to run on the calling thread.
+        max_workers: Pool size. Defaults to ``DEFAULT_THREAD_POOL_WORKERS`` threads or
+            one process per CPU.
+    """
+
+    def __init__(self, name: str, kind: ExecutorKind = "thread", max_workers: int | None = None):
+        if kind not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown tool executor kind '{kind}'. Use 'thread', 'process' or 'inline'.")
+        if kind == "inline":
+            max_workers = 1
+        elif max_workers is None:
+            max_workers = DEFAULT_THREAD_POOL_WORKERS if kind == "thread" else os.cpu_count() or 1
+        if max_workers < 1:
+            raise ValueError(f"Tool executor '{name}' needs max_workers >= 1, got {max_workers}.")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max_workers
+        self._executor: Executor | None = None
+        self._stats = ToolExecutorStats(name=name, kind=kind, max_workers=max_workers)
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # Spawned workers do not inherit the parent's threads and locks.
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f"agency-swarm-tool-{self.name}"
+                    )
+            return self._executor
+
+    async def run_tool(self, tool_instance: "BaseTool", args: dict[str, Any]) -> Any:
+        """Run ``tool_instance.run()`` on this backend.
+
+        Process pools receive the tool class and ``args`` and rebuild the tool in the worker.
+        """
+        started = self._submitted()
+        failed = False
+        try:
+            if self.kind == "inline":
+                return tool_instance.run()
+            loop = asyncio.get_running_loop()
+            if self.kind == "process":
+                return await loop.run_in_executor(self._get_executor(), _run_in_process, type(tool_instance), args)
+            # Keep context variables (e.g. tracing spans) like asyncio.to_thread does
+            call_context = contextvars.copy_context()
+            return await loop.run_in_executor(self._get_executor(), call_context.run, tool_instance.run)
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self._finished(started, failed)
+
+    def _submitted(self) -> float:
+        with self._lock:
+            stats = self._stats
+            if stats.in_flight >= stats.max_workers:
+                stats.saturated += 1
+            stats.submitted += 1
+            stats.in_flight += 1
+            stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        return time.perf_counter()
+
+    def _finished(self, started: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats
+            stats.in_flight -= 1
+            stats.completed += 1
+            stats.failed += int(failed)
+            stats.total_seconds += time.perf_counter() - started
+
+    def get_stats(self) -> ToolExecutorStats:
+        """Snapshot of the executor's metrics."""
+        with self._lock:
+            return replace(self._stats)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool. It is recreated if the executor is used again."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+_executors: dict[str, ToolExecutor] = {}
+_registry_lock = threading.Lock()
+
+
+def register_tool_executor(name: str, kind: ExecutorKind = "thread", max_workers: int | None = None) -> ToolExecutor:
+    """
+    Configure the executor used by tools with ``ToolConfig.executor = name``.
+
+    Replaces (and shuts down) a previously registered executor of the same name.
+
+    Args:
+        name: Executor name.
+        kind: "thread", "process" or "inline".
+        max_workers: Pool size, see ``ToolExecutor``.
+
+    Returns:
+        The registered executor.
+    """
+    executor = ToolExecutor(name, kind=kind, max_workers=max_workers)
+    with _registry_lock:
+        previous = _executors.get(name)
+        _executors[name] = executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def get_tool_executor(name: str) -> ToolExecutor:
+    """Return the executor registered as ``name``, creating a default one on first use.
+
+    "inline" and "process" create executors of that kind; other names create a thread pool
+    with ``DEFAULT_THREAD_POOL_WORKERS`` workers.
+    """
+    with _registry_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            kind: ExecutorKind = name if name in ("inline", "process") else "thread"  # type: ignore[assignment]
+            executor = _executors[name] = ToolExecutor(name, kind=kind)
+            logger.debug(f"Created tool executor '{name}' ({kind}, max_workers={executor.max_workers}).")
+        return executor
+
+
+def get_tool_executor_stats() -> dict[str, ToolExecutorStats]:
+    """Snapshot of the metrics of every executor in use."""
+    with _registry_lock:
+        executors = list(_executors.values())
+    return {executor.name: executor.get_stats() for executor in executors}
+
+
+def shutdown_tool_executors(wait: bool = True) -> None:
+    """Shut down every executor's pool, e.g. on application shutdown."""
+    with _registry_lock:
+        executors = list(_executors.values())
+    for executor in executors:
+        executor.shutdown(wait=wait)
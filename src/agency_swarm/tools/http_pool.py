@@ -0,0 +1,210 @@
+"""
+Pooled HTTP clients for OpenAPI-generated tools.
+
+Tools created with ``ToolFactory.from_openapi_schema`` send their requests through one
+shared ``httpx.AsyncClient`` per origin (scheme, host and port), timeout and
+``HTTPClientConfig`` instead of opening a new client for every call, so connections are
+kept alive and reused across calls, tools and agents. httpx clients are bound to the
+event loop they are used on, so each running loop gets its own set of clients.
+
+Responses with a retryable status (429 and 5xx by default) are retried with exponential
+backoff, honoring ``Retry-After``. Close the clients of the running loop with
+``aclose_http_clients`` on shutdown. Clients left open on a loop that has since been closed
+(e.g. by ``asyncio.run`` in ``get_response_sync``) are dropped the next time a client is
+requested, as they can no longer be used or awaited.
+"""
+
+import asyncio
+import email.utils
+import logging
+import random
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+# Errors raised before the request reached the server; safe to retry for any method
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass(frozen=True)
+class HTTPClientConfig:
+    """Connection pooling and retry settings for OpenAPI tools.
+
+    Attributes:
+        max_connections (int): Maximum open connections per client.
+        max_keepalive_connections (int): Idle connections kept open for reuse.
+        keepalive_expiry (float): Seconds an idle connection is kept.
+        http2 (bool): Negotiate HTTP/2. Requires the ``h2`` package
+            (``pip install agency-swarm[http2]``).
+        max_retries (int): Retries after the first attempt. 0 disables retrying.
+        backoff_factor (float): Base delay in seconds; attempt ``n`` waits about
+            ``backoff_factor * 2**n``.
+        max_backoff (float): Longest delay between attempts. A ``Retry-After`` asking for a
+            longer wait is not honored and the response is returned as is.
+        retry_statuses (frozenset[int]): Response statuses that are retried.
+        retry_non_idempotent (bool): Also retry POST/PATCH requests on 5xx responses and
+            read errors. 429 responses and connection errors are always retried.
+    """
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    retry_statuses: frozenset[int] = field(default_factory=lambda: frozenset({429, 500, 502, 503, 504}))
+    retry_non_idempotent: bool = False
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number ``attempt + 1``, with jitter."""
+        delay = min(self.max_backoff, self.backoff_factor * 2**attempt)
+        return delay * (0.5 + random.random() / 2)
+
+
+DEFAULT_HTTP_CLIENT_CONFIG = HTTPClientConfig()
+
+_ClientKey = tuple[str, Any, HTTPClientConfig]
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[_ClientKey, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_clients_lock = threading.Lock()
+
+
+def _origin(url: str) -> str:
+    parsed = httpx.URL(url)
+    return f"{parsed.scheme}://{parsed.host}:{parsed.port or ''}"
+
+
+def _drop_closed_loops() -> None:
+    """Release the clients of event loops that were closed without ``aclose_http_clients``.
+
+    Their open connections keep the loop referenced, so the weak key alone never lets it go.
+    Must be called with ``_clients_lock`` held.
+    """
+    for loop in [loop for loop in _clients.keys() if loop.is_closed()]:
+        dropped = _clients.pop(loop)
+        logger.debug(f"Dropped {len(dropped)} pooled HTTP client(s) of a closed event loop.")
+
+
+def get_http_client(url: str, *, timeout: Any = 90, config: HTTPClientConfig | None = None) -> httpx.AsyncClient:
+    """
+    Return the pooled client for ``url``'s origin on the running event loop.
+
+    Args:
+        url: Any URL of the target server.
+        timeout: httpx timeout (seconds or ``httpx.Timeout``) of the client.
+        config: Pooling and retry settings. Defaults to ``DEFAULT_HTTP_CLIENT_CONFIG``.
+
+    Raises:
+        ImportError: If ``config.http2`` is set but the ``h2`` package is not installed.
+    """
+    config = config or DEFAULT_HTTP_CLIENT_CONFIG
+    loop = asyncio.get_running_loop()
+    key = (_origin(url), timeout, config)
+    with _clients_lock:
+        _drop_closed_loops()
+        loop_clients = _clients.setdefault(loop, {})
+        client = loop_clients.get(key)
+        if client is None or client.is_closed:
+            limits = httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            )
+            try:
+                client = httpx.AsyncClient(timeout=timeout, limits=limits, http2=config.http2)
+            except ImportError as e:
+                raise ImportError(
+                    "HTTP/2 for OpenAPI tools requires the 'h2' package. "
+                    "Install with `pip install agency-swarm[http2]`."
+                ) from e
+            loop_clients[key] = client
+            logger.debug(f"Opened pooled HTTP client for {key[0]} (http2={config.http2}).")
+        return client
+
+
+def _retry_after_seconds(response: httpx.Response) -> float | None:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+async def send_request(
+    method: str,
+    url: str,
+    *,
+    timeout: Any = 90,
+    config: HTTPClientConfig | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """
+    Send a request through the pooled client, retrying retryable failures.
+
+    Args:
+        method: HTTP method.
+        url: Request URL.
+        timeout: httpx timeout of the pooled client.
+        config: Pooling and retry settings. Defaults to ``DEFAULT_HTTP_CLIENT_CONFIG``.
+        **kwargs: Passed to ``httpx.AsyncClient.request`` (params, json, headers, ...).
+
+    Returns:
+        The final response. Statuses that are still failing after the last retry are
+        returned, not raised.
+    """
+    config = config or DEFAULT_HTTP_CLIENT_CONFIG
+    client = get_http_client(url, timeout=timeout, config=config)
+    idempotent = method.upper() in _IDEMPOTENT_METHODS or config.retry_non_idempotent
+    attempt = 0
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            if attempt >= config.max_retries or not (idempotent or isinstance(e, _NOT_SENT_ERRORS)):
+                raise
+            delay = config.backoff(attempt)
+            logger.info(f"{method} {url} failed with {type(e).__name__}; retrying in {delay:.2f}s.")
+        else:
+            status = response.status_code
+            if attempt >= config.max_retries or status not in config.retry_statuses:
+                return response
+            if not idempotent and status != 429:
+                return response
+            retry_after = _retry_after_seconds(response)
+            if retry_after is not None and retry_after > config.max_backoff:
+                return response
+            delay = retry_after if retry_after is not None else config.backoff(attempt)
+            await response.aclose()
+            logger.info(f"{method} {url} returned {status}; retrying in {delay:.2f}s.")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def aclose_http_clients() -> None:
+    """Close the pooled clients opened on the running event loop.
+
+    Call this before the loop stops when running OpenAPI tools outside the FastAPI
+    integration, which calls it on shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    with _clients_lock:
+        _drop_closed_loops()
+        loop_clients = _clients.pop(loop, {})
+    for client in loop_clients.values():
+        await client.aclose()
@@ -0,0 +1,198 @@
+"""
+Persistent MCP server connections shared across runs.
+
+Connecting an MCP server means spawning a subprocess or performing an HTTP handshake,
+so this module provides MCPServerManager, which keeps each server connected for the
+lifetime of the agency instead of reconnecting on every run.
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+import anyio
+from agents.mcp import MCPServer
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the transport is gone and the session must be re-established
+_TRANSPORT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, ConnectionError)
+
+
+@dataclass
+class MCPManagerStats:
+    """Counters of an ``MCPServerManager``.
+
+    Attributes:
+        connects (int): Sessions opened, including reconnects.
+        reconnects (int): Sessions re-opened after a failure or a closed event loop.
+        reuses (int): Runs that found their servers already connected.
+        failures (int): Failed connection attempts.
+    """
+
+    connects: int = 0
+    reconnects: int = 0
+    reuses: int = 0
+    failures: int = 0
+
+
+@dataclass
+class _Connection:
+    server: MCPServer
+    loop: asyncio.AbstractEventLoop
+    ready: asyncio.Future
+    stop: asyncio.Event = field(default_factory=asyncio.Event)
+    task: asyncio.Task | None = None
+    broken: bool = False
+
+
+class MCPServerManager:
+    """
+    Keeps MCP servers connected across runs and concurrent requests.
+
+    Each server is connected by a dedicated owner task that holds the session open until
+    :meth:`aclose` is called. MCP transports are built on anyio task groups, which must be
+    exited by the task that entered them, so the owner task is the one place that connects
+    and cleans up. Runs only wait until the session is ready.
+
+    A session is re-established on the next run if its transport failed, if the owner task
+    died, or if the event loop changed (e.g. between ``get_response_sync`` calls).
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_tools_list: bool = True,
+        serialize_calls: bool = False,
+        connect_timeout: float | None = 30.0,
+    ) -> None:
+        """
+        Args:
+            cache_tools_list: Cache each server's tool list for the session lifetime so runs do not
+                call ``list_tools`` again. The cache is dropped on reconnect.
+            serialize_calls: Allow one request at a time per session, for transports that cannot
+                multiplex concurrent requests.
+            connect_timeout: Seconds to wait for a server to connect. ``None`` waits indefinitely.
+        """
+        self.cache_tools_list = cache_tools_list
+        self.serialize_calls = serialize_calls
+        self.connect_timeout = connect_timeout
+        self.stats = MCPManagerStats()
+        self._connections: dict[int, _Connection] = {}
+        self._wrapped: set[int] = set()
+
+    async def ensure_connected(self, servers: Iterable[MCPServer]) -> None:
+        """
+        Make sure every server has a live session, connecting the ones that do not.
+
+        Raises:
+            Exception: The connection error of the first server that failed to connect.
+        """
+        await asyncio.gather(*(self._ensure(server) for server in servers))
+
+    def is_connected(self, server: MCPServer) -> bool:
+        """Check whether the server has a ready, healthy session on the running event loop."""
+        conn = self._connections.get(id(server))
+        return conn is not None and self._is_usable(conn) and conn.ready.done() and not conn.ready.exception()
+
+    async def aclose(self) -> None:
+        """Close every session owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        connections = [conn for conn in self._connections.values() if conn.loop is loop]
+        self._connections = {key: conn for key, conn in self._connections.items() if conn.loop is not loop}
+        for conn in connections:
+            conn.stop.set()
+        for conn in connections:
+            if conn.task is not None:
+                with suppress(Exception, asyncio.CancelledError):
+                    await conn.task
+        if connections:
+            logger.info(f"Closed {len(connections)} MCP server sessions.")
+
+    def _is_usable(self, conn: _Connection) -> bool:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return conn.loop is loop and not conn.broken and conn.task is not None and not conn.task.done()
+
+    async def _ensure(self, server: MCPServer) -> None:
+        previous = self._connections.get(id(server))
+        if previous is not None and self._is_usable(previous):
+            if previous.ready.done():
+                self.stats.reuses += 1
+            await asyncio.shield(previous.ready)
+            return
+
+        loop = asyncio.get_running_loop()
+        conn = _Connection(server=server, loop=loop, ready=loop.create_future())
+        # Register before awaiting so concurrent runs wait on the same connection
+        self._connections[id(server)] = conn
+        stale = previous if previous is not None and previous.loop is loop else None
+        if previous is not None:
+            self.stats.reconnects += 1
+            logger.info(f"Reconnecting MCP server '{server.name}'.")
+        self._wrap_server(server)
+        conn.task = loop.create_task(self._serve(conn, stale), name=f"mcp-session-{server.name}")
+        await asyncio.shield(conn.ready)
+
+    async def _serve(self, conn: _Connection, stale: _Connection | None) -> None:
+        server = conn.server
+        if stale is not None and stale.task is not None:
+            stale.stop.set()
+            with suppress(Exception, asyncio.CancelledError):
+                await stale.task
+        try:
+            try:
+                async with asyncio.timeout(self.connect_timeout):
+                    await server.connect()
+            except asyncio.CancelledError:
+                conn.ready.set_exception(ConnectionError(f"Connecting MCP server '{server.name}' was cancelled"))
+                raise
+            except Exception as e:
+                self.stats.failures += 1
+                logger.error(f"Failed to connect MCP server '{server.name}': {e}")
+                conn.ready.set_exception(e)
+                return
+            self.stats.connects += 1
+            if self.cache_tools_list and hasattr(server, "cache_tools_list"):
+                server.cache_tools_list = True
+                server.invalidate_tools_cache()  # type: ignore[attr-defined]
+            conn.ready.set_result(None)
+            logger.debug(f"MCP server '{server.name}' connected.")
+            await conn.stop.wait()
+        finally:
+            with suppress(Exception):
+                await server.cleanup()
+            if self._connections.get(id(server)) is conn:
+                del self._connections[id(server)]
+
+    def _wrap_server(self, server: MCPServer) -> None:
+        """Route tool requests through the manager to detect dead transports and apply locking."""
+        if id(server) in self._wrapped:
+            return
+        self._wrapped.add(id(server))
+        lock = asyncio.Lock() if self.serialize_calls else None
+        for name in ("call_tool", "list_tools"):
+            setattr(server, name, self._guarded(server, getattr(server, name), lock))
+
+    def _guarded(
+        self, server: MCPServer, method: Callable[..., Awaitable[Any]], lock: asyncio.Lock | None
+    ) -> Callable[..., Awaitable[Any]]:
+        async def guarded(*args: Any, **kwargs: Any) -> Any:
+            try:
+                if lock is None:
+                    return await method(*args, **kwargs)
+                async with lock:
+                    return await method(*args, **kwargs)
+            except _TRANSPORT_ERRORS:
+                conn = self._connections.get(id(server))
+                if conn is not None:
+                    conn.broken = True
+                    logger.warning(f"MCP server '{server.name}' transport failed; reconnecting on next run.")
+                raise
+
+        return guarded
@@ -0,0 +1,205 @@
+"""
+Content-addressed cache for compiled OpenAPI specs and generated Pydantic models.
+
+Building tools from an OpenAPI spec resolves every ``$ref`` with jsonref and generates
+(``datamodel_code_generator``) and execs a Pydantic model per operation. Both only depend
+on the spec's content, so their results are cached under a SHA-256 of that content:
+building the same agents again in the process, e.g. per request in FastAPI, reuses them.
+A changed spec hashes to a new key, so stale entries are never served.
+
+Results are kept in an in-memory LRU. Set ``AGENCY_SWARM_SCHEMA_CACHE_DIR`` or call
+``configure_schema_cache(directory=...)`` to also store the compiled specs and generated
+model sources as JSON files, so later processes skip the work as well.
+"""
+
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bump when the format of compiled specs or generated sources changes
+_CACHE_FORMAT = "1"
+
+
+@functools.cache
+def _codegen_version() -> str:
+    try:
+        return importlib.metadata.version("datamodel-code-generator")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def content_hash(*parts: Any) -> str:
+    """SHA-256 of ``parts``; strings are hashed as is, other values as canonical JSON."""
+    digest = hashlib.sha256(f"{_CACHE_FORMAT}:{_codegen_version()}".encode())
+    for part in parts:
+        data = part if isinstance(part, str) else json.dumps(part, sort_keys=True, separators=(",", ":"), default=str)
+        digest.update(b"\0" + data.encode())
+    return digest.hexdigest()
+
+
+def to_plain_json(value: Any, _stack: tuple[int, ...] = ()) -> Any:
+    """
+    Copy ``value`` into plain dicts and lists, resolving jsonref proxies.
+
+    Raises:
+        ValueError: If the value references itself (recursive ``$ref``).
+    """
+    if isinstance(value, dict | list):
+        marker = id(getattr(value, "__subject__", value))
+        if marker in _stack:
+            raise ValueError("Recursive reference cannot be converted to plain JSON.")
+        stack = (*_stack, marker)
+        if isinstance(value, dict):
+            return {key: to_plain_json(item, stack) for key, item in value.items()}
+        return [to_plain_json(item, stack) for item in value]
+    return value
+
+
+@dataclass
+class SchemaCacheStats:
+    """Metrics of the schema cache.
+
+    Attributes:
+        hits (int): Lookups answered from memory.
+        disk_hits (int): Lookups answered from the cache directory.
+        misses (int): Lookups that compiled the value.
+        size (int): Entries currently held in memory.
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
+class SchemaCache:
+    """
+    LRU of compiled schema artifacts keyed by namespace and content hash.
+
+    Args:
+        max_entries: Entries kept in memory across all namespaces.
+        directory: Optional directory persisting JSON-serializable entries.
+        enabled: If False, every lookup compiles the value.
+    """
+
+    def __init__(self, max_entries: int = 512, directory: str | Path | None = None, enabled: bool = True):
+        self.max_entries = max_entries
+        self.directory = Path(directory).expanduser() if directory else None
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple[str, str], Any] = OrderedDict()
+        self._stats = SchemaCacheStats()
+        self._lock = threading.Lock()
+
+    def get_or_create(self, namespace: str, key: str, build: Callable[[], T], *, persist: bool = True) -> T:
+        """
+        Return the cached value of ``(namespace, key)``, building and storing it on a miss.
+
+        Args:
+            namespace: Kind of artifact, e.g. "openapi".
+            key: Content hash of the inputs the value is built from.
+            build: Compiles the value.
+            persist: Also read and write the value in the cache directory (JSON only).
+        """
+        if not self.enabled:
+            return build()
+        with self._lock:
+            if (namespace, key) in self._entries:
+                self._entries.move_to_end((namespace, key))
+                self._stats.hits += 1
+                return self._entries[(namespace, key)]
+
+        path = self.directory / namespace / f"{key}.json" if persist and self.directory else None
+        value: Any = None
+        found = False
+        if path is not None and path.exists():
+            try:
+                value = json.loads(path.read_text(encoding="utf-8"))
+                found = True
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable schema cache file {path}: {e}")
+
+        if found:
+            with self._lock:
+                self._stats.disk_hits += 1
+        else:
+            value = build()
+            with self._lock:
+                self._stats.misses += 1
+            if path is not None:
+                self._write(path, value)
+
+        with self._lock:
+            self._entries[(namespace, key)] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _write(self, path: Path, value: Any) -> None:
+        try:
+            data = json.dumps(value)
+        except (TypeError, ValueError):
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(data, encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write schema cache file {path}: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory entries (files in the cache directory are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> SchemaCacheStats:
+        """Snapshot of the cache's metrics."""
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+
+_schema_cache = SchemaCache(directory=os.environ.get("AGENCY_SWARM_SCHEMA_CACHE_DIR"))
+
+
+def get_schema_cache() -> SchemaCache:
+    """Return the process-wide schema cache."""
+    return _schema_cache
+
+
+def configure_schema_cache(
+    *, directory: str | Path | None = None, max_entries: int = 512, enabled: bool = True
+) -> SchemaCache:
+    """
+    Replace the process-wide schema cache.
+
+    Args:
+        directory: Directory persisting compiled specs and model sources across processes.
+        max_entries: Entries kept in memory.
+        enabled: Set False to compile specs and models on every use.
+    """
+    global _schema_cache
+    _schema_cache = SchemaCache(max_entries=max_entries, directory=directory, enabled=enabled)
+    return _schema_cache
+
+
+def get_schema_cache_stats() -> SchemaCacheStats:
+    """Metrics of the process-wide schema cache."""
+    return _schema_cache.get_stats()
+
+
+def clear_schema_cache() -> None:
+    """Drop the in-memory entries of the process-wide schema cache."""
+    _schema_cache.clear()
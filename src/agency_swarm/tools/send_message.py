@@ -1,15 +1,20 @@
 """
-Defines the SendMessage and SendMessageHandoff tools for direct communication between agents.
+Defines the SendMessage, SendMessageBroadcast and SendMessageHandoff tools for direct communication between agents.
 
 This module provides the `SendMessage` class, a specialized `FunctionTool` that
 allows one agent to send a message to another registered agent within the
 Agency Swarm framework. The tool is dynamically configured with sender and
-recipient details.
+recipient details. `SendMessageBroadcast` sends a message to several recipients
+at once and aggregates their responses.
 """
 
 import asyncio
 import json
 import logging
+import threading
+import time
+import weakref
+from dataclasses import replace
 from typing import TYPE_CHECKING, Any, Literal
 
 from agents import FunctionTool, InputGuardrailTripwireTriggered, RunContextWrapper, handoff, strict_schema
@@ -17,6 +22,7 @@ from pydantic import BaseModel, ValidationError
 
 from ..context import MasterContext
 from ..streaming.utils import add_agent_name_to_event
+from .concurrency import ToolConcurrencyManager, ToolQueueStats
 
 if TYPE_CHECKING:
     from ..agent.core import AgencyContext, Agent
@@ -34,30 +40,38 @@ class SendMessage(FunctionTool):
 
     You are responsible for relaying the recipient agent's responses back to the user, as the user does not have
     direct access to these replies. Keep engaging with the tool for continuous interaction until the task is fully
-    resolved. Do not send more than 1 message to the same recipient agent at the same time.
+    resolved. Messages sent to the same recipient agent at the same time are delivered one after another, in order.
     """
 
     sender_agent: "Agent"
     # Dict mapping lowercase recipient names to Agent instances
     recipients: dict[str, "Agent"]
-    # Track recipients with pending messages (thread-safe)
-    _pending_recipients: set[str]
-    # Lock to protect concurrent access to _pending_recipients
-    _pending_lock: asyncio.Lock
+    # Messages to a recipient that is still answering wait in line (per conversation thread).
+    # Maximum number of waiting messages per recipient; None means unlimited, 0 rejects while busy.
+    max_queue_size: int | None = None
+    # Seconds a message may wait for the recipient; None waits indefinitely.
+    queue_timeout: float | None = None
 
     def __init__(
         self,
         sender_agent: "Agent",
         recipients: dict[str, "Agent"] | None = None,
         name: str = "send_message",
+        max_queue_size: int | None = None,
+        queue_timeout: float | None = None,
     ):
         self.sender_agent = sender_agent
         # Normalize recipient keys to lowercase for case-insensitive lookup
         self.recipients = {k.lower(): v for k, v in (recipients or {}).items()}
-        # Initialize tracking set for pending recipients
-        self._pending_recipients = set()
-        # Create lock for thread-safe access
-        self._pending_lock = asyncio.Lock()
+        if max_queue_size is not None:
+            self.max_queue_size = max_queue_size
+        if queue_timeout is not None:
+            self.queue_timeout = queue_timeout
+        # One FIFO queue per conversation, so pooled agency clones don't wait on each other
+        self._recipient_queues: weakref.WeakKeyDictionary[Any, ToolConcurrencyManager] = weakref.WeakKeyDictionary()
+        self._default_queue = ToolConcurrencyManager()
+        self._queue_stats: dict[str, ToolQueueStats] = {}
+        self._stats_lock = threading.Lock()
 
         # Build the recipient agent enum values for the schema
         recipient_names = list(self.recipients.values())
@@ -173,6 +187,10 @@ class SendMessage(FunctionTool):
             f"Added recipient '{recipient_agent.name}' to SendMessage tool. Total recipients: {len(self.recipients)}"
         )
 
+    def _recipient_property(self) -> dict[str, Any]:
+        """The schema property listing the recipient agent names."""
+        return self.params_json_schema["properties"]["recipient_agent"]
+
     def _update_schema(self) -> None:
         """Updates the tool schema with current recipients."""
         # Build the recipient agent enum values for the schema
@@ -180,7 +198,7 @@ class SendMessage(FunctionTool):
         recipient_enum = [agent.name for agent in recipient_names] if recipient_names else []
 
         # Update the params schema
-        self.params_json_schema["properties"]["recipient_agent"]["enum"] = recipient_enum
+        self._recipient_property()["enum"] = recipient_enum
 
         # Update description with all recipient roles
         description_parts = [self.__doc__ or "Send a message to another agent."]
@@ -191,6 +209,49 @@ class SendMessage(FunctionTool):
                 description_parts.append(f"\n- {agent.name}: {agent_desc}")
         self.description = "".join(description_parts)
 
+    def _get_recipient_queue(self, wrapper: RunContextWrapper[MasterContext]) -> ToolConcurrencyManager:
+        """Return the message queue of the conversation the call belongs to."""
+        thread_manager = getattr(getattr(wrapper, "context", None), "thread_manager", None)
+        if thread_manager is None:
+            return self._default_queue
+        with self._stats_lock:
+            try:
+                queue = self._recipient_queues.get(thread_manager)
+                if queue is None:
+                    queue = self._recipient_queues[thread_manager] = ToolConcurrencyManager()
+            except TypeError:  # Not weak-referenceable or hashable
+                return self._default_queue
+            return queue
+
+    def _record_wait(self, recipient_name: str, waited: float, *, timed_out: bool = False) -> None:
+        with self._stats_lock:
+            stats = self._queue_stats.setdefault(recipient_name, ToolQueueStats())
+            if timed_out:
+                stats.timeouts += 1
+            else:
+                stats.calls += 1
+            stats.total_wait_seconds += waited
+            stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    def get_queue_stats(self) -> dict[str, ToolQueueStats]:
+        """
+        Per-recipient queueing metrics of this tool.
+
+        Returns:
+            dict[str, ToolQueueStats]: Delivered messages, timeouts and wait times since the tool was
+            created, with the messages currently being answered (active) or waiting, per recipient name.
+        """
+        with self._stats_lock:
+            totals = {name: replace(stats) for name, stats in self._queue_stats.items()}
+            queues = [self._default_queue, *self._recipient_queues.values()]
+        for queue in queues:
+            for recipient_key, live in queue.get_stats().items():
+                recipient = self.recipients.get(recipient_key)
+                stats = totals.setdefault(recipient.name if recipient else recipient_key, ToolQueueStats())
+                stats.active += live.active
+                stats.waiting += live.waiting
+        return totals
+
     def _combine_instructions(self, shared_instructions: str | None, additional_instructions: str | None) -> str | None:
         """Combine shared instructions with additional instructions."""
         if not shared_instructions and not additional_instructions:
@@ -211,12 +272,25 @@ class SendMessage(FunctionTool):
 
         # Create a minimal agency context for multi-agent communication
         class MinimalAgency:
-            def __init__(self, agents_dict, user_context):
+            def __init__(
+                self, agents_dict, user_context, tool_concurrency_groups, tool_caches, tool_schedulers, mcp_manager
+            ):
                 self.agents = agents_dict
                 self.user_context = user_context
+                self.tool_concurrency_groups = tool_concurrency_groups
+                self.tool_caches = tool_caches
+                self.tool_schedulers = tool_schedulers
+                self.mcp_manager = mcp_manager
 
         # Since we're using send_message tool, we're always in an agency context
-        agency_instance = MinimalAgency(wrapper.context.agents, wrapper.context.user_context)
+        agency_instance = MinimalAgency(
+            wrapper.context.agents,
+            wrapper.context.user_context,
+            getattr(wrapper.context, "_tool_concurrency_groups", {}),
+            getattr(wrapper.context, "_tool_caches", None),
+            getattr(wrapper.context, "_tool_schedulers", None),
+            getattr(wrapper.context, "_mcp_manager", None),
+        )
 
         # Get shared instructions from the current context
         shared_instructions_from_context = wrapper.context.shared_instructions
@@ -230,6 +304,40 @@ class SendMessage(FunctionTool):
             shared_instructions=shared_instructions_from_context,
         )
 
+    def _get_tool_call_id(self, wrapper: RunContextWrapper[MasterContext]) -> str | None:
+        """Return the call_id OpenAI assigned to this invocation (the wrapper is a ToolContext)."""
+        tool_call_id = getattr(wrapper, "tool_call_id", None)
+        if not tool_call_id:
+            logger.warning(f"No tool_call_id found in wrapper. Type: {type(wrapper).__name__}")
+            # Fallback to using agent's run_id if no tool_call_id available
+            tool_call_id = (
+                getattr(wrapper.context, "_current_agent_run_id", None) if wrapper and wrapper.context else None
+            )
+        return tool_call_id
+
+    def _validate_extra_params(self, kwargs: dict[str, Any]) -> str | None:
+        """Validate extra params, if a Pydantic model was provided by subclass. Returns an error or None."""
+        model_cls = getattr(self, "_extra_params_model", None)
+        if model_cls is None:
+            return None
+        try:
+            # Only pass fields known to the model
+            model_fields = set(model_cls.model_fields.keys())
+            model_input = {k: v for k, v in kwargs.items() if k in model_fields}
+            # Instantiate to trigger validation; we don't use the instance further here
+            model_cls(**model_input)
+        except ValidationError as e:
+            logger.error(f"Invalid extra SendMessage parameters: {e}")
+            return f"Error: Invalid extra parameters for tool {self.name}. Details: {e}"
+        return None
+
+    def _unknown_recipient_error(self, recipient_agent_name: str) -> str:
+        logger.error(f"Tool '{self.name}' invoked with unknown recipient: '{recipient_agent_name}'")
+        available_names = [a.name for a in self.recipients.values()]
+        return (
+            f"Error: Unknown recipient agent '{recipient_agent_name}'. Available agents: {', '.join(available_names)}"
+        )
+
     async def on_invoke_tool(self, wrapper: RunContextWrapper[MasterContext], arguments_json_string: str) -> str:
         """
         Handles the invocation of this specific send message tool.
@@ -239,15 +347,7 @@ class SendMessage(FunctionTool):
         When the original request was made with get_response_stream, this will use
         get_response_stream for the sub-agent call to maintain streaming consistency.
         """
-        # Get the tool_call_id from the wrapper (it's a ToolContext)
-        # This is the call_id that OpenAI assigned to this send_message invocation
-        tool_call_id = getattr(wrapper, "tool_call_id", None)
-        if not tool_call_id:
-            logger.warning(f"No tool_call_id found in wrapper. Type: {type(wrapper).__name__}")
-            # Fallback to using agent's run_id if no tool_call_id available
-            tool_call_id = (
-                getattr(wrapper.context, "_current_agent_run_id", None) if wrapper and wrapper.context else None
-            )
+        tool_call_id = self._get_tool_call_id(wrapper)
 
         try:
             kwargs = json.loads(arguments_json_string)
@@ -260,18 +360,8 @@ class SendMessage(FunctionTool):
         my_primary_instructions = kwargs.get("my_primary_instructions")
         additional_instructions = kwargs.get("additional_instructions", "")
 
-        # Validate extra params, if a Pydantic model was provided by subclass
-        model_cls = getattr(self, "_extra_params_model", None)
-        if model_cls is not None:
-            try:
-                # Only pass fields known to the model
-                model_fields = set(model_cls.model_fields.keys())
-                model_input = {k: v for k, v in kwargs.items() if k in model_fields}
-                # Instantiate to trigger validation; we don't use the instance further here
-                model_cls(**model_input)
-            except ValidationError as e:
-                logger.error(f"Invalid extra SendMessage parameters: {e}")
-                return f"Error: Invalid extra parameters for tool {self.name}. Details: {e}"
+        if extra_params_error := self._validate_extra_params(kwargs):
+            return extra_params_error
 
         if not recipient_agent_name:
             logger.error(f"Tool '{self.name}' invoked without 'recipient_agent' parameter.")
@@ -286,33 +376,67 @@ class SendMessage(FunctionTool):
         # Case-insensitive lookup for recipient agent
         recipient_key = recipient_agent_name.lower()
         if recipient_key not in self.recipients:
-            logger.error(f"Tool '{self.name}' invoked with unknown recipient: '{recipient_agent_name}'")
-            available = list(self.recipients.values())
-            available_names = [a.name for a in available] if available else []
-            return (
-                f"Error: Unknown recipient agent '{recipient_agent_name}'. "
-                f"Available agents: {', '.join(available_names)}"
-            )
+            return self._unknown_recipient_error(recipient_agent_name)
 
-        # Thread-safe check and add for pending recipients
-        async with self._pending_lock:
-            # Check if this recipient already has a pending message
-            if recipient_key in self._pending_recipients:
-                logger.warning(
-                    f"Attempted to send message to '{recipient_agent_name}' while previous message is still pending"
-                )
-                return (
-                    f"Error: Cannot send another message to '{recipient_agent_name}' "
-                    f"while the previous message is still being processed. "
-                    f"Please wait for the agent to respond before sending another message."
-                )
+        response, _delivered = await self._deliver(
+            wrapper, recipient_key, message_content, additional_instructions, tool_call_id
+        )
+        return response
+
+    async def _deliver(
+        self,
+        wrapper: RunContextWrapper[MasterContext],
+        recipient_key: str,
+        message_content: str,
+        additional_instructions: str,
+        tool_call_id: str | None,
+    ) -> tuple[str, bool]:
+        """
+        Send one message to a recipient (after earlier queued messages to it) and return its response.
 
-            # Mark this recipient as having a pending message
-            self._pending_recipients.add(recipient_key)
+        Sub-agent events are forwarded to the streaming context when the run is streamed.
 
-        self.recipient_agent = self.recipients[recipient_key]
+        Returns:
+            tuple[str, bool]: The response text, or an error message for the sender, and whether the
+            recipient answered successfully.
+        """
+        recipient_agent = self.recipients[recipient_key]
+        # Kept for subclasses; concurrent calls must use the local `recipient_agent`
+        self.recipient_agent = recipient_agent
         sender_name_for_call = self.sender_agent.name
-        recipient_name_for_call = self.recipient_agent.name
+        recipient_name_for_call = recipient_agent.name
+
+        # Wait for earlier messages to the same recipient in this conversation
+        queue = self._get_recipient_queue(wrapper)
+        recipient_stats = queue.get_stats().get(recipient_key)
+        if (
+            self.max_queue_size is not None
+            and recipient_stats is not None
+            and recipient_stats.active > 0
+            and queue.get_queue_depth(recipient_key) >= self.max_queue_size
+        ):
+            logger.warning(
+                f"Rejected message to '{recipient_name_for_call}': {self.max_queue_size} message(s) already queued"
+            )
+            return (
+                f"Error: Cannot send another message to '{recipient_name_for_call}' "
+                f"while the previous message is still being processed. "
+                f"Please wait for the agent to respond before sending another message."
+            ), False
+        queued_at = time.perf_counter()
+        try:
+            await queue.acquire(recipient_key, max_concurrency=1, timeout=self.queue_timeout)
+        except TimeoutError:
+            self._record_wait(recipient_name_for_call, time.perf_counter() - queued_at, timed_out=True)
+            logger.warning(f"Message to '{recipient_name_for_call}' timed out after {self.queue_timeout}s in queue")
+            return (
+                f"Error: Message to '{recipient_name_for_call}' was not delivered within {self.queue_timeout} "
+                f"seconds because previous messages to this agent are still being processed. Try again later."
+            ), False
+        waited = time.perf_counter() - queued_at
+        self._record_wait(recipient_name_for_call, waited)
+        if waited > 0.01:
+            logger.debug(f"Message to '{recipient_name_for_call}' waited {waited:.2f}s for earlier messages")
 
         logger.info(
             f"Agent '{sender_name_for_call}' invoking tool '{self.name}'. "
@@ -341,6 +465,7 @@ class SendMessage(FunctionTool):
                 # Use streaming and collect the final output
                 final_output_text = ""
                 tool_calls_seen = []
+                failed = False
 
                 # Create agency context for the recipient agent
                 recipient_agency_context = self._create_recipient_agency_context(wrapper)
@@ -350,7 +475,7 @@ class SendMessage(FunctionTool):
                     recipient_agency_context.shared_instructions, additional_instructions
                 )
 
-                async for event in self.recipient_agent.get_response_stream(
+                async for event in recipient_agent.get_response_stream(
                     message=message_content,
                     sender_name=self.sender_agent.name,
                     additional_instructions=combined_instructions,
@@ -360,7 +485,7 @@ class SendMessage(FunctionTool):
                     # Non-destructively add agent/caller and attach IDs
                     event = add_agent_name_to_event(
                         event,
-                        self.recipient_agent.name,
+                        recipient_agent.name,
                         self.sender_agent.name,
                         agent_run_id=None,
                         parent_run_id=tool_call_id,
@@ -395,6 +520,7 @@ class SendMessage(FunctionTool):
 
                     # Send error message to the caller if it occurs
                     if isinstance(event, dict) and event.get("type") == "error":
+                        failed = True
                         final_output_text = (
                             f"Error getting response from the agent: {event.get('content', 'Unknown error')}"
                         )
@@ -406,7 +532,7 @@ class SendMessage(FunctionTool):
                     f"Received response via tool '{self.name}' from '{recipient_name_for_call}': "
                     f'"{final_output_text[:50]}..."'
                 )
-                return final_output_text
+                return final_output_text, not failed
             else:
                 logger.debug(f"Calling target agent '{recipient_name_for_call}'.get_response...")
 
@@ -418,7 +544,7 @@ class SendMessage(FunctionTool):
                     recipient_agency_context.shared_instructions, additional_instructions
                 )
 
-                response = await self.recipient_agent.get_response(
+                response = await recipient_agent.get_response(
                     message=message_content,
                     sender_name=self.sender_agent.name,
                     additional_instructions=combined_instructions,
@@ -439,7 +565,7 @@ class SendMessage(FunctionTool):
                 f"Received response via tool '{self.name}' from '{recipient_name_for_call}': "
                 f'"{final_output_text[:50]}..."'
             )
-            return final_output_text
+            return final_output_text, True
 
         except InputGuardrailTripwireTriggered as e:
             guidance = getattr(getattr(e, "guardrail_result", None), "output", None)
@@ -448,10 +574,10 @@ class SendMessage(FunctionTool):
                 f"Input guardrail triggered during sub-call via tool '{self.name}' from "
                 f"'{sender_name_for_call}' to '{recipient_name_for_call}': {message}"
             )
-            if self.recipient_agent.throw_input_guardrail_error:
-                return f"Error getting response from the agent: {message}"
+            if recipient_agent.throw_input_guardrail_error:
+                return f"Error getting response from the agent: {message}", False
             else:
-                return message
+                return message, True
 
         except Exception as e:
             logger.error(
@@ -459,11 +585,148 @@ class SendMessage(FunctionTool):
                 f"from '{sender_name_for_call}' to '{recipient_name_for_call}': {e}",
                 exc_info=True,
             )
-            return f"Error: Failed to get response from agent '{recipient_name_for_call}'. Reason: {e}"
+            return f"Error: Failed to get response from agent '{recipient_name_for_call}'. Reason: {e}", False
         finally:
-            # Always remove the recipient from pending set when done (thread-safe)
-            async with self._pending_lock:
-                self._pending_recipients.discard(recipient_key)
+            # Let the next queued message to this recipient through
+            queue.release(recipient_key)
+
+
+class SendMessageBroadcast(SendMessage):
+    """
+    Use this tool to send a question or task to several specialized agents at once and receive all of their
+    responses together. The recipients work on their messages concurrently, so prefer this tool over separate
+    messages whenever the recipients do not depend on each other's answers.
+
+    The shared message goes to every listed recipient; give a recipient its own message to ask it something
+    different. You receive one combined result listing each recipient's response. You are responsible for
+    relaying the relevant parts of these responses back to the user.
+    """
+
+    # Maximum recipients answering at the same time; None means all of them.
+    max_concurrency: int | None = None
+
+    def __init__(
+        self,
+        sender_agent: "Agent",
+        recipients: dict[str, "Agent"] | None = None,
+        name: str = "send_message_broadcast",
+        max_queue_size: int | None = None,
+        queue_timeout: float | None = None,
+        max_concurrency: int | None = None,
+    ):
+        super().__init__(
+            sender_agent, recipients, name=name, max_queue_size=max_queue_size, queue_timeout=queue_timeout
+        )
+        if max_concurrency is not None:
+            self.max_concurrency = max_concurrency
+
+        # Replace the single recipient with a list of recipients, keeping any ExtraParams fields
+        properties = self.params_json_schema["properties"]
+        recipient_property = properties.pop("recipient_agent")
+        properties["recipients"] = {
+            "type": "array",
+            "minItems": 1,
+            "description": "The agents to send the message to.",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "recipient_agent": recipient_property,
+                    "message": {
+                        "type": "string",
+                        "description": (
+                            "Message for this recipient only. Provide an empty string to send the shared message."
+                        ),
+                    },
+                },
+                "required": ["recipient_agent", "message"],
+                "additionalProperties": False,
+            },
+        }
+        properties["message"]["description"] = (
+            "Message sent to every recipient without its own message. Specify the task, rather than exact "
+            "instructions, and include all the relevant information from the conversation needed to complete it."
+        )
+        self.params_json_schema["properties"] = {"recipients": properties.pop("recipients"), **properties}
+        self.params_json_schema["required"] = [
+            "recipients" if field_name == "recipient_agent" else field_name
+            for field_name in self.params_json_schema["required"]
+        ]
+
+    def _recipient_property(self) -> dict[str, Any]:
+        return self.params_json_schema["properties"]["recipients"]["items"]["properties"]["recipient_agent"]
+
+    async def on_invoke_tool(self, wrapper: RunContextWrapper[MasterContext], arguments_json_string: str) -> str:
+        """
+        Sends the message(s) to all listed recipients concurrently and returns their responses as JSON.
+
+        The result holds one entry per recipient, in the requested order, with its response, whether it
+        succeeded and how long it took, plus the wall-clock time of the whole broadcast.
+        """
+        tool_call_id = self._get_tool_call_id(wrapper)
+
+        try:
+            kwargs = json.loads(arguments_json_string)
+        except json.JSONDecodeError as e:
+            logger.error(f"Tool '{self.name}' invoked with invalid JSON arguments: {arguments_json_string}. Error: {e}")
+            return f"Error: Invalid arguments format for tool {self.name}. Expected a valid JSON string."
+
+        if extra_params_error := self._validate_extra_params(kwargs):
+            return extra_params_error
+
+        targets = kwargs.get("recipients")
+        shared_message = kwargs.get("message") or ""
+        additional_instructions = kwargs.get("additional_instructions", "")
+        if not kwargs.get("my_primary_instructions"):
+            logger.error(f"Tool '{self.name}' invoked without 'my_primary_instructions' parameter.")
+            return f"Error: Missing required parameter 'my_primary_instructions' for tool {self.name}."
+        if not targets or not isinstance(targets, list):
+            logger.error(f"Tool '{self.name}' invoked without 'recipients' parameter.")
+            return f"Error: Missing required parameter 'recipients' for tool {self.name}."
+
+        deliveries: list[tuple[str, str]] = []
+        for target in targets:
+            target = target if isinstance(target, dict) else {"recipient_agent": target}
+            recipient_agent_name = str(target.get("recipient_agent") or "")
+            recipient_key = recipient_agent_name.lower()
+            if recipient_key not in self.recipients:
+                return self._unknown_recipient_error(recipient_agent_name)
+            message_content = target.get("message") or shared_message
+            if not message_content:
+                logger.error(f"Tool '{self.name}' invoked without a message for '{recipient_agent_name}'.")
+                return f"Error: Missing message for recipient '{recipient_agent_name}' in tool {self.name}."
+            deliveries.append((recipient_key, message_content))
+
+        logger.info(
+            f"Agent '{self.sender_agent.name}' broadcasting via tool '{self.name}' to "
+            f"{[self.recipients[key].name for key, _ in deliveries]}"
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency or len(deliveries))
+        started = time.perf_counter()
+
+        async def deliver(recipient_key: str, message_content: str) -> dict[str, Any]:
+            async with semaphore:
+                delivery_started = time.perf_counter()
+                response, delivered = await self._deliver(
+                    wrapper, recipient_key, message_content, additional_instructions, tool_call_id
+                )
+            return {
+                "recipient_agent": self.recipients[recipient_key].name,
+                "status": "ok" if delivered else "error",
+                "response": response,
+                "latency_seconds": round(time.perf_counter() - delivery_started, 3),
+            }
+
+        responses = await asyncio.gather(*(deliver(key, message) for key, message in deliveries))
+        failed = sum(1 for response in responses if response["status"] == "error")
+        return json.dumps(
+            {
+                "responses": responses,
+                "succeeded": len(responses) - failed,
+                "failed": failed,
+                "total_seconds": round(time.perf_counter() - started, 3),
+            },
+            ensure_ascii=False,
+        )
 
 
 class SendMessageHandoff:
@@ -1,4 +1,5 @@
 import asyncio
+import copy
 import importlib.util
 import inspect
 import json
@@ -8,7 +9,6 @@ import uuid
 from pathlib import Path
 from typing import Any
 
-import httpx
 import jsonref
 from agents import FunctionTool
 from agents.exceptions import ModelBehaviorError
@@ -17,6 +17,9 @@ from agents.strict_schema import ensure_strict_json_schema
 from pydantic import BaseModel, ValidationError
 
 from .base_tool import BaseTool
+from .executors import get_tool_executor
+from .http_pool import HTTPClientConfig, send_request
+from .schema_cache import content_hash, get_schema_cache, to_plain_json
 from .utils import generate_model_from_schema
 
 logger = logging.getLogger(__name__)
@@ -136,6 +139,7 @@ class ToolFactory:
         params: dict[str, Any] | None = None,
         strict: bool = False,
         timeout: int = 90,
+        http_client: HTTPClientConfig | None = None,
     ) -> list[FunctionTool]:
         """
         Converts an OpenAPI JSON or dictionary describing a single endpoint into one or more FunctionTool instances.
@@ -146,19 +150,62 @@ class ToolFactory:
             params (dict[str, Any] | None, optional): Extra query parameters to append to every call. Defaults to None.
             strict (bool, optional): Applies `strict` standard to schema that the OpenAI API expects. Defaults to True.
             timeout (int, optional): HTTP timeout in seconds. Defaults to 90.
+            http_client (HTTPClientConfig | None, optional): Connection pool limits, HTTP/2 and retry settings of
+                the shared client the tools send requests through. Defaults to `DEFAULT_HTTP_CLIENT_CONFIG`.
 
         Returns:
             list[FunctionTool]: List of FunctionTool instances generated from the OpenAPI endpoint.
         """
 
+        compiled = get_schema_cache().get_or_create(
+            "openapi", content_hash(schema, strict), lambda: ToolFactory._compile_openapi_schema(schema, strict)
+        )
+        headers = {k: v for k, v in (headers or {}).items() if v is not None}
+
+        tools: list[FunctionTool] = []
+        for operation in compiled["operations"]:
+            # Tools must not share (mutable) schemas with the cache or each other
+            tool_schema = copy.deepcopy(operation["tool_schema"])
+
+            # Callback factory (captures current verb & path)
+            on_invoke_tool = ToolFactory._create_invoke_for_path(
+                operation["path"],
+                operation["verb"],
+                compiled,
+                tool_schema,
+                operation["name"],
+                headers,
+                params,
+                timeout,
+                http_client,
+            )
+
+            tool = FunctionTool(
+                name=operation["name"],
+                description=operation["description"],
+                params_json_schema=tool_schema,
+                on_invoke_tool=on_invoke_tool,
+                strict_json_schema=strict,
+            )
+            tools.append(tool)
+
+        return tools
+
+    @staticmethod
+    def _compile_openapi_schema(schema: str | dict[str, Any], strict: bool) -> dict[str, Any]:
+        """
+        Resolves the refs of an OpenAPI spec and builds the JSON schema of every operation.
+
+        Returns:
+            dict[str, Any]: The spec's "servers" and its "operations" (path, verb, name, description and
+            tool_schema), as plain JSON unless the spec has recursive refs.
+        """
         if isinstance(schema, dict):
             openapi = jsonref.JsonRef.replace_refs(schema)
         else:
             openapi = jsonref.loads(schema)
 
-        headers = {k: v for k, v in (headers or {}).items() if v is not None}
-
-        tools: list[FunctionTool] = []
+        operations: list[dict[str, Any]] = []
 
         for path, verbs in openapi["paths"].items():
             for verb, verb_spec_ref in verbs.items():
@@ -220,24 +267,27 @@ class ToolFactory:
                 if strict:
                     tool_schema = ensure_strict_json_schema(tool_schema)
 
-                # Callback factory (captures current verb & path)
-                on_invoke_tool = ToolFactory._create_invoke_for_path(
-                    path, verb, openapi, tool_schema, function_name, headers, params, timeout
+                operations.append(
+                    {
+                        "path": path,
+                        "verb": verb,
+                        "name": function_name,
+                        "description": description,
+                        "tool_schema": tool_schema,
+                    }
                 )
 
-                tool = FunctionTool(
-                    name=function_name,
-                    description=description,
-                    params_json_schema=tool_schema,
-                    on_invoke_tool=on_invoke_tool,
-                    strict_json_schema=strict,
-                )
-                tools.append(tool)
-
-        return tools
+        compiled = {"servers": openapi.get("servers"), "operations": operations}
+        try:
+            return to_plain_json(compiled)
+        except ValueError:
+            # Recursive refs: keep the jsonref proxies (cached in memory only)
+            return compiled
 
     @staticmethod
-    def _create_invoke_for_path(path, verb, openapi, tool_schema, function_name, headers=None, params=None, timeout=90):
+    def _create_invoke_for_path(
+        path, verb, openapi, tool_schema, function_name, headers=None, params=None, timeout=90, http_client=None
+    ):
         """
         Creates a callback function for a specific path and method.
         This is a factory function that captures the current values of path and method.
@@ -245,12 +295,13 @@ class ToolFactory:
         Parameters:
             path: The path to create the callback for.
             verb: The HTTP method to use.
-            openapi: The OpenAPI specification.
+            openapi: The OpenAPI specification (only its "servers" are used).
             tool_schema: The schema for the tool.
             function_name: The function/operation name.
             headers: Headers to include in the request.
             params: Additional parameters to include in the request.
             timeout: HTTP timeout in seconds.
+            http_client: Pooling and retry settings for the shared HTTP client.
 
         Returns:
             An async callback function that makes the appropriate HTTP request.
@@ -312,19 +363,20 @@ class ToolFactory:
 
             logger.info(f"Calling URL: {url}\nQuery Params: {query_params}\nJSON Body: {json_body}")
 
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                resp = await client.request(
-                    verb_.upper(),
-                    url,
-                    params=query_params,
-                    json=json_body,
-                    headers=headers,
-                )
-                try:
-                    logger.info(f"Response from {url}: {resp.json()}")
-                    return resp.json()
-                except Exception:
-                    return resp.text
+            resp = await send_request(
+                verb_.upper(),
+                url,
+                timeout=timeout,
+                config=http_client,
+                params=query_params,
+                json=json_body,
+                headers=headers,
+            )
+            try:
+                logger.info(f"Response from {url}: {resp.json()}")
+                return resp.json()
+            except Exception:
+                return resp.text
 
         return _invoke
 
@@ -459,6 +511,8 @@ class ToolFactory:
         params_json_schema = {k: v for k, v in params_json_schema.items() if k not in ("title", "description")}
         params_json_schema["additionalProperties"] = False
 
+        executor_name = getattr(base_tool.ToolConfig, "executor", None)
+
         # The on_invoke_tool function
         async def on_invoke_tool(ctx, input_json: str):
             # Parse input_json to dict
@@ -476,6 +530,8 @@ class ToolFactory:
                     tool_instance._context = ctx
                 if inspect.iscoroutinefunction(tool_instance.run):
                     result = await tool_instance.run()
+                elif executor_name:
+                    result = await get_tool_executor(executor_name).run_tool(tool_instance, args)
                 else:
                     # Always run sync run() in a thread for async compatibility
                     result = await asyncio.to_thread(tool_instance.run)
@@ -490,8 +546,17 @@ class ToolFactory:
             on_invoke_tool=on_invoke_tool,
             strict_json_schema=getattr(base_tool.ToolConfig, "strict", False) or False,
         )
+        # Tools adapted from the same class (e.g. on several agents) share their result cache
+        func_tool._base_tool_class = base_tool  # type: ignore[attr-defined]
         # Propagate one_call_at_a_time from BaseTool.ToolConfig to the FunctionTool instance
         # Store as a private attribute since FunctionTool doesn't have this field
         if hasattr(base_tool.ToolConfig, "one_call_at_a_time"):
             func_tool.one_call_at_a_time = bool(base_tool.ToolConfig.one_call_at_a_time)  # type: ignore[attr-defined]
+        # Same for the scheduling limits and result cache applied by the agent's tool guard
+        for attr in ("max_concurrency", "concurrency_group", "cache"):
+            if getattr(base_tool.ToolConfig, attr, None) is not None:
+                setattr(func_tool, attr, getattr(base_tool.ToolConfig, attr))
+        # None is meaningful here (wait indefinitely), so it is propagated as well
+        if hasattr(base_tool.ToolConfig, "queue_timeout"):
+            func_tool.queue_timeout = base_tool.ToolConfig.queue_timeout  # type: ignore[attr-defined]
         return func_tool
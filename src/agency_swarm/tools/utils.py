@@ -8,7 +8,6 @@ from decimal import Decimal
 from enum import Enum
 from typing import Any, Literal, Optional, Union
 
-import httpx
 import jsonref
 from agents import FunctionTool
 from agents.run_context import RunContextWrapper
@@ -17,6 +16,9 @@ from datamodel_code_generator import DataModelType, PythonVersion
 from datamodel_code_generator.model import get_data_model_types
 from datamodel_code_generator.parser.jsonschema import JsonSchemaParser
 
+from .http_pool import HTTPClientConfig, send_request
+from .schema_cache import content_hash, get_schema_cache
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,7 @@ def from_openapi_schema(
     params: dict[str, Any] | None = None,
     strict: bool = False,
     timeout: int = 90,
+    http_client: HTTPClientConfig | None = None,
 ) -> list[FunctionTool]:
     """
     Converts an OpenAPI JSON or dictionary describing a single endpoint into one or more FunctionTool instances.
@@ -38,6 +41,8 @@ def from_openapi_schema(
         strict (bool, optional): If True, sets 'additionalProperties' to False in every generated schema.
             Defaults to False.
         timeout (int, optional): HTTP timeout in seconds. Defaults to 90.
+        http_client (HTTPClientConfig | None, optional): Connection pool limits, HTTP/2 and retry settings of
+            the shared client the tools send requests through. Defaults to `DEFAULT_HTTP_CLIENT_CONFIG`.
 
     Returns:
         list[FunctionTool]: List of FunctionTool instances generated from the OpenAPI endpoint.
@@ -139,19 +144,20 @@ def from_openapi_schema(
 
                 logger.info(f"Calling URL: {url}\nQuery Params: {query_params}\nJSON Body: {json_body}")
 
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    resp = await client.request(
-                        verb_.upper(),
-                        url,
-                        params=query_params,
-                        json=json_body,
-                        headers=headers,
-                    )
-                    try:
-                        logger.info(f"Response from {url}: {resp.json()}")
-                        return resp.json()
-                    except Exception:
-                        return resp.text
+                resp = await send_request(
+                    verb_.upper(),
+                    url,
+                    timeout=timeout,
+                    config=http_client,
+                    params=query_params,
+                    json=json_body,
+                    headers=headers,
+                )
+                try:
+                    logger.info(f"Response from {url}: {resp.json()}")
+                    return resp.json()
+                except Exception:
+                    return resp.text
 
             if strict:
                 tool_schema = ensure_strict_json_schema(tool_schema)
@@ -195,6 +201,23 @@ def validate_openapi_spec(spec: str):
 
 
 def generate_model_from_schema(schema: dict, class_name: str, strict: bool) -> type:
+    """
+    Generates a Pydantic model class from a JSON schema.
+
+    Models and their generated source are cached by the schema's content hash, so identical
+    schemas are only generated once (see `schema_cache`).
+    """
+    cache = get_schema_cache()
+    key = content_hash(schema, class_name, strict)
+
+    def build_model() -> type:
+        source = cache.get_or_create("model_source", key, lambda: _generate_model_source(schema, class_name, strict))
+        return _exec_model_source(source, class_name)
+
+    return cache.get_or_create("model", key, build_model, persist=False)
+
+
+def _generate_model_source(schema: dict, class_name: str, strict: bool) -> str:
     data_model_types = get_data_model_types(
         DataModelType.PydanticV2BaseModel,
         target_python_version=PythonVersion.PY_310,
@@ -219,6 +242,10 @@ def generate_model_from_schema(schema: dict, class_name: str, strict: bool) -> t
         result = imports_str + str(result)
     result = result.replace("from __future__ import annotations\n", "")
     result += f"\n\n{class_name}.model_rebuild(force=True)"
+    return result
+
+
+def _exec_model_source(source: str, class_name: str) -> type:
     exec_globals = {
         "List": list,
         "Dict": dict,
@@ -235,7 +262,7 @@ def generate_model_from_schema(schema: dict, class_name: str, strict: bool) -> t
         "Literal": Literal,
         "Enum": Enum,
     }
-    exec(result, exec_globals)
+    exec(source, exec_globals)
     model = exec_globals.get(class_name)
     if not model:
         raise ValueError(f"Could not extract model from schema {class_name}")
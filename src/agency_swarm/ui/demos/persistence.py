@@ -1,11 +1,14 @@
 import json
 import os
 import subprocess
+import weakref
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, cast
 
 _CHATS_DIR: str | None = None
+# ThreadManager -> (chat_id, cursor) of the last write, to skip rewriting unchanged chats
+_SAVED_CURSORS: "weakref.WeakKeyDictionary[Any, tuple[str, int]]" = weakref.WeakKeyDictionary()
 
 
 def set_chats_dir(path: str) -> None:
@@ -167,9 +170,18 @@ def list_chat_records() -> list[dict[str, Any]]:
     return scan_records
 
 
+def _thread_cursor(thread_manager: Any) -> int | None:
+    cursor = getattr(thread_manager, "cursor", None)
+    return cursor() if callable(cursor) else None
+
+
 def save_current_chat(agency_instance: Any, chat_id: str) -> None:
     file_path = chat_file_path(chat_id)
-    messages = agency_instance.thread_manager.get_all_messages()
+    thread_manager = agency_instance.thread_manager
+    cursor = _thread_cursor(thread_manager)
+    if cursor is not None and _SAVED_CURSORS.get(thread_manager) == (chat_id, cursor) and os.path.exists(file_path):
+        return
+    messages = thread_manager.get_all_messages()
 
     # Existing created_at
     created_at: str | None = None
@@ -205,6 +217,8 @@ def save_current_chat(agency_instance: Any, chat_id: str) -> None:
         json.dump({"items": messages, "metadata": meta}, f, indent=2)
 
     update_index(chat_id, messages, branch)
+    if cursor is not None:
+        _SAVED_CURSORS[thread_manager] = (chat_id, cursor)
 
 
 def load_chat(agency_instance: Any, chat_id: str) -> bool:
@@ -224,6 +238,9 @@ def load_chat(agency_instance: Any, chat_id: str) -> bool:
         else:
             for m in messages:
                 agency_instance.thread_manager.add_message(m)
+        cursor = _thread_cursor(agency_instance.thread_manager)
+        if cursor is not None:
+            _SAVED_CURSORS[agency_instance.thread_manager] = (chat_id, cursor)
         return True
     except Exception:
         return False
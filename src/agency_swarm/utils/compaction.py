@@ -0,0 +1,307 @@
+"""Automatic background compaction of long conversation threads.
+
+``ThreadCompactor`` watches a ``ThreadManager`` and, once the thread crosses a message
+or token threshold, summarizes its older part with the model and replaces it with one
+summary item per conversation (user thread or agent pair). Recent turns stay verbatim.
+Long histories are summarized map-reduce style: chunks are summarized in parallel and
+the partial summaries are merged.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, cast
+
+from agents import TResponseInputItem
+from openai import AsyncOpenAI
+
+from agency_swarm.messages.history_window import recent_items_start
+from agency_swarm.messages.message_formatter import MessageFormatter
+
+if TYPE_CHECKING:
+    from agency_swarm.utils.thread import ThreadManager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPACTION_PROMPT = (
+    "You are compacting a conversation between a user and one or more AI agents so it can continue "
+    "with less context. Summarize the transcript below.\n\n"
+    "Keep: the user's goals and requests, decisions made, facts and results established (including tool "
+    "results that later turns rely on), artifacts such as files, ids and links, open questions and pending "
+    "tasks. Drop small talk and redundant detail. Do not invent anything. Write concise bullet points."
+)
+DEFAULT_MERGE_PROMPT = (
+    "The summaries below cover consecutive parts of one conversation, oldest first. Merge them into a single "
+    "summary that keeps every goal, decision, fact, artifact and pending task. Write concise bullet points."
+)
+SUMMARY_PREFIX = "Summary of the earlier conversation (compacted automatically):\n\n"
+
+
+@dataclass
+class CompactionConfig:
+    """When and how a thread is compacted.
+
+    Attributes:
+        max_messages (int | None): Compact once the thread holds more messages than this.
+        max_tokens (int | None): Compact once the estimated tokens of the thread exceed this.
+        keep_recent (int): Most recent messages that are always kept verbatim.
+        min_batch (int): Minimum number of older messages worth summarizing. Prevents
+            re-compacting right after a compaction.
+        chunk_tokens (int): Estimated transcript tokens per summarization request.
+        max_parallel (int): Maximum concurrent summarization requests.
+        model (str | None): Model used for summaries. Defaults to the entry agent's model.
+        prompt (str): Instructions for summarizing a transcript chunk.
+        merge_prompt (str): Instructions for merging partial summaries.
+    """
+
+    max_messages: int | None = None
+    max_tokens: int | None = None
+    keep_recent: int = 20
+    min_batch: int = 10
+    chunk_tokens: int = 6000
+    max_parallel: int = 4
+    model: str | None = None
+    prompt: str = DEFAULT_COMPACTION_PROMPT
+    merge_prompt: str = DEFAULT_MERGE_PROMPT
+
+    def __post_init__(self) -> None:
+        if self.max_messages is None and self.max_tokens is None:
+            raise ValueError("CompactionConfig requires max_messages or max_tokens")
+        if self.chunk_tokens <= 0 or self.max_parallel <= 0:
+            raise ValueError("chunk_tokens and max_parallel must be positive")
+
+
+@dataclass
+class CompactionStats:
+    """Metrics of a ``ThreadCompactor``.
+
+    Attributes:
+        runs (int): Completed compactions.
+        failures (int): Compactions that raised or were discarded.
+        compacted_messages (int): Messages replaced by summaries across all runs.
+        summary_requests (int): Model calls made for summaries.
+        last_duration_seconds (float): Duration of the most recent compaction.
+    """
+
+    runs: int = 0
+    failures: int = 0
+    compacted_messages: int = 0
+    summary_requests: int = 0
+    last_duration_seconds: float = 0.0
+
+
+class ThreadCompactor:
+    """Summarizes the older part of a thread in the background.
+
+    Attach it with :meth:`ThreadManager.set_compactor` (``Agency(compaction=...)`` does
+    this for you). Every add calls :meth:`notify`, which only checks the thresholds and,
+    when they are crossed, schedules :meth:`compact` as a task on the running event loop.
+    Runs never overlap, and a run is discarded if the thread is cleared meanwhile.
+
+    Args:
+        config: Thresholds and summarization settings
+        client: ``AsyncOpenAI`` client, or a callable returning one on first use
+        model: Fallback model when ``config.model`` is not set
+    """
+
+    def __init__(
+        self,
+        config: CompactionConfig,
+        client: AsyncOpenAI | Callable[[], AsyncOpenAI] | None = None,
+        model: str | None = None,
+    ):
+        self.config = config
+        self._client = client
+        self.model = config.model or model or "gpt-5-mini"
+        self.stats = CompactionStats()
+        self._task: asyncio.Task | None = None
+
+    def should_compact(self, thread_manager: "ThreadManager") -> bool:
+        """Return True if the thread crossed a threshold and has enough old messages to summarize."""
+        config = self.config
+        count = thread_manager.message_count()
+        if count - config.keep_recent < config.min_batch:
+            return False
+        if config.max_messages is not None and count > config.max_messages:
+            return True
+        return config.max_tokens is not None and thread_manager.total_tokens() > config.max_tokens
+
+    def notify(self, thread_manager: "ThreadManager") -> None:
+        """Schedule a background compaction if the thread needs one. Cheap enough to call on every add."""
+        if self._task is not None and not self._task.done():
+            return
+        if not self.should_compact(thread_manager):
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop (sync usage); the next add inside a run will schedule it
+            return
+        self._task = loop.create_task(self.compact(thread_manager))
+
+    async def wait(self) -> None:
+        """Wait for an in-flight compaction to finish."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def compact(self, thread_manager: "ThreadManager") -> bool:
+        """Summarize everything except the most recent turns and swap the summaries in.
+
+        Args:
+            thread_manager: Thread to compact
+
+        Returns:
+            bool: True if the thread was compacted
+        """
+        started = time.monotonic()
+        generation = thread_manager.history_generation
+        history = thread_manager.get_all_messages()
+        cut = recent_items_start(history, self.config.keep_recent)
+        older = history[:cut]
+        if len(older) < self.config.min_batch:
+            return False
+
+        try:
+            # Created per run: a semaphore is bound to the event loop it is first used on
+            semaphore = asyncio.Semaphore(self.config.max_parallel)
+            groups: dict[Any, list[TResponseInputItem]] = {}
+            for message in older:
+                caller_agent = message.get("callerAgent")
+                key = None if caller_agent is None else frozenset((message.get("agent"), caller_agent))
+                groups.setdefault(key, []).append(message)
+
+            summaries = await asyncio.gather(
+                *(self._summarize(messages, thread_manager.estimate_tokens, semaphore) for messages in groups.values())
+            )
+            replacement = [
+                self._summary_item(messages, summary)
+                for messages, summary in zip(groups.values(), summaries, strict=True)
+            ]
+            replacement.sort(key=lambda item: cast(dict, item)["seq"])
+        except Exception as e:
+            self.stats.failures += 1
+            logger.error(f"Thread compaction failed: {e}", exc_info=True)
+            return False
+
+        if not thread_manager.compact_prefix(cut, replacement, generation):
+            self.stats.failures += 1
+            return False
+        self.stats.runs += 1
+        self.stats.compacted_messages += cut
+        self.stats.last_duration_seconds = time.monotonic() - started
+        logger.info(
+            f"Compacted {cut} messages into {len(replacement)} summaries in {self.stats.last_duration_seconds:.2f}s."
+        )
+        return True
+
+    async def _summarize(
+        self, messages: list[TResponseInputItem], count_tokens: Callable[[Any], int], semaphore: asyncio.Semaphore
+    ) -> str:
+        """Map-reduce summary: summarize transcript chunks in parallel, then merge the partials."""
+        chunks: list[list[str]] = [[]]
+        chunk_tokens = 0
+        for message in messages:
+            tokens = count_tokens(message)
+            if chunks[-1] and chunk_tokens + tokens > self.config.chunk_tokens:
+                chunks.append([])
+                chunk_tokens = 0
+            chunks[-1].append(format_transcript_item(message))
+            chunk_tokens += tokens
+
+        partials = await asyncio.gather(
+            *(self._request(self.config.prompt, "\n".join(lines), semaphore) for lines in chunks)
+        )
+        while len(partials) > 1:
+            batches = _merge_batches(partials, self.config.chunk_tokens)
+            partials = await asyncio.gather(
+                *(self._request(self.config.merge_prompt, "\n\n---\n\n".join(batch), semaphore) for batch in batches)
+            )
+        return partials[0]
+
+    async def _request(self, instructions: str, content: str, semaphore: asyncio.Semaphore) -> str:
+        async with semaphore:
+            self.stats.summary_requests += 1
+            response = await self._get_client().responses.create(
+                model=self.model,
+                input=f"{instructions}\n\n<transcript>\n{content}\n</transcript>",
+            )
+        summary = (getattr(response, "output_text", "") or "").strip()
+        if not summary:
+            # Swapping in an empty summary would drop the older history for good
+            raise ValueError("The summarization model returned an empty summary")
+        return summary
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            self._client = AsyncOpenAI()
+        elif not isinstance(self._client, AsyncOpenAI) and callable(self._client):
+            self._client = self._client()
+        return self._client
+
+    @staticmethod
+    def _summary_item(messages: list[TResponseInputItem], summary: str) -> TResponseInputItem:
+        """Build the item that replaces ``messages``, placed where the last of them was."""
+        last = cast(dict, messages[-1])
+        item = MessageFormatter.add_agency_metadata(
+            {"role": "system", "content": SUMMARY_PREFIX + summary},  # type: ignore[arg-type]
+            agent=last.get("agent") or "",
+            caller_agent=last.get("callerAgent"),
+        )
+        item["seq"] = last.get("seq")  # type: ignore[typeddict-unknown-key]
+        return item
+
+
+def format_transcript_item(message: TResponseInputItem) -> str:
+    """Render a history item as one compact transcript line for summarization."""
+    if not isinstance(message, dict):
+        return str(message)
+    item_type = message.get("type")
+    if item_type == "function_call":
+        return f"[{message.get('agent')}] called {message.get('name')}({message.get('arguments')})"
+    if item_type and item_type.endswith("_output"):
+        return f"[{message.get('agent')}] tool result: {_text_of(message.get('output'))}"
+    role = message.get("role")
+    if role is None:
+        payload = {k: v for k, v in message.items() if k in ("type", "summary", "action", "status", "queries")}
+        return f"[{message.get('agent')}] {item_type}: {json.dumps(payload, default=str, ensure_ascii=False)}"
+    if role == "user":
+        speaker = message.get("callerAgent") or "user"
+    elif role == "assistant":
+        speaker = message.get("agent") or "assistant"
+    else:
+        speaker = role
+    return f"[{speaker}] {_text_of(message.get('content'))}"
+
+
+def _text_of(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list):
+        parts = []
+        for part in value:
+            if isinstance(part, dict):
+                text = part.get("text")
+                parts.append(text if isinstance(text, str) else f"<{part.get('type', 'content')}>")
+            else:
+                parts.append(str(part))
+        return " ".join(parts)
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+
+def _merge_batches(summaries: list[str], chunk_tokens: int) -> list[list[str]]:
+    """Group partial summaries into merge requests of about ``chunk_tokens``, at least two per request."""
+    batches: list[list[str]] = [[]]
+    size = 0
+    for summary in summaries:
+        tokens = len(summary) // 4
+        if len(batches[-1]) >= 2 and size + tokens > chunk_tokens:
+            batches.append([])
+            size = 0
+        batches[-1].append(summary)
+        size += tokens
+    if len(batches) > 1 and len(batches[-1]) == 1:
+        batches[-2].extend(batches.pop())
+    return batches
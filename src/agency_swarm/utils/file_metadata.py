@@ -0,0 +1,168 @@
+"""
+Process-wide cache of OpenAI file metadata.
+
+Uploaded OpenAI files are immutable, so the filename, size and purpose of a file id never
+change and can be cached for the lifetime of the process without invalidation. Lookups of
+several ids run concurrently on the async client; only ids not seen before hit the API.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FILE_METADATA_CACHE_SIZE = 4096
+DEFAULT_LOOKUP_CONCURRENCY = 8
+
+
+@dataclass(frozen=True)
+class FileMetadata:
+    """Immutable metadata of an uploaded OpenAI file.
+
+    Attributes:
+        id (str): OpenAI file id.
+        filename (str): Name the file was uploaded with.
+        bytes (int | None): Size of the file.
+        purpose (str | None): Upload purpose, e.g. "assistants".
+    """
+
+    id: str
+    filename: str
+    bytes: int | None = None
+    purpose: str | None = None
+
+    @classmethod
+    def from_file_object(cls, file_object: Any) -> "FileMetadata":
+        return cls(
+            id=file_object.id,
+            filename=file_object.filename,
+            bytes=getattr(file_object, "bytes", None),
+            purpose=getattr(file_object, "purpose", None),
+        )
+
+
+@dataclass
+class FileMetadataCacheStats:
+    """Hit/miss metrics of the file metadata cache.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that called the files API.
+        size (int): Entries currently cached.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size: int = 0
+
+
+class FileMetadataCache:
+    """
+    LRU of file id to ``FileMetadata``.
+
+    Args:
+        max_entries: Entries kept before the least recently used ones are dropped.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_FILE_METADATA_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, FileMetadata] = OrderedDict()
+        self._stats = FileMetadataCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, file_id: str) -> FileMetadata | None:
+        """Return the cached metadata of ``file_id`` without calling the API."""
+        with self._lock:
+            metadata = self._entries.get(file_id)
+            if metadata is not None:
+                self._entries.move_to_end(file_id)
+            return metadata
+
+    def put(self, metadata: FileMetadata) -> None:
+        """Store the metadata of a file, e.g. right after uploading it."""
+        with self._lock:
+            self._entries[metadata.id] = metadata
+            self._entries.move_to_end(metadata.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, file_id: str) -> FileMetadata | None:
+        metadata = self.get(file_id)
+        with self._lock:
+            if metadata is None:
+                self._stats.misses += 1
+            else:
+                self._stats.hits += 1
+        return metadata
+
+    def retrieve(self, file_id: str, client_sync: Any) -> FileMetadata:
+        """Return the metadata of ``file_id``, retrieving it with the sync client on a miss."""
+        metadata = self._lookup(file_id)
+        if metadata is None:
+            metadata = FileMetadata.from_file_object(client_sync.files.retrieve(file_id))
+            self.put(metadata)
+        return metadata
+
+    async def aretrieve_many(
+        self,
+        file_ids: Iterable[str],
+        client: Any,
+        max_concurrency: int = DEFAULT_LOOKUP_CONCURRENCY,
+    ) -> dict[str, FileMetadata]:
+        """
+        Return the metadata of several files, retrieving the missing ones concurrently.
+
+        Args:
+            file_ids: OpenAI file ids; duplicates are looked up once.
+            client: ``AsyncOpenAI`` client used for ids that are not cached.
+            max_concurrency: Maximum simultaneous ``files.retrieve`` calls.
+
+        Raises:
+            openai.APIError: If a file cannot be retrieved.
+        """
+        results: dict[str, FileMetadata] = {}
+        missing: list[str] = []
+        for file_id in dict.fromkeys(file_ids):
+            metadata = self._lookup(file_id)
+            if metadata is None:
+                missing.append(file_id)
+            else:
+                results[file_id] = metadata
+
+        if missing:
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def fetch(file_id: str) -> FileMetadata:
+                async with semaphore:
+                    file_object = await client.files.retrieve(file_id)
+                metadata = FileMetadata.from_file_object(file_object)
+                self.put(metadata)
+                return metadata
+
+            logger.debug(f"Retrieving metadata of {len(missing)} file(s)")
+            for metadata in await asyncio.gather(*(fetch(file_id) for file_id in missing)):
+                results[metadata.id] = metadata
+        return results
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> FileMetadataCacheStats:
+        """Snapshot of the cache's metrics."""
+        with self._lock:
+            return replace(self._stats, size=len(self._entries))
+
+
+_file_metadata_cache = FileMetadataCache()
+
+
+def get_file_metadata_cache() -> FileMetadataCache:
+    """Return the process-wide file metadata cache."""
+    return _file_metadata_cache
@@ -0,0 +1,179 @@
+"""SQLite-backed thread storage with lazy, paginated history loading.
+
+``SQLiteThreadStore`` keeps every message of a thread as one row keyed by
+``(thread_id, seq)`` where ``seq`` is the message position in the flat history.
+``ThreadManager`` uses it to read only the agent-pair slices a run needs and to
+append new rows incrementally, so per-request cost no longer grows with the
+size of the stored thread.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+from agents import TResponseInputItem
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    thread_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    agent TEXT,
+    caller_agent TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (thread_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_messages_agent ON messages (thread_id, agent, caller_agent, seq);
+CREATE INDEX IF NOT EXISTS idx_messages_caller ON messages (thread_id, caller_agent, seq);
+"""
+
+
+class SQLiteThreadStore:
+    """Persist a single conversation thread in a local SQLite database.
+
+    The database runs in WAL mode so readers never block the writer. Many threads can
+    share one database file; each store instance is bound to one ``thread_id``.
+
+    The store can be passed to ``ThreadManager``/``Agency`` as ``thread_store`` for lazy
+    loading, or used with the plain callbacks: ``load_messages`` as
+    ``load_threads_callback`` and ``append_messages`` as ``append_threads_callback``.
+
+    Args:
+        path: Database file path (``":memory:"`` for a private in-memory database)
+        thread_id: Identifier of the conversation thread this store reads and writes
+    """
+
+    def __init__(self, path: str | Path, thread_id: str):
+        self.path = str(path)
+        self.thread_id = thread_id
+        self._lock = threading.Lock()
+        # Saves may run on the write-behind thread, so the connection is shared behind a lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    def count(self) -> int:
+        """Return the number of persisted messages in the thread."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM messages WHERE thread_id = ?", (self.thread_id,)
+            ).fetchone()
+        return int(row[0])
+
+    def next_message_seq(self) -> int:
+        """Return the ``seq`` field that should follow the last stored message.
+
+        Message ``seq`` fields keep counting across ``ThreadManager.clear()`` so they
+        can run ahead of the row positions.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM messages WHERE thread_id = ? ORDER BY seq DESC LIMIT 1", (self.thread_id,)
+            ).fetchone()
+        if row is None:
+            return 0
+        seq = json.loads(row[0]).get("seq")
+        return seq + 1 if isinstance(seq, int) else 0
+
+    def get_messages(
+        self,
+        *,
+        participants: tuple[str | None, str | None] | None = None,
+        user_thread: bool = False,
+        before_seq: int | None = None,
+        limit: int | None = None,
+    ) -> list[TResponseInputItem]:
+        """Load a slice of the thread in chronological order.
+
+        With no filter the whole thread is returned. ``user_thread=True`` selects messages
+        whose ``callerAgent`` is ``None``; ``participants`` selects messages exchanged
+        between two agents in either direction.
+
+        Pagination walks backwards: pass ``limit`` to get the most recent ``limit`` matches
+        and use the ``before_seq`` of the oldest returned row's ``seq`` to fetch the
+        previous page (see :meth:`get_page`).
+
+        Args:
+            participants: Only messages exchanged between these two agents (None is the user)
+            user_thread: Only messages sent by the user
+            before_seq: Only rows with ``seq`` strictly below this value
+            limit: Maximum number of rows (the most recent ones) to return
+
+        Returns:
+            list[TResponseInputItem]: Matching messages ordered by ``seq``
+        """
+        return [message for _, message in self.get_page(participants, user_thread, before_seq, limit)]
+
+    def get_page(
+        self,
+        participants: tuple[str | None, str | None] | None = None,
+        user_thread: bool = False,
+        before_seq: int | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[int, TResponseInputItem]]:
+        """Same as :meth:`get_messages` but returns ``(seq, message)`` pairs for cursoring."""
+        clauses = ["thread_id = ?"]
+        params: list[Any] = [self.thread_id]
+        if user_thread:
+            clauses.append("caller_agent IS NULL")
+        if participants is not None:
+            first, second = participants
+            clauses.append("((agent IS ? AND caller_agent IS ?) OR (agent IS ? AND caller_agent IS ?))")
+            params.extend([first, second, second, first])
+        if before_seq is not None:
+            clauses.append("seq < ?")
+            params.append(before_seq)
+
+        query = f"SELECT seq, data FROM messages WHERE {' AND '.join(clauses)} ORDER BY seq DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        rows.reverse()
+        return [(seq, json.loads(data)) for seq, data in rows]
+
+    def load_messages(self) -> list[TResponseInputItem]:
+        """Return the full thread. Compatible with ``load_threads_callback``."""
+        return self.get_messages()
+
+    def append_messages(self, messages: list[TResponseInputItem], start_index: int) -> None:
+        """Write ``messages`` at positions starting from ``start_index``.
+
+        Rows at or after ``start_index`` are replaced, which makes retried writes and
+        history resets idempotent. Compatible with ``append_threads_callback``.
+        """
+        rows = [
+            (
+                self.thread_id,
+                start_index + offset,
+                message.get("agent"),
+                message.get("callerAgent"),
+                json.dumps(message),
+            )
+            for offset, message in enumerate(messages)
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE thread_id = ? AND seq >= ?", (self.thread_id, start_index))
+            self._conn.executemany(
+                "INSERT INTO messages (thread_id, seq, agent, caller_agent, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        logger.debug(f"Appended {len(rows)} messages to SQLite thread '{self.thread_id}' at seq {start_index}.")
+
+    def clear(self) -> None:
+        """Delete every message of the thread."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM messages WHERE thread_id = ?", (self.thread_id,))
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,19 @@
+import asyncio
 import logging
+import threading
 from collections.abc import Callable
 from dataclasses import dataclass, field
-from typing import Any, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from agents import TResponseInputItem
 
+from agency_swarm.messages.history_window import estimate_message_tokens
+from agency_swarm.utils.write_behind import WriteBehindConfig, WriteBehindStats, WriteBehindWriter
+
+if TYPE_CHECKING:
+    from agency_swarm.utils.compaction import ThreadCompactor
+    from agency_swarm.utils.sqlite_store import SQLiteThreadStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -15,6 +24,14 @@ class MessageStore:
     This class stores all messages in a single flat list with agent/callerAgent
     metadata embedded in each message, replacing the previous thread-based structure.
 
+    Messages are kept in insertion order, which is also their ``seq`` order
+    (``ThreadManager`` assigns a monotonic ``seq`` on insert). Lookups are served
+    from secondary indexes keyed by agent, callerAgent, the (agent, callerAgent)
+    pair and the unordered pair of participants. Each index bucket is append-only,
+    so reads cost time proportional to the result size and never sort. The flat
+    ``messages`` list remains the source of truth; if it is replaced or appended to
+    directly, the indexes catch up on the next read.
+
     Attributes:
         messages (list[TResponseInputItem]): Flat list of all messages
         metadata (dict[str, Any]): Optional metadata for the entire message store
@@ -23,6 +40,23 @@ class MessageStore:
     messages: list[TResponseInputItem] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
 
+    # --- Secondary indexes (derived from ``messages``) ---
+    _ordered: list[TResponseInputItem] = field(default_factory=list, init=False, repr=False, compare=False)
+    _by_agent: dict[str | None, list[TResponseInputItem]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_caller: dict[str | None, list[TResponseInputItem]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_pair: dict[tuple[str | None, str | None], list[TResponseInputItem]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _by_participants: dict[frozenset[str | None], list[TResponseInputItem]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_source: list[TResponseInputItem] | None = field(default=None, init=False, repr=False, compare=False)
+    _indexed_count: int = field(default=0, init=False, repr=False, compare=False)
+
     def add_message(self, message: TResponseInputItem) -> None:
         """Add a single message to the store.
 
@@ -34,6 +68,7 @@ class MessageStore:
             return
 
         self.messages.append(message)
+        self._sync_indexes()
         logger.debug(
             f"Added message to store - agent: {message.get('agent')}, "
             f"callerAgent: {message.get('callerAgent')}, role: {message.get('role')}"
@@ -49,7 +84,7 @@ class MessageStore:
             self.add_message(message)
 
     def get_messages(self, agent: str | None = None, caller_agent: str | None = None) -> list[TResponseInputItem]:
-        """Get filtered messages for specific agent pairs, sorted by timestamp.
+        """Get filtered messages for specific agent pairs, in sequence order.
 
         Args:
             agent: Filter by recipient agent name
@@ -58,21 +93,16 @@ class MessageStore:
         Returns:
             list[TResponseInputItem]: Filtered list of messages sorted chronologically
         """
+        self._sync_indexes()
         if agent is None and caller_agent is None:
-            messages = self.messages.copy()
+            bucket = self._ordered
+        elif caller_agent is None:
+            bucket = self._by_agent.get(agent, [])
+        elif agent is None:
+            bucket = self._by_caller.get(caller_agent, [])
         else:
-            filtered = []
-            for msg in self.messages:
-                # Match messages based on agent/callerAgent criteria
-                agent_match = agent is None or msg.get("agent") == agent
-                caller_match = caller_agent is None or msg.get("callerAgent") == caller_agent
-
-                if agent_match and caller_match:
-                    filtered.append(msg)
-            messages = filtered
-
-        # Sort by timestamp to maintain chronological order
-        messages.sort(key=lambda m: cast(dict, m).get("timestamp", 0) or 0)  # Ensure numeric return
+            bucket = self._by_pair.get((agent, caller_agent), [])
+        messages = list(bucket)
 
         logger.debug(
             f"Filtered {len(messages)} messages for agent='{agent}', callerAgent='{caller_agent}' "
@@ -80,8 +110,23 @@ class MessageStore:
         )
         return messages
 
+    def get_messages_by_caller(self, caller_agent: str | None) -> list[TResponseInputItem]:
+        """Get all messages sent by ``caller_agent``, in sequence order.
+
+        Unlike :meth:`get_messages`, ``None`` is matched literally, so this returns
+        the user thread (messages whose ``callerAgent`` is ``None``).
+
+        Args:
+            caller_agent: Sender agent name (None for user)
+
+        Returns:
+            list[TResponseInputItem]: Messages from the sender sorted chronologically
+        """
+        self._sync_indexes()
+        return list(self._by_caller.get(caller_agent, []))
+
     def get_conversation_between(self, agent1: str, agent2: str | None) -> list[TResponseInputItem]:
-        """Get all messages exchanged between two specific agents, sorted by timestamp.
+        """Get all messages exchanged between two specific agents, in sequence order.
 
         This includes messages in both directions.
 
@@ -92,24 +137,50 @@ class MessageStore:
         Returns:
             list[TResponseInputItem]: Messages between the two agents sorted chronologically
         """
-        conversation = []
-        for msg in self.messages:
-            # Check both directions of conversation
-            if (msg.get("agent") == agent1 and msg.get("callerAgent") == agent2) or (
-                msg.get("agent") == agent2 and msg.get("callerAgent") == agent1
-            ):
-                conversation.append(msg)
-
-        # Sort by timestamp to maintain chronological order
-        conversation.sort(key=lambda m: cast(dict, m).get("timestamp", 0) or 0)  # Ensure numeric return
-
-        return conversation
+        self._sync_indexes()
+        return list(self._by_participants.get(frozenset((agent1, agent2)), []))
 
     def clear(self) -> None:
         """Remove all messages from the store."""
         self.messages.clear()
+        self._reset_indexes()
         logger.info("Cleared all messages from store")
 
+    def _reset_indexes(self) -> None:
+        """Drop all index buckets and bind them to the current ``messages`` list."""
+        self._ordered = []
+        self._by_agent = {}
+        self._by_caller = {}
+        self._by_pair = {}
+        self._by_participants = {}
+        self._indexed_source = self.messages
+        self._indexed_count = 0
+
+    def _sync_indexes(self) -> None:
+        """Bring the indexes up to date with ``messages``.
+
+        Appends only index the new tail. A replaced or shrunk list triggers a full rebuild.
+        """
+        if self._indexed_source is not self.messages or self._indexed_count > len(self.messages):
+            self._reset_indexes()
+        for message in self.messages[self._indexed_count :]:
+            if isinstance(message, dict):
+                self._index_message(message)
+        self._indexed_count = len(self.messages)
+
+    def _index_message(self, message: TResponseInputItem) -> None:
+        """Insert a message into every index bucket it belongs to."""
+        agent = message.get("agent")
+        caller_agent = message.get("callerAgent")
+        for bucket in (
+            self._ordered,
+            self._by_agent.setdefault(agent, []),
+            self._by_caller.setdefault(caller_agent, []),
+            self._by_pair.setdefault((agent, caller_agent), []),
+            self._by_participants.setdefault(frozenset((agent, caller_agent)), []),
+        ):
+            bucket.append(message)
+
     def __len__(self) -> int:
         """Return the total number of messages."""
         return len(self.messages)
@@ -119,9 +190,43 @@ class MessageStore:
         return bool(self.messages)
 
 
+def migrate_sequence_numbers(messages: list[TResponseInputItem]) -> list[TResponseInputItem]:
+    """Return ``messages`` in ``seq`` order, numbering legacy histories that lack ``seq``.
+
+    Histories saved before sequence numbers existed are ordered by their ``timestamp``
+    (stable, as reads used to do) and renumbered from 0. Histories that already carry
+    ``seq`` are only re-ordered if they were saved out of order.
+
+    Args:
+        messages: Flat message list as returned by a load callback
+
+    Returns:
+        list[TResponseInputItem]: The messages (same dict objects) ready for the store
+    """
+    valid = [m for m in messages if isinstance(m, dict)]
+    if len(valid) != len(messages):
+        logger.warning(f"Dropped {len(messages) - len(valid)} invalid messages from loaded history.")
+
+    if all(isinstance(m.get("seq"), int) for m in valid):
+        if any(valid[i]["seq"] >= valid[i + 1]["seq"] for i in range(len(valid) - 1)):
+            valid.sort(key=lambda m: cast(dict, m)["seq"])
+        return valid
+
+    logger.info(f"Migrating {len(valid)} loaded messages to sequence numbers.")
+    valid.sort(key=lambda m: cast(dict, m).get("timestamp", 0) or 0)
+    for seq, message in enumerate(valid):
+        message["seq"] = seq  # type: ignore[typeddict-unknown-key]
+    return valid
+
+
 # Type definitions for persistence callbacks
 ThreadLoadCallback = Callable[[], list[TResponseInputItem]]
 ThreadSaveCallback = Callable[[list[TResponseInputItem]], None]
+# Receives only the messages added since the last successful save and the index of the
+# first of them in the flat history. Persisted history should be truncated to
+# ``start_index`` before appending, which makes retries and resets (``start_index == 0``)
+# idempotent.
+ThreadAppendCallback = Callable[[list[TResponseInputItem], int], None]
 
 
 class ThreadManager:
@@ -135,23 +240,76 @@ class ThreadManager:
         _store (MessageStore): The underlying message storage
         _load_threads_callback (ThreadLoadCallback | None): Callback to load messages
         _save_threads_callback (ThreadSaveCallback | None): Callback to save messages
+        _append_threads_callback (ThreadAppendCallback | None): Callback to save only new messages
+        _persisted_count (int): Number of leading messages already handed to the append callback
+        _writer (WriteBehindWriter | None): Background writer used in write-behind mode
+        _thread_store (SQLiteThreadStore | None): Lazily loaded thread store
+        _history_base (int): Number of stored messages that predate this manager and are
+            only read from ``_thread_store`` on demand; ``_store`` holds the messages after them
+        _next_seq (int): Sequence number assigned to the next added message
+        _compactor (ThreadCompactor | None): Summarizes older history in the background
+
+    Every added message gets a monotonic ``seq`` field. It is the ordering key for all
+    reads, so histories stay stable even when wall-clock timestamps collide or go
+    backwards. Histories loaded without ``seq`` are migrated by ordering them by their
+    legacy ``timestamp`` once and numbering them.
     """
 
     def __init__(
         self,
         load_threads_callback: ThreadLoadCallback | None = None,
         save_threads_callback: ThreadSaveCallback | None = None,
+        append_threads_callback: ThreadAppendCallback | None = None,
+        write_behind: bool | WriteBehindConfig = False,
+        thread_store: "SQLiteThreadStore | None" = None,
     ):
         """Initialize the ThreadManager with optional persistence callbacks.
 
         Args:
             load_threads_callback: Function to load message history
-            save_threads_callback: Function to save message history
+            save_threads_callback: Function to save the full message history
+            append_threads_callback: Function to save only newly added messages as
+                ``(new_messages, start_index)``. When provided it is used instead of
+                ``save_threads_callback`` on every add, so persistence cost scales with
+                the number of new items rather than the thread length.
+            write_behind: Run save callbacks on a background thread instead of inline.
+                Bursts of adds are debounced into a single save. Pass a
+                ``WriteBehindConfig`` to tune debounce and backlog limits. Call
+                :meth:`flush` (or :meth:`aflush`) to wait for pending saves.
+            thread_store: Store that replaces the load/save callbacks. History is not
+                loaded upfront; only the slices requested via
+                :meth:`get_conversation_history` are fetched, and new messages are
+                appended as rows.
+
+        Raises:
+            ValueError: If ``thread_store`` is combined with persistence callbacks.
         """
+        if thread_store is not None and (load_threads_callback or save_threads_callback or append_threads_callback):
+            raise ValueError("Pass either thread_store or load/save/append callbacks, not both.")
+        self._thread_store = thread_store
+        self._history_base = 0
+        self._history_slices: dict[frozenset[str | None] | None, list[TResponseInputItem]] = {}
+        self._next_seq = 0
+        self._token_estimates: dict[int, int] = {}
+        self._runner_item_cache: dict[int, tuple] = {}
+        self._token_total = 0
+        self._token_total_source: list[TResponseInputItem] | None = None
+        self._token_total_count = 0
+        # Bumped whenever the history is reset or rewritten
+        self._generation = 0
+        self._compactor: ThreadCompactor | None = None
         self._store = MessageStore()
         self._load_threads_callback = load_threads_callback
         self._save_threads_callback = save_threads_callback
+        self._append_threads_callback = append_threads_callback
+        if write_behind is True:
+            write_behind = WriteBehindConfig()
+        self._write_behind_config: WriteBehindConfig | None = write_behind or None
+        self._persist_lock = threading.Lock()
+        self._writer = self._create_writer()
         self.init_messages()
+        # Loaded history is already persisted
+        self._persisted_count = len(self._store.messages)
         logger.info("ThreadManager initialized with flat message storage.")
 
     def add_message(self, message: TResponseInputItem) -> None:
@@ -160,8 +318,11 @@ class ThreadManager:
         Args:
             message: The message to add
         """
+        self._assign_seq(message)
         self._store.add_message(message)
-        self._save_messages()
+        self._save_messages(1)
+        if self._compactor is not None:
+            self._compactor.notify(self)
 
     def add_messages(self, messages: list[TResponseInputItem]) -> None:
         """Add multiple messages and trigger save.
@@ -169,8 +330,140 @@ class ThreadManager:
         Args:
             messages: List of messages to add
         """
+        for message in messages:
+            self._assign_seq(message)
         self._store.add_messages(messages)
-        self._save_messages()
+        self._save_messages(len(messages))
+        if self._compactor is not None:
+            self._compactor.notify(self)
+
+    def _assign_seq(self, message: TResponseInputItem) -> None:
+        """Stamp the next sequence number onto a message about to be stored."""
+        if isinstance(message, dict):
+            message["seq"] = self._next_seq  # type: ignore[typeddict-unknown-key]
+            self._next_seq += 1
+
+    def cursor(self) -> int:
+        """Return a watermark for the messages added so far.
+
+        Pass it to :meth:`messages_since` later to get only the messages added after
+        this call. Sequence numbers are never reused, so cursors stay valid across
+        :meth:`clear`.
+
+        Returns:
+            int: The ``seq`` the next added message will get
+        """
+        return self._next_seq
+
+    def messages_since(self, cursor: int) -> list[TResponseInputItem]:
+        """Get the messages added after ``cursor`` was taken, in sequence order.
+
+        Only the new tail of the history is scanned and copied, so the cost depends on
+        the number of new messages rather than the thread length. Messages that were
+        appended to the store directly (without a ``seq``) count as new.
+
+        Args:
+            cursor: Watermark returned by :meth:`cursor`
+
+        Returns:
+            list[TResponseInputItem]: Messages with ``seq >= cursor``
+        """
+        messages = self._store.messages
+        start = len(messages)
+        while start > 0:
+            previous = messages[start - 1]
+            if isinstance(previous, dict) and previous.get("seq", cursor) < cursor:
+                break
+            start -= 1
+        return messages[start:]
+
+    def estimate_tokens(self, message: TResponseInputItem) -> int:
+        """Estimate the model tokens of a stored message, cached by its ``seq``.
+
+        Args:
+            message: A message from this manager's history
+
+        Returns:
+            int: Approximate token count
+        """
+        seq = message.get("seq") if isinstance(message, dict) else None
+        if not isinstance(seq, int):
+            return estimate_message_tokens(message)
+        tokens = self._token_estimates.get(seq)
+        if tokens is None:
+            tokens = self._token_estimates[seq] = estimate_message_tokens(message)
+        return tokens
+
+    def message_count(self) -> int:
+        """Return the number of messages in the thread, including stored history not yet loaded."""
+        return self._history_base + len(self._store.messages)
+
+    def total_tokens(self) -> int:
+        """Return the estimated tokens of all messages held in memory.
+
+        The total is maintained incrementally, so repeated calls only estimate new messages.
+        """
+        messages = self._store.messages
+        if self._token_total_source is not messages or self._token_total_count > len(messages):
+            self._token_total = 0
+            self._token_total_source = messages
+            self._token_total_count = 0
+        for message in messages[self._token_total_count :]:
+            self._token_total += self.estimate_tokens(message)
+        self._token_total_count = len(messages)
+        return self._token_total
+
+    @property
+    def runner_item_cache(self) -> dict[int, tuple]:
+        """Memo of messages already cleaned for the model, see ``MessageFormatter.clean_history_for_runner``."""
+        return self._runner_item_cache
+
+    @property
+    def history_generation(self) -> int:
+        """Counter that changes whenever the history is cleared or rewritten."""
+        return self._generation
+
+    def set_compactor(self, compactor: "ThreadCompactor | None") -> None:
+        """Attach a compactor that is notified after every add.
+
+        Args:
+            compactor: Compactor that summarizes older history, or None to disable compaction
+        """
+        self._compactor = compactor
+
+    def compact_prefix(self, count: int, replacement: list[TResponseInputItem], generation: int) -> bool:
+        """Replace the first ``count`` messages of the thread with ``replacement`` and persist the result.
+
+        Messages added after the prefix was read are kept. The whole compacted thread is
+        saved: the append callback and thread store are rewritten from index 0.
+
+        Args:
+            count: Number of leading messages (in ``get_all_messages`` order) to replace
+            replacement: Items that take their place, e.g. summaries carrying the ``seq``
+                of a replaced message so that ordering is preserved
+            generation: ``history_generation`` at the time the prefix was read
+
+        Returns:
+            bool: False if the history was cleared or rewritten in the meantime
+        """
+        with self._persist_lock:
+            if generation != self._generation or count > self.message_count():
+                logger.info("Thread changed while it was being compacted; discarding the compaction.")
+                return False
+            remaining = self.get_all_messages()[count:]
+            self._store.messages = [*replacement, *remaining]
+            self._history_base = 0
+            self._history_slices.clear()
+            self._persisted_count = 0
+            self._generation += 1
+            # Replacement items reuse seqs of replaced messages, so only the remaining
+            # messages keep their estimates; the replacements are estimated afresh.
+            kept_seqs = {m.get("seq") for m in remaining if isinstance(m, dict)}
+            self._token_estimates = {seq: t for seq, t in self._token_estimates.items() if seq in kept_seqs}
+            self._runner_item_cache.clear()
+        logger.info(f"Compacted {count} messages into {len(replacement)} items.")
+        self._save_messages(len(self._store.messages))
+        return True
 
     def get_conversation_history(self, agent: str, caller_agent: str | None = None) -> list[TResponseInputItem]:
         """Get conversation history for a specific interaction pair.
@@ -188,41 +481,156 @@ class ThreadManager:
             list[TResponseInputItem]: Relevant conversation history
         """
         if caller_agent is None:
-            messages = self._store.get_messages()
-            return [m for m in messages if m.get("callerAgent") is None]
+            messages = self._store.get_messages_by_caller(None)
+        else:
+            messages = self._store.get_conversation_between(agent, caller_agent)
 
-        return self._store.get_conversation_between(agent, caller_agent)
+        if self._history_base:
+            return self._load_history_slice(agent, caller_agent) + messages
+        return messages
 
     def get_all_messages(self) -> list[TResponseInputItem]:
         """Get all messages in the store, properly ordered.
 
         Returns:
-            list[TResponseInputItem]: All messages in chronological order
+            list[TResponseInputItem]: All messages in sequence order
         """
-        messages = self._store.messages.copy()
-        # Sort by timestamp to maintain chronological order
-        messages.sort(key=lambda m: cast(dict, m).get("timestamp", 0) or 0)  # Ensure numeric return
-        return messages
+        if self._history_base:
+            return self._load_history_slice(None, None, everything=True) + self._store.get_messages()
+        return self._store.get_messages()
+
+    def _load_history_slice(
+        self, agent: str | None, caller_agent: str | None, everything: bool = False
+    ) -> list[TResponseInputItem]:
+        """Fetch (once) the part of a conversation that predates this manager from the thread store."""
+        if self._thread_store is None:
+            return []
+        if everything:
+            return self._thread_store.get_messages(before_seq=self._history_base)
+        key = None if caller_agent is None else frozenset((agent, caller_agent))
+        if key not in self._history_slices:
+            if caller_agent is None:
+                loaded = self._thread_store.get_messages(user_thread=True, before_seq=self._history_base)
+            else:
+                loaded = self._thread_store.get_messages(
+                    participants=(agent, caller_agent), before_seq=self._history_base
+                )
+            self._history_slices[key] = loaded
+            logger.debug(f"Loaded {len(loaded)} stored messages for agent='{agent}', callerAgent='{caller_agent}'.")
+        return list(self._history_slices[key])
+
+    def flush(self) -> None:
+        """Block until all pending write-behind saves have been attempted.
+
+        No-op when write-behind mode is disabled, since saves then happen inline.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+
+    async def aflush(self) -> None:
+        """Async variant of :meth:`flush` that waits for the save off the event loop."""
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.flush)
+
+    def close(self) -> None:
+        """Flush pending saves and stop the write-behind thread, if any."""
+        if self._writer is not None:
+            self._writer.close()
+
+    async def aclose(self) -> None:
+        """Async variant of :meth:`close` that flushes and stops the writer off the event loop."""
+        if self._writer is not None:
+            await asyncio.to_thread(self._writer.close)
+
+    def persistence_stats(self) -> WriteBehindStats | None:
+        """Return write-behind queue depth, lag and save counters, or ``None`` when disabled."""
+        return self._writer.stats() if self._writer is not None else None
+
+    def _create_writer(self) -> WriteBehindWriter | None:
+        has_save_callback = (
+            self._append_threads_callback is not None
+            or self._save_threads_callback is not None
+            or self._thread_store is not None
+        )
+        if self._write_behind_config is None or not has_save_callback:
+            return None
+        return WriteBehindWriter(self._write_messages, self._write_behind_config)
+
+    def _save_messages(self, count: int = 1) -> None:
+        """Save messages inline, or schedule a background save in write-behind mode."""
+        if self._writer is not None:
+            self._writer.notify(count)
+            return
+        self._write_messages()
 
-    def _save_messages(self) -> None:
-        """Save all messages using the callback if configured."""
-        if self._save_threads_callback:
-            try:
-                logger.debug(f"Saving {len(self._store.messages)} messages using callback...")
-                self._save_threads_callback(self._store.messages)
-                logger.info(f"Successfully saved {len(self._store.messages)} messages.")
-            except Exception as e:
-                logger.error(f"Error saving messages using callback: {e}", exc_info=True)
+    def _write_messages(self) -> bool:
+        """Save messages using the configured callback.
+
+        The append callback receives only unsaved messages; the legacy full-list
+        callback receives the whole history.
+
+        Returns:
+            bool: True if the save succeeded or there was nothing to save
+        """
+        with self._persist_lock:
+            if self._thread_store is not None:
+                return self._append_new_messages(self._append_to_thread_store)
+            if self._append_threads_callback:
+                return self._append_new_messages(self._append_threads_callback)
+            if self._save_threads_callback:
+                # Background saves get a snapshot so the list is not mutated mid-serialization
+                messages = self._store.messages if self._writer is None else list(self._store.messages)
+                try:
+                    logger.debug(f"Saving {len(messages)} messages using callback...")
+                    self._save_threads_callback(messages)
+                    logger.info(f"Successfully saved {len(messages)} messages.")
+                except Exception as e:
+                    logger.error(f"Error saving messages using callback: {e}", exc_info=True)
+                    return False
+            return True
+
+    def _append_new_messages(self, callback: ThreadAppendCallback) -> bool:
+        """Hand messages added since the last successful save to ``callback``."""
+        start_index = min(self._persisted_count, len(self._store.messages))
+        new_messages = self._store.messages[start_index:]
+        if not new_messages:
+            return True
+        try:
+            logger.debug(f"Appending {len(new_messages)} messages at index {start_index} using callback...")
+            callback(new_messages, start_index)
+            self._persisted_count = start_index + len(new_messages)
+            logger.info(f"Successfully appended {len(new_messages)} messages.")
+            return True
+        except Exception as e:
+            # Unsaved messages stay pending and are retried on the next save
+            logger.error(f"Error appending messages using callback: {e}", exc_info=True)
+            return False
+
+    def _append_to_thread_store(self, new_messages: list[TResponseInputItem], start_index: int) -> None:
+        """Append callback for the thread store; rows follow the history that was not loaded."""
+        if self._thread_store is not None:
+            self._thread_store.append_messages(new_messages, self._history_base + start_index)
 
     def init_messages(self) -> None:
-        """Load all messages from the load callback into the store."""
-        if self._load_threads_callback:
+        """Load all messages from the load callback into the store.
+
+        With a thread store only the number of stored messages is read; their content
+        is fetched lazily.
+        """
+        if self._thread_store is not None:
+            self._history_base = self._thread_store.count()
+            self._history_slices.clear()
+            self._next_seq = max(self._history_base, self._thread_store.next_message_seq())
+            logger.info(f"Thread store holds {self._history_base} messages; loading lazily.")
+        elif self._load_threads_callback:
             try:
                 logger.debug("Loading messages using callback...")
                 loaded_messages = self._load_threads_callback()
 
                 if isinstance(loaded_messages, list):
-                    self._store.messages = loaded_messages
+                    self._store.messages = migrate_sequence_numbers(loaded_messages)
+                    if self._store.messages:
+                        self._next_seq = cast(dict, self._store.messages[-1])["seq"] + 1
                     logger.info(f"Loaded {len(loaded_messages)} messages from callback.")
                 else:
                     logger.error(f"Invalid format from load callback: expected list, got {type(loaded_messages)}")
@@ -236,6 +644,32 @@ class ThreadManager:
         Exposes a public API to reset the conversation.
         """
         try:
-            self._store.clear()
+            with self._persist_lock:
+                self._store.clear()
+                # The next append rewrites persisted history from the start
+                self._persisted_count = 0
+                self._history_base = 0
+                self._history_slices.clear()
+                self._token_estimates.clear()
+                self._runner_item_cache.clear()
+                self._generation += 1
+                # _next_seq is kept so that cursors taken before the reset remain valid
         except Exception as e:
             logger.error(f"Error clearing messages: {e}", exc_info=True)
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Drop the lock and background writer, which cannot be pickled."""
+        state = self.__dict__.copy()
+        state.pop("_persist_lock", None)
+        state.pop("_writer", None)
+        # Compactors hold API clients and tasks; they are re-attached by the owner
+        state["_compactor"] = None
+        # Keyed by object id, so it would not survive the round trip anyway
+        state["_runner_item_cache"] = {}
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Recreate the lock and background writer after unpickling."""
+        self.__dict__.update(state)
+        self._persist_lock = threading.Lock()
+        self._writer = self._create_writer()
@@ -0,0 +1,166 @@
+"""
+Process-wide cache of vector store name to id resolution.
+
+Resolved ids are kept in memory and in a local JSON mapping file, so a name is only
+searched for once per account. The file defaults to ``.agency_swarm_vector_stores.json``
+in the working directory; set ``AGENCY_SWARM_VECTOR_STORES_FILE`` or call
+``configure_vector_store_cache`` to move it. An id read from the file is checked once per
+process with a single ``retrieve`` call; only on a miss are all pages of the account's
+vector stores listed.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any
+
+from openai import NotFoundError
+
+logger = logging.getLogger(__name__)
+
+
+def _account_key(client: Any) -> str:
+    """Identify the account a client talks to without writing its API key to disk."""
+    identity = "|".join(
+        str(getattr(client, attribute, "")) for attribute in ("base_url", "organization", "project", "api_key")
+    )
+    return hashlib.sha256(identity.encode()).hexdigest()[:16]
+
+
+class VectorStoreCache:
+    """
+    Cache of vector store ids by account and name.
+
+    Args:
+        path: JSON mapping file. Defaults to ``AGENCY_SWARM_VECTOR_STORES_FILE`` or
+            ``.agency_swarm_vector_stores.json`` in the working directory at first use.
+        persist: Set False to keep the mapping in memory only.
+    """
+
+    def __init__(self, path: str | Path | None = None, persist: bool = True):
+        self._path = Path(path).expanduser() if path else None
+        self.persist = persist
+        self._ids: dict[str, dict[str, str]] = {}
+        self._stored: dict[str, dict[str, str]] | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            default = os.environ.get("AGENCY_SWARM_VECTOR_STORES_FILE") or ".agency_swarm_vector_stores.json"
+            self._path = Path(default).expanduser().resolve()
+        return self._path
+
+    def resolve(self, client_sync: Any, name: str, create: bool = True) -> str | None:
+        """
+        Return the id of the vector store called ``name``.
+
+        Args:
+            client_sync: ``OpenAI`` client of the account owning the store.
+            name: Vector store name.
+            create: Create the vector store if no store has this name.
+
+        Returns:
+            str | None: Vector store id, or None if it does not exist and ``create`` is False.
+        """
+        account = _account_key(client_sync)
+        with self._lock:
+            vs_id = self._ids.get(account, {}).get(name)
+            if vs_id:
+                return vs_id
+
+            vs_id = self._verify_stored(client_sync, account, name) or self._find(client_sync, name)
+            if vs_id is None:
+                if not create:
+                    return None
+                vs_id = client_sync.vector_stores.create(name=name).id
+                logger.info(f"Created vector store {name}: {vs_id}")
+            self._remember(account, name, vs_id)
+            return vs_id
+
+    def forget(self, client_sync: Any, name: str) -> None:
+        """Drop a cached id, e.g. after the vector store was deleted."""
+        account = _account_key(client_sync)
+        with self._lock:
+            self._ids.get(account, {}).pop(name, None)
+            stored = self._load()
+            if stored.get(account, {}).pop(name, None) is not None:
+                self._save(stored)
+
+    def clear(self) -> None:
+        """Drop the in-memory mapping; the mapping file is kept."""
+        with self._lock:
+            self._ids.clear()
+            self._stored = None
+
+    def _verify_stored(self, client_sync: Any, account: str, name: str) -> str | None:
+        vs_id = self._load().get(account, {}).get(name)
+        if not vs_id:
+            return None
+        try:
+            vector_store = client_sync.vector_stores.retrieve(vs_id)
+        except NotFoundError:
+            logger.info(f"Cached vector store {name} ({vs_id}) no longer exists")
+            return None
+        return vs_id if vector_store.name == name else None
+
+    def _find(self, client_sync: Any, name: str) -> str | None:
+        # Iterating the page fetches the following pages as needed
+        for vector_store in client_sync.vector_stores.list(limit=100):
+            if vector_store.name == name:
+                return vector_store.id
+        return None
+
+    def _remember(self, account: str, name: str, vs_id: str) -> None:
+        self._ids.setdefault(account, {})[name] = vs_id
+        stored = self._load()
+        if stored.get(account, {}).get(name) != vs_id:
+            stored.setdefault(account, {})[name] = vs_id
+            self._save(stored)
+
+    def _load(self) -> dict[str, dict[str, str]]:
+        if self._stored is None:
+            self._stored = {}
+            if self.persist and self.path.exists():
+                try:
+                    self._stored = json.loads(self.path.read_text())
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Ignoring unreadable vector store mapping {self.path}: {e}")
+        return self._stored
+
+    def _save(self, stored: dict[str, dict[str, str]]) -> None:
+        if not self.persist:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(stored, f, indent=2, sort_keys=True)
+            os.replace(tmp_name, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write vector store mapping {self.path}: {e}")
+
+
+_vector_store_cache = VectorStoreCache()
+
+
+def get_vector_store_cache() -> VectorStoreCache:
+    """Return the process-wide vector store cache."""
+    return _vector_store_cache
+
+
+def configure_vector_store_cache(*, path: str | Path | None = None, persist: bool = True) -> VectorStoreCache:
+    """
+    Replace the process-wide vector store cache.
+
+    Args:
+        path: JSON mapping file persisting resolved ids across processes.
+        persist: Set False to keep the mapping in memory only.
+    """
+    global _vector_store_cache
+    _vector_store_cache = VectorStoreCache(path=path, persist=persist)
+    return _vector_store_cache
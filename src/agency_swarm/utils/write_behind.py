@@ -0,0 +1,198 @@
+"""Background write-behind persistence for ``ThreadManager``.
+
+Save callbacks are user code (usually a database write) and used to run inline on
+every ``add_message``. ``WriteBehindWriter`` moves them onto a dedicated thread,
+coalescing bursts of adds into a single save so a slow callback no longer stalls
+the event loop.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriteBehindConfig:
+    """Tuning knobs for write-behind persistence.
+
+    Attributes:
+        debounce_seconds (float): How long the writer waits after the first unsaved message
+            before saving, so that bursts of adds are coalesced into one save.
+        max_pending (int): Upper bound on unsaved messages. When exceeded, the adding caller
+            saves inline (backpressure) instead of letting the backlog grow unbounded.
+        max_retry_delay_seconds (float): Cap for the exponential backoff between retries
+            after a failed save.
+        idle_seconds (float): How long the background thread waits for new messages once
+            everything is saved before it exits. The next added message starts a new one.
+    """
+
+    debounce_seconds: float = 0.05
+    max_pending: int = 1000
+    max_retry_delay_seconds: float = 5.0
+    idle_seconds: float = 1.0
+
+
+@dataclass
+class WriteBehindStats:
+    """Point-in-time metrics for a ``WriteBehindWriter``.
+
+    Attributes:
+        queue_depth (int): Messages added but not yet saved.
+        lag_seconds (float): Age of the oldest unsaved message (0 when nothing is pending).
+        saves (int): Successful save callback invocations.
+        failures (int): Failed save callback invocations.
+        coalesced (int): Messages that were saved as part of a batch instead of on their own.
+        inline_saves (int): Saves forced onto the caller because ``max_pending`` was exceeded.
+        last_save_seconds (float): Duration of the most recent save.
+    """
+
+    queue_depth: int = 0
+    lag_seconds: float = 0.0
+    saves: int = 0
+    failures: int = 0
+    coalesced: int = 0
+    inline_saves: int = 0
+    last_save_seconds: float = 0.0
+
+
+class WriteBehindWriter:
+    """Runs a save function on a background thread, debouncing and coalescing requests.
+
+    The save function takes no arguments and persists whatever is currently unsaved,
+    returning ``True`` on success. Saves never overlap: the background thread, inline
+    backpressure saves and explicit :meth:`flush` calls all serialize on one lock.
+    """
+
+    def __init__(self, save: Callable[[], bool], config: WriteBehindConfig | None = None, name: str = "thread"):
+        self._save = save
+        self.config = config or WriteBehindConfig()
+        self._name = name
+        self._cond = threading.Condition()
+        self._save_lock = threading.Lock()
+        self._pending = 0
+        self._oldest_pending_at: float | None = None
+        self._consecutive_failures = 0
+        self._closed = False
+        self._thread: threading.Thread | None = None
+        self._stats = WriteBehindStats()
+
+    def notify(self, count: int = 1) -> None:
+        """Record ``count`` newly added messages and schedule a save."""
+        if count <= 0:
+            return
+        with self._cond:
+            if self._closed:
+                save_inline = True
+            else:
+                self._pending += count
+                if self._oldest_pending_at is None:
+                    self._oldest_pending_at = time.monotonic()
+                save_inline = self._pending > self.config.max_pending
+                self._ensure_thread()
+                self._cond.notify()
+        if save_inline:
+            with self._cond:
+                self._stats.inline_saves += 1
+            self._flush_pending(force=True)
+
+    def flush(self) -> bool:
+        """Synchronously save everything pending. Returns ``True`` if nothing is left unsaved."""
+        return self._flush_pending(force=False)
+
+    def close(self) -> None:
+        """Stop the background thread after a final flush."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        self._flush_pending(force=False)
+
+    def stats(self) -> WriteBehindStats:
+        """Return a snapshot of the writer metrics."""
+        with self._cond:
+            lag = 0.0 if self._oldest_pending_at is None else time.monotonic() - self._oldest_pending_at
+            return WriteBehindStats(
+                queue_depth=self._pending,
+                lag_seconds=lag,
+                saves=self._stats.saves,
+                failures=self._stats.failures,
+                coalesced=self._stats.coalesced,
+                inline_saves=self._stats.inline_saves,
+                last_save_seconds=self._stats.last_save_seconds,
+            )
+
+    def _ensure_thread(self) -> None:
+        """Start the background thread on first use. Caller must hold ``_cond``."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, name=f"agency-swarm-write-behind-{self._name}", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                idle_until = time.monotonic() + self.config.idle_seconds
+                while not self._pending and not self._closed:
+                    remaining = idle_until - time.monotonic()
+                    if remaining <= 0:
+                        # Exit while idle so threads of discarded managers (e.g. per-request
+                        # agencies that are never closed) don't keep them alive.
+                        self._thread = None
+                        return
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+                delay = self.config.debounce_seconds
+                if self._consecutive_failures:
+                    delay = min(
+                        max(delay, 0.1) * 2**self._consecutive_failures,
+                        self.config.max_retry_delay_seconds,
+                    )
+                deadline = time.monotonic() + delay
+                while not self._closed and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+                if self._closed:
+                    return
+            self._flush_pending(force=False)
+
+    def _flush_pending(self, force: bool) -> bool:
+        with self._save_lock:
+            with self._cond:
+                batch = self._pending
+                oldest = self._oldest_pending_at
+                self._pending = 0
+                self._oldest_pending_at = None
+            if not batch and not force:
+                return True
+
+            started = time.monotonic()
+            try:
+                ok = bool(self._save())
+            except Exception as e:
+                logger.error(f"Write-behind save failed: {e}", exc_info=True)
+                ok = False
+            elapsed = time.monotonic() - started
+
+            with self._cond:
+                self._stats.last_save_seconds = elapsed
+                if ok:
+                    self._stats.saves += 1
+                    self._stats.coalesced += max(batch - 1, 0)
+                    self._consecutive_failures = 0
+                else:
+                    self._stats.failures += 1
+                    self._consecutive_failures += 1
+                    # Keep the batch pending so the writer retries it with backoff
+                    self._pending += batch
+                    if oldest is not None and (self._oldest_pending_at is None or oldest < self._oldest_pending_at):
+                        self._oldest_pending_at = oldest
+                    if self._pending and not self._closed:
+                        self._cond.notify()
+            return ok
@@ -1,6 +1,6 @@
 import time
 from typing import ClassVar, Literal
-from agency_swarm.tools import BaseTool
+from agency_swarm.tools import BaseTool, ToolCacheConfig
 from pydantic import Field
 import requests
 import json
@@ -37,6 +37,10 @@ class GeneralSearch(BaseTool):
         description="The base URL for the Chartmetric API."
     )
 
+    class ToolConfig:
+        # Read-only lookups: repeated calls are served from cache without the API call and rate-limit wait
+        cache = ToolCacheConfig(ttl=3600, should_cache=lambda output: '"error"' not in output[:50])
+
     last_call_time: ClassVar[float] = 0
     rate_limit_seconds: ClassVar[float] = 2
 
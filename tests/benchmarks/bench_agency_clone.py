@@ -0,0 +1,63 @@
+"""Microbenchmark for preparing a per-request agency in FastAPI.
+
+Compares calling an agency factory that builds agents and an Agency on every request
+with ``AgencyPool``, which builds once and hands out ``Agency.clone`` copies.
+No files folders or API calls are involved, so real factories save more.
+
+Run with: python tests/benchmarks/bench_agency_clone.py [agent_count]
+"""
+
+import sys
+import time
+
+from agents import function_tool
+
+from agency_swarm import Agency, Agent
+from agency_swarm.integrations.fastapi_utils.agency_pool import AgencyPool
+
+
+@function_tool
+def lookup(query: str) -> str:
+    """Look something up."""
+    return query
+
+
+def make_factory(agent_count: int):
+    def factory(load_threads_callback=None, **_):
+        agents = [
+            Agent(name=f"Agent{i}", instructions=f"Agent {i} instructions", tools=[lookup], model="gpt-4.1")
+            for i in range(agent_count)
+        ]
+        flows = [(agents[0], agent) for agent in agents[1:]]
+        return Agency(agents[0], communication_flows=flows, load_threads_callback=load_threads_callback)
+
+    return factory
+
+
+def best_of(fn, repeat: int = 20) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    agent_count = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    factory = make_factory(agent_count)
+    pool = AgencyPool(factory)
+    pool.agency  # noqa: B018 - warm up
+
+    per_request_factory = best_of(lambda: factory(load_threads_callback=lambda: []))
+    per_request_clone = best_of(lambda: pool(load_threads_callback=lambda: []))
+
+    print(f"{agent_count} agents")
+    print(f"  startup (factory, once):   {pool.stats.startup_seconds * 1000:8.3f} ms")
+    print(f"  per request, factory:      {per_request_factory * 1000:8.3f} ms")
+    speedup = per_request_factory / per_request_clone
+    print(f"  per request, pooled clone: {per_request_clone * 1000:8.3f} ms  ({speedup:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
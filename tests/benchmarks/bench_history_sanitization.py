@@ -0,0 +1,72 @@
+"""Microbenchmark for preparing a long thread for the runner.
+
+Compares the previous three-pass pipeline (sanitize tool calls, ensure content safety,
+strip agency metadata) with the fused ``MessageFormatter.clean_history_for_runner``,
+cold and with the per-message cache warmed by a previous turn.
+
+Run with: python tests/benchmarks/bench_history_sanitization.py [message_count]
+"""
+
+import sys
+import time
+
+from agency_swarm.messages import MessageFormatter
+from agency_swarm.utils.thread import ThreadManager
+
+
+def build_thread(count: int) -> ThreadManager:
+    manager = ThreadManager()
+    messages = []
+    for i in range(count):
+        if i % 4 == 3:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{"id": f"call_{i}", "function": {"name": "lookup", "arguments": "{}"}}],
+                }
+            )
+        else:
+            messages.append({"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i} " * 10})
+    for i, message in enumerate(messages):
+        message.update(agent="Agent", callerAgent=None, timestamp=i, agent_run_id="agent_run_x")
+    manager.add_messages(messages)
+    return manager
+
+
+def three_pass(history):
+    history = MessageFormatter.sanitize_tool_calls_in_history(history)
+    history = MessageFormatter.ensure_tool_calls_content_safety(history)
+    return MessageFormatter.strip_agency_metadata(history)
+
+
+def best_of(fn, repeat: int = 7) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    manager = build_thread(count)
+    history = manager.get_conversation_history("Agent")
+
+    assert three_pass(history) == MessageFormatter.clean_history_for_runner(history)
+
+    baseline = best_of(lambda: three_pass(history))
+    fused = best_of(lambda: MessageFormatter.clean_history_for_runner(history))
+    cache = manager.runner_item_cache
+    MessageFormatter.clean_history_for_runner(history, cache=cache)
+    warm = best_of(lambda: MessageFormatter.clean_history_for_runner(history, cache=cache))
+
+    print(f"{count} messages")
+    print(f"  three passes:        {baseline * 1000:8.2f} ms")
+    print(f"  fused, no cache:     {fused * 1000:8.2f} ms  ({baseline / fused:.1f}x)")
+    print(f"  fused, warm cache:   {warm * 1000:8.2f} ms  ({baseline / warm:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Microbenchmark for OpenAPI tool calls against a local stand-in HTTP server.
+
+Compares the previous behavior (a new ``httpx.AsyncClient`` per call, so a new TCP
+connection every time) with tools generated by ``ToolFactory.from_openapi_schema``,
+which reuse pooled keep-alive connections. The server runs in a background thread on
+127.0.0.1 and answers every request with a small JSON body. No TLS is involved, so real
+HTTPS APIs save more per call (the TLS handshake is skipped as well).
+
+Run with: python tests/benchmarks/bench_openapi_http_pool.py [calls] [concurrency]
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from agency_swarm.tools import ToolFactory, aclose_http_clients
+
+BODY = json.dumps({"id": 1, "name": "stand-in"}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are written separately
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def openapi_spec(port: int) -> dict:
+    return {
+        "openapi": "3.1.0",
+        "info": {"title": "Stand-in", "version": "1.0"},
+        "servers": [{"url": f"http://127.0.0.1:{port}"}],
+        "paths": {
+            "/items/{id}": {
+                "get": {
+                    "operationId": "getItem",
+                    "description": "Get an item",
+                    "parameters": [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}],
+                }
+            }
+        },
+    }
+
+
+async def per_call_client(url: str) -> None:
+    """The previous behavior of generated OpenAPI tools."""
+    async with httpx.AsyncClient(timeout=90) as client:
+        response = await client.request("GET", url, params={}, json=None, headers={})
+        response.json()
+
+
+async def measure(call, calls: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return calls / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    server = start_server()
+    port = server.server_address[1]
+    url = f"http://127.0.0.1:{port}/items/1"
+    tool = ToolFactory.from_openapi_schema(openapi_spec(port))[0]
+    tool_input = json.dumps({"parameters": {"id": "1"}})
+
+    print(f"{calls} GET calls to a local server")
+    for label, parallel in (("sequential", 1), (f"concurrency={concurrency}", concurrency)):
+        before = await measure(lambda: per_call_client(url), calls, parallel)
+        after = await measure(lambda: tool.on_invoke_tool(None, tool_input), calls, parallel)
+        speedup = after / before
+        print(f"  {label:<16} per-call client: {before:6.0f}/s  pooled: {after:6.0f}/s  ({speedup:.1f}x)")
+
+    await aclose_http_clients()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,48 @@
+"""Microbenchmark for building OpenAPI tools with and without the schema cache.
+
+Builds tools from every spec in tests/data/schemas, the way ``schemas_folder`` does on each
+agent construction, and reports the time of a cold build, a warm (in-memory) rebuild and a
+rebuild from the cache directory in a fresh cache (as a new process would).
+
+Run with: python tests/benchmarks/bench_openapi_schema_cache.py [rounds]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from agency_swarm.tools import ToolFactory, configure_schema_cache
+
+SCHEMAS = sorted((Path(__file__).parents[1] / "data" / "schemas").glob("*.json"))
+
+
+def build_all() -> float:
+    started = time.perf_counter()
+    for path in SCHEMAS:
+        ToolFactory.from_openapi_schema(path.read_text())
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as directory:
+        configure_schema_cache(enabled=False)
+        uncached = sum(build_all() for _ in range(rounds)) / rounds
+
+        configure_schema_cache(directory=directory)
+        cold = build_all()
+        warm = sum(build_all() for _ in range(rounds)) / rounds
+
+        configure_schema_cache(directory=directory)
+        from_disk = build_all()
+
+    print(f"Building tools from {len(SCHEMAS)} specs")
+    print(f"  no cache:    {uncached * 1000:8.2f} ms")
+    print(f"  cold cache:  {cold * 1000:8.2f} ms")
+    print(f"  from disk:   {from_disk * 1000:8.2f} ms")
+    print(f"  in memory:   {warm * 1000:8.2f} ms  ({uncached / warm:.0f}x faster than no cache)")
+
+
+if __name__ == "__main__":
+    main()
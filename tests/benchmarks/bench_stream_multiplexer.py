@@ -0,0 +1,107 @@
+"""Microbenchmark for merging a run stream with forwarded sub-agent events.
+
+Compares the previous consumer loop of ``run_stream_with_guardrails`` (a shared
+``asyncio.Queue(maxsize=10)`` polled with ``wait_for(..., timeout=0.25)`` plus a
+forwarder task re-queueing sub-agent events) with ``StreamMultiplexer``, where sub-agent
+events are put into the merged buffer directly.
+
+Reports delivered events, per-event overhead and time to first event. Sources here
+never block on I/O, so with an unbounded buffer the producer runs to completion before
+the consumer is scheduled; real model streams await the network between events.
+
+Run with: python tests/benchmarks/bench_stream_multiplexer.py [events_per_source]
+"""
+
+import asyncio
+import sys
+import time
+
+from agency_swarm.streaming import StreamingContext, StreamMultiplexer
+
+
+async def primary_events(count: int, context: StreamingContext):
+    """Primary run that delegates: every other event triggers a forwarded sub-agent event."""
+    for i in range(count):
+        yield i
+        await context.put_event(-i)
+
+
+async def polling_loop(count: int) -> tuple[int, float, float]:
+    started = time.perf_counter()
+    context = StreamingContext()
+    event_queue: asyncio.Queue = asyncio.Queue(maxsize=10)
+
+    async def worker():
+        async for ev in primary_events(count, context):
+            await event_queue.put(ev)
+        await event_queue.put(None)
+
+    async def forward():
+        while True:
+            sub_event = await context.get_event()
+            if sub_event is None:
+                break
+            await event_queue.put(sub_event)
+
+    worker_task = asyncio.create_task(worker())
+    forward_task = asyncio.create_task(forward())
+    received = 0
+    first = 0.0
+    while True:
+        if worker_task.done() and event_queue.empty():
+            break
+        try:
+            event = await asyncio.wait_for(event_queue.get(), timeout=0.25)
+        except TimeoutError:
+            continue
+        if event is None:
+            break
+        if not received:
+            first = time.perf_counter() - started
+        received += 1
+    forward_task.cancel()
+    return received, first, time.perf_counter() - started
+
+
+async def multiplexed(count: int, buffer_size: int) -> tuple[int, float, float]:
+    started = time.perf_counter()
+    mux = StreamMultiplexer(buffer_size)
+    context = StreamingContext(sink=mux.put)
+
+    async def worker():
+        async for ev in primary_events(count, context):
+            await mux.put(ev)
+
+    mux.add_producer(worker)
+    received = 0
+    first = 0.0
+    async for _event in mux.events():
+        if not received:
+            first = time.perf_counter() - started
+        received += 1
+    return received, first, time.perf_counter() - started
+
+
+def best_of(run, repeat: int = 5) -> tuple[int, float, float]:
+    results = [asyncio.run(run()) for _ in range(repeat)]
+    return results[0][0], min(r[1] for r in results), min(r[2] for r in results)
+
+
+def report(label: str, result: tuple[int, float, float]) -> None:
+    received, first, total = result
+    print(
+        f"  {label:<28} {received:7d} events  {total * 1000:8.2f} ms  {total / received * 1e6:6.2f} us/event  "
+        f"first event {first * 1e6:8.1f} us"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{count} primary + {count} forwarded events")
+    report("polling loop (maxsize=10)", best_of(lambda: polling_loop(count)))
+    for buffer_size in (10, 64, 0):
+        report(f"multiplexer (buffer={buffer_size})", best_of(lambda size=buffer_size: multiplexed(count, size)))
+
+
+if __name__ == "__main__":
+    main()
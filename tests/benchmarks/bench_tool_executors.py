@@ -0,0 +1,118 @@
+"""Microbenchmark for the execution backends of synchronous ``BaseTool.run``.
+
+1. CPU-bound: parallel calls of a pure-Python tool through the default executor
+   (``asyncio.to_thread``), a dedicated thread pool and the process pool. Threads
+   contend on the GIL; processes scale with the number of CPUs. Process startup is
+   reported separately.
+2. Starvation: slow blocking I/O calls flood the shared default executor while a fast
+   tool is called. With the I/O tool on a dedicated pool the fast tool is not delayed.
+
+Run with: python tests/benchmarks/bench_tool_executors.py [cpu_calls]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from agency_swarm import BaseTool
+from agency_swarm.tools import ToolFactory, get_tool_executor_stats, register_tool_executor
+
+CPU_WORK = 2_000_000
+IO_SECONDS = 0.2
+
+
+class CpuTool(BaseTool):
+    """Pure-Python number crunching."""
+
+    def run(self):
+        return sum(i * i for i in range(CPU_WORK))
+
+
+class CpuThreadPoolTool(CpuTool):
+    """Pure-Python number crunching on a dedicated thread pool."""
+
+    class ToolConfig:
+        executor = "cpu-threads"
+
+
+class CpuProcessTool(CpuTool):
+    """Pure-Python number crunching in worker processes."""
+
+    class ToolConfig:
+        executor = "process"
+
+
+class SlowIOTool(BaseTool):
+    """Blocking I/O on the shared default executor."""
+
+    def run(self):
+        time.sleep(IO_SECONDS)
+        return "io"
+
+
+class DedicatedSlowIOTool(SlowIOTool):
+    """Blocking I/O on its own bounded pool."""
+
+    class ToolConfig:
+        executor = "slow-io"
+
+
+class FastTool(BaseTool):
+    """Returns immediately."""
+
+    def run(self):
+        return "fast"
+
+
+async def run_parallel(tool_class: type[BaseTool], calls: int) -> float:
+    tool = ToolFactory.adapt_base_tool(tool_class)
+    started = time.perf_counter()
+    await asyncio.gather(*(tool.on_invoke_tool(None, "{}") for _ in range(calls)))
+    return time.perf_counter() - started
+
+
+async def fast_latency_under_io_flood(io_tool_class: type[BaseTool], io_calls: int) -> float:
+    io_tool = ToolFactory.adapt_base_tool(io_tool_class)
+    fast_tool = ToolFactory.adapt_base_tool(FastTool)
+    flood = [asyncio.create_task(io_tool.on_invoke_tool(None, "{}")) for _ in range(io_calls)]
+    await asyncio.sleep(0.01)
+    started = time.perf_counter()
+    await fast_tool.on_invoke_tool(None, "{}")
+    latency = time.perf_counter() - started
+    await asyncio.gather(*flood)
+    return latency
+
+
+async def main() -> None:
+    cpus = os.cpu_count() or 1
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else max(cpus, 4)
+    register_tool_executor("cpu-threads", max_workers=calls)
+    register_tool_executor("process", kind="process", max_workers=min(calls, cpus))
+    register_tool_executor("slow-io", max_workers=8)
+
+    print(f"CPU-bound: {calls} parallel calls, {cpus} CPUs")
+    print(f"  default (to_thread)    {await run_parallel(CpuTool, calls):7.3f} s")
+    print(f"  dedicated thread pool  {await run_parallel(CpuThreadPoolTool, calls):7.3f} s")
+    startup = await run_parallel(CpuProcessTool, calls)
+    warm = await run_parallel(CpuProcessTool, calls)
+    print(f"  process pool           {warm:7.3f} s  (first run incl. worker startup {startup:.3f} s)")
+
+    default_workers = min(32, cpus + 4)
+    io_calls = default_workers * 2
+    print(f"\nStarvation: {io_calls} blocking {IO_SECONDS}s I/O calls, then one fast call")
+    shared = await fast_latency_under_io_flood(SlowIOTool, io_calls)
+    print(f"  I/O on default executor ({default_workers} workers): fast call took {shared * 1000:8.2f} ms")
+    dedicated = await fast_latency_under_io_flood(DedicatedSlowIOTool, io_calls)
+    print(f"  I/O on dedicated pool (8 workers):        fast call took {dedicated * 1000:8.2f} ms")
+
+    print("\nExecutor stats")
+    for name, stats in get_tool_executor_stats().items():
+        print(
+            f"  {name:<12} {stats.kind:<8} workers={stats.max_workers:<3} calls={stats.completed:<4} "
+            f"peak_in_flight={stats.peak_in_flight:<4} saturated={stats.saturated:<4} avg={stats.average_seconds:.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
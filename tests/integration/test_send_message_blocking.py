@@ -1,6 +1,6 @@
 """
-Integration test for SendMessage concurrent blocking behavior.
-Tests both same-agent (blocking) and different-agent (no blocking) scenarios.
+Integration test for SendMessage concurrent delivery.
+Tests both same-agent (queued in order) and different-agent (no blocking) scenarios.
 """
 
 import pytest
@@ -13,7 +13,7 @@ from agency_swarm import Agency, Agent
 async def test_concurrent_messages_to_same_agent():
     """
     Test sending 2 messages to the SAME subagent.
-    This should trigger blocking due to per-recipient blocking mechanism.
+    The second message waits for the first one in the recipient's queue instead of failing.
     """
     messages = []
 
@@ -50,15 +50,11 @@ async def test_concurrent_messages_to_same_agent():
     # Execute the test
     await agency.get_response("Test concurrent calls to same agent")
 
-    # Check for blocking error in messages
-    blocking_error_found = any(
-        "Cannot send another message to 'Worker' while the previous message is still being processed"
-        in str(msg.get("output", ""))
-        for msg in messages
-        if msg.get("type") == "function_call_output"
-    )
+    outputs = [str(msg.get("output", "")) for msg in messages if msg.get("type") == "function_call_output"]
+    blocking_error_found = any("Cannot send another message" in output for output in outputs)
 
-    assert blocking_error_found, "Expected blocking error when sending concurrent messages to same agent"
+    assert not blocking_error_found, "Concurrent messages to the same agent should be queued, not rejected"
+    assert sum("Received:" in output for output in outputs) >= 2, "Worker should have answered both messages"
 
 
 @pytest.mark.asyncio
@@ -22,7 +22,7 @@ class TestToolConcurrencyEndToEnd:
 
     @pytest.mark.asyncio
     async def test_agent_enforces_tool_concurrency(self):
-        """Test that agent properly enforces one_call_at_a_time using structured output."""
+        """Test that parallel calls around a one_call_at_a_time tool are queued, not rejected."""
 
         class SequentialTool(BaseTool):
             """A tool that must run sequentially and takes time."""
@@ -77,21 +77,14 @@ class TestToolConcurrencyEndToEnd:
         output = response.final_output
         assert isinstance(output, self.ToolExecutionReport)
 
-        # Check if concurrency violation was properly detected
-        # One tool should succeed, the other should report a concurrency violation
+        # Parallel calls are queued by the agent's scheduler instead of being rejected
         errors = output.errors_encountered
-
-        # Should have at least one concurrency violation error
         concurrency_errors = [err for err in errors if "concurrency violation" in err.lower()]
-        assert len(concurrency_errors) > 0, f"Expected concurrency violation, but got errors: {errors}"
-
-        # At least one tool should have completed successfully
-        successful_results = [
-            result
-            for result in [output.sequential_tool_result, output.parallel_tool_result]
-            if result and "completed" in result.lower() and "error" not in result.lower()
-        ]
-        assert len(successful_results) > 0, "At least one tool should have completed successfully"
+        assert not concurrency_errors, f"Expected queued execution, but got errors: {errors}"
+
+        # Both tools should have completed successfully
+        assert "completed" in output.sequential_tool_result.lower()
+        assert "test_parallel" in output.parallel_tool_result
 
 
 class TestFunctionToolConcurrency:
@@ -56,3 +56,84 @@ def test_run_fastapi_preserves_custom_tool_mappings(mocker):
     assert new_agency._communication_tool_classes.get(pair) is CustomSendMessage, (
         "Custom tool mapping was not preserved"
     )
+
+
+def test_clone_shares_agents_but_not_threads():
+    sender = Agent(name="A", instructions="test", model="gpt-4.1")
+    recipient = Agent(name="B", instructions="test", model="gpt-4.1")
+    agency = Agency(sender, communication_flows=[(sender, recipient)], user_context={"nested": {"k": 1}})
+    agency.thread_manager.add_message({"role": "user", "content": "template", "agent": "A", "callerAgent": None})
+
+    history = [{"role": "user", "content": "restored", "agent": "A", "callerAgent": None}]
+    clone = agency.clone(load_threads_callback=lambda: history)
+
+    assert clone.agents is agency.agents
+    assert clone.thread_manager is not agency.thread_manager
+    assert [m["content"] for m in clone.thread_manager.get_all_messages()] == ["restored"]
+    assert [m["content"] for m in agency.thread_manager.get_all_messages()] == ["template"]
+    context = clone._get_agent_context("A")
+    assert context.agency_instance is clone and context.thread_manager is clone.thread_manager
+    assert context.subagents == {"B": recipient}
+    clone.user_context["nested"]["k"] = 2
+    assert agency.user_context["nested"]["k"] == 1
+
+
+def test_pooled_fastapi_builds_agency_once(mocker):
+    from fastapi.testclient import TestClient
+
+    from agency_swarm.integrations.fastapi import run_fastapi
+
+    builds = []
+
+    def factory(load_threads_callback=None, **_):
+        agent = Agent(name="PoolAgent", instructions="test", model="gpt-4.1")
+        builds.append(agent)
+        return Agency(agent, name="pool", load_threads_callback=load_threads_callback)
+
+    async def fake_get_response(self, message, **kwargs):
+        self.thread_manager.add_message({"role": "user", "content": message, "agent": "PoolAgent", "callerAgent": None})
+        return mocker.Mock(final_output=f"seen {len(self.thread_manager.get_all_messages())}")
+
+    mocker.patch.object(Agency, "get_response", fake_get_response)
+    app = run_fastapi(agencies={"pool": factory}, return_app=True, pooled=True)
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.post("/pool/get_response", json={"message": "hi", "chat_history": []})
+        assert response.json()["response"] == "seen 1"
+
+    assert len(builds) == 1
+    stats = client.get("/pool/get_pool_stats").json()
+    assert stats["requests"] == 3
+    assert stats["startup_seconds"] > 0 and stats["average_request_seconds"] > 0
+
+
+def test_pooled_fastapi_keeps_thread_store(mocker, tmp_path):
+    from fastapi.testclient import TestClient
+
+    from agency_swarm import SQLiteThreadStore
+    from agency_swarm.integrations.fastapi import run_fastapi
+
+    store = SQLiteThreadStore(tmp_path / "threads.db", thread_id="chat")
+
+    def factory(**_):
+        return Agency(Agent(name="StoreAgent", instructions="test", model="gpt-4.1"), name="store", thread_store=store)
+
+    async def fake_get_response(self, message, **kwargs):
+        history = self.thread_manager.get_conversation_history("StoreAgent", None)
+        self.thread_manager.add_message(
+            {"role": "user", "content": message, "agent": "StoreAgent", "callerAgent": None}
+        )
+        return mocker.Mock(final_output=f"history {[m['content'] for m in history]}")
+
+    mocker.patch.object(Agency, "get_response", fake_get_response)
+    client = TestClient(run_fastapi(agencies={"store": factory}, return_app=True, pooled=True))
+
+    responses = [
+        client.post("/store/get_response", json={"message": text, "chat_history": []}).json()["response"]
+        for text in ("first", "second")
+    ]
+
+    # Each pooled copy persists through the store and lazily loads what earlier requests saved
+    assert responses == ["history []", "history ['first']"]
+    assert [m["content"] for m in store.load_messages()] == ["first", "second"]
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, PropertyMock, patch
+
+import pytest
+from agents import FileSearchTool
+from fastapi.testclient import TestClient
+
+from agency_swarm import Agency, Agent, run_fastapi
+from agency_swarm.agent.file_manager import AgentFileManager
+
+
+@pytest.fixture
+def mock_client_sync():
+    client = MagicMock()
+    client.vector_stores.create.return_value = MagicMock(id="vs_test")
+    with patch.object(Agent, "client_sync", new_callable=PropertyMock) as client_sync:
+        client_sync.return_value = client
+        yield client
+
+
+def _agents(tmp_path, count: int = 3) -> list[Agent]:
+    agents = []
+    for i in range(count):
+        folder = tmp_path / f"files_{i}"
+        folder.mkdir()
+        (folder / "notes.txt").write_text(f"notes {i}")
+        agents.append(Agent(name=f"Agent{i}", instructions="Work", files_folder=str(folder), defer_file_setup=True))
+    return agents
+
+
+def test_deferred_construction_makes_no_calls_and_prepares_concurrently(tmp_path, mock_client_sync):
+    """Tests that construction skips file I/O and Agency.prepare sets up all agents at once."""
+    agents = _agents(tmp_path)
+    agency = Agency(agents[0], communication_flows=[(agents[0], agents[1]), (agents[0], agents[2])])
+
+    assert mock_client_sync.method_calls == []
+    assert not agency.is_ready and not any(isinstance(t, FileSearchTool) for t in agents[0].tools)
+
+    barrier = threading.Barrier(len(agents), timeout=5)
+    original = AgentFileManager._parse_files_folder_for_vs_id
+
+    def parse_together(self):
+        barrier.wait()  # Raises BrokenBarrierError unless all agents are set up concurrently
+        original(self)
+
+    with patch.object(AgentFileManager, "_parse_files_folder_for_vs_id", parse_together):
+        asyncio.run(agency.prepare())
+        asyncio.run(agency.prepare())
+
+    assert agency.is_ready
+    assert mock_client_sync.vector_stores.create.call_count == len(agents)
+    assert all(any(isinstance(t, FileSearchTool) for t in agent.tools) for agent in agents)
+
+
+def test_deferred_setup_runs_on_first_use(tmp_path, mock_client_sync):
+    """Tests lazy setup when a deferred agent is used without prepare()."""
+    (agent,) = _agents(tmp_path, count=1)
+    extra = tmp_path / "extra.txt"
+    extra.write_text("extra")
+    mock_client_sync.files.create.return_value = MagicMock(id="file-extra")
+
+    assert agent.upload_file(str(extra)) == "file-extra"
+    assert agent.is_prepared and agent._associated_vector_store_id == "vs_test"
+
+
+def test_ready_endpoint_reports_warm_up(tmp_path, mock_client_sync):
+    """Tests that GET /ready answers 503 while agencies warm up and 200 afterwards."""
+    release = threading.Event()
+    original = AgentFileManager._parse_files_folder_for_vs_id
+
+    def slow_parse(self):
+        release.wait(timeout=5)
+        original(self)
+
+    agents = _agents(tmp_path, count=2)
+    app = run_fastapi(agencies={"agency": lambda **kwargs: Agency(*agents, **kwargs)}, return_app=True, pooled=True)
+
+    with patch.object(AgentFileManager, "_parse_files_folder_for_vs_id", slow_parse), TestClient(app) as client:
+        pending = client.get("/ready")
+        assert pending.status_code == 503 and pending.json() == {"ready": False, "pending": ["agency"]}
+
+        release.set()
+        deadline = time.monotonic() + 5
+        while (response := client.get("/ready")).status_code != 200 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert response.json() == {"ready": True, "pending": []}
+
+
+def test_ready_endpoint_is_only_exposed_in_pooled_mode(tmp_path, mock_client_sync):
+    """Tests that non-pooled servers, whose requests build new agents, neither warm up nor expose /ready."""
+    agents = _agents(tmp_path, count=1)
+    app = run_fastapi(agencies={"agency": lambda **kwargs: Agency(*agents, **kwargs)}, return_app=True)
+
+    with TestClient(app) as client:
+        assert client.get("/ready").status_code == 404
+
+    assert not agents[0].is_prepared
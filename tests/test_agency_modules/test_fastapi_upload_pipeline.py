@@ -0,0 +1,96 @@
+"""Tests for the FastAPI file_urls upload pipeline against a local file server."""
+
+import asyncio
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import pytest
+
+from agency_swarm.integrations.fastapi_utils.file_handler import FileTooLargeError, FileUploadPipeline
+from agency_swarm.tools.http_pool import aclose_http_clients
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def file_server(tmp_path):
+    """Serve tmp_path over HTTP; SimpleHTTPRequestHandler answers If-Modified-Since with 304."""
+    (tmp_path / "report.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "mirror").mkdir()
+    (tmp_path / "mirror" / "report.csv").write_text("a,b\n1,2\n")
+    (tmp_path / "image").write_bytes(PNG)
+    (tmp_path / "large.txt").write_bytes(b"x" * 2048)
+    for i in range(5):
+        (tmp_path / f"file_{i}.txt").write_text(f"file {i}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(tmp_path)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class FakeOpenAI:
+    """Records uploads; the first status check finds the file still being processed."""
+
+    def __init__(self, upload_delay: float = 0.0):
+        self.uploads: list[tuple[str, bytes]] = []
+        self.status_checks = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.upload_delay = upload_delay
+        self.files = SimpleNamespace(create=self.create, retrieve=self.retrieve)
+
+    async def create(self, file, purpose):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.upload_delay)
+        self.in_flight -= 1
+        filename, content = file
+        self.uploads.append((filename, content.read()))
+        return SimpleNamespace(id=f"file-{len(self.uploads)}", filename=filename, bytes=0, purpose=purpose)
+
+    async def retrieve(self, file_id):
+        self.status_checks += 1
+        return SimpleNamespace(id=file_id, status="uploaded" if self.status_checks == 1 else "processed")
+
+
+@pytest.mark.asyncio
+async def test_repeated_urls_and_content_skip_upload(file_server):
+    """Tests streaming upload, revalidation of an unchanged URL and reuse of identical content."""
+    client = FakeOpenAI()
+    pipeline = FileUploadPipeline(client)
+
+    first = await pipeline.upload_from_urls({"report": f"{file_server}/report.csv", "picture": f"{file_server}/image"})
+    again = await pipeline.upload_from_urls({"report": f"{file_server}/report.csv"})
+    mirror = await pipeline.upload_from_urls({"report.csv": f"{file_server}/mirror/report.csv"})
+    await aclose_http_clients()
+
+    assert sorted(client.uploads) == [("picture.png", PNG), ("report.csv", b"a,b\n1,2\n")]
+    assert again["report"] == mirror["report.csv"] == first["report"]
+    stats = pipeline.get_stats()
+    assert (stats.uploads, stats.url_cache_hits, stats.content_cache_hits) == (2, 1, 1)
+    assert stats.downloads == 3
+
+
+@pytest.mark.asyncio
+async def test_size_limit_and_bounded_concurrency(file_server):
+    """Tests the max_file_size guard and that at most max_concurrency files are transferred at once."""
+    client = FakeOpenAI(upload_delay=0.02)
+    pipeline = FileUploadPipeline(client, max_concurrency=2, max_file_size=1024)
+
+    with pytest.raises(FileTooLargeError):
+        await pipeline.upload_from_url("large.txt", f"{file_server}/large.txt")
+    file_ids = await pipeline.upload_from_urls({f"file_{i}.txt": f"{file_server}/file_{i}.txt" for i in range(5)})
+    await aclose_http_clients()
+
+    assert len(set(file_ids.values())) == 5
+    assert client.max_in_flight == 2
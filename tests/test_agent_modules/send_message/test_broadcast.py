@@ -0,0 +1,189 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel, Field
+
+from agency_swarm import Agency, Agent
+from agency_swarm.tools import SendMessage, SendMessageBroadcast
+
+
+class SlowAgent:
+    """Recipient stub answering after a delay, in both response modes."""
+
+    def __init__(self, name: str, log: list, delay: float = 0.05):
+        self.name = name
+        self.description = f"{name} specialist"
+        self.throw_input_guardrail_error = True
+        self.log = log
+        self.delay = delay
+
+    async def get_response(self, message, sender_name, additional_instructions, agency_context, parent_run_id):
+        self.log.append(("start", self.name))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.name))
+        return SimpleNamespace(final_output=f"{self.name}: {message}")
+
+    async def get_response_stream(self, message, sender_name, additional_instructions, agency_context, parent_run_id):
+        await asyncio.sleep(self.delay)
+        content = [SimpleNamespace(text=f"{self.name}: {message}")]
+        item = SimpleNamespace(type="message_output_item", raw_item=SimpleNamespace(content=content))
+        yield SimpleNamespace(type="run_item_stream_event", item=item)
+
+
+def _wrapper(streaming_context=None) -> SimpleNamespace:
+    context = SimpleNamespace(
+        agents={},
+        user_context=None,
+        thread_manager=type("ThreadManagerStub", (), {})(),
+        shared_instructions=None,
+        _is_streaming=streaming_context is not None,
+        _streaming_context=streaming_context,
+    )
+    return SimpleNamespace(context=context, tool_call_id="call_broadcast")
+
+
+def _args(recipients: list[dict], message: str = "What do you think?") -> str:
+    return json.dumps(
+        {
+            "recipients": recipients,
+            "my_primary_instructions": "Collect opinions.",
+            "message": message,
+            "additional_instructions": "",
+        }
+    )
+
+
+def _broadcast(log: list, names=("Analyst", "Designer", "Engineer"), **kwargs) -> SendMessageBroadcast:
+    recipients = {name: SlowAgent(name, log) for name in names}
+    return SendMessageBroadcast(SimpleNamespace(name="Lead"), recipients=recipients, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_runs_recipients_concurrently_and_aggregates():
+    """Tests concurrent delivery, per-recipient messages and the aggregated result."""
+    log: list = []
+    tool = _broadcast(log)
+    recipients = [
+        {"recipient_agent": "Analyst", "message": ""},
+        {"recipient_agent": "Designer", "message": "Sketch it"},
+        {"recipient_agent": "Engineer", "message": ""},
+    ]
+
+    result = json.loads(await tool.on_invoke_tool(_wrapper(), _args(recipients)))
+
+    assert [r["response"] for r in result["responses"]] == [
+        "Analyst: What do you think?",
+        "Designer: Sketch it",
+        "Engineer: What do you think?",
+    ]
+    assert result["succeeded"] == 3 and result["failed"] == 0
+    assert all(r["status"] == "ok" and r["latency_seconds"] >= 0.04 for r in result["responses"])
+    assert [event for event, _ in log[:3]] == ["start", "start", "start"]
+    assert result["total_seconds"] >= max(r["latency_seconds"] for r in result["responses"])
+
+
+class EchoAgent(SlowAgent):
+    """Recipient stub replying with the message itself."""
+
+    async def get_response(self, message, sender_name, additional_instructions, agency_context, parent_run_id):
+        return SimpleNamespace(final_output=message)
+
+
+class FailingAgent(SlowAgent):
+    """Recipient stub whose run raises."""
+
+    async def get_response(self, message, sender_name, additional_instructions, agency_context, parent_run_id):
+        raise RuntimeError("model unavailable")
+
+
+@pytest.mark.asyncio
+async def test_broadcast_status_reflects_delivery_not_reply_text():
+    """Tests that a reply starting with "Error" counts as answered and a raised run as failed."""
+    recipients = {"Explainer": EchoAgent("Explainer", []), "Broken": FailingAgent("Broken", [])}
+    tool = SendMessageBroadcast(SimpleNamespace(name="Lead"), recipients=recipients)
+    targets = [
+        {"recipient_agent": "Explainer", "message": "Error 404 means the page was not found."},
+        {"recipient_agent": "Broken", "message": "Anything?"},
+    ]
+
+    result = json.loads(await tool.on_invoke_tool(_wrapper(), _args(targets)))
+
+    explained, broken = result["responses"]
+    assert explained == {**explained, "status": "ok", "response": "Error 404 means the page was not found."}
+    assert broken["status"] == "error" and "model unavailable" in broken["response"]
+    assert result["succeeded"] == 1 and result["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_broadcast_concurrency_limit_and_validation():
+    """Tests max_concurrency and that unknown recipients are rejected before anything is sent."""
+    log: list = []
+    tool = _broadcast(log, names=("Analyst", "Designer"), max_concurrency=1)
+    recipients = [{"recipient_agent": "analyst", "message": ""}, {"recipient_agent": "Designer", "message": ""}]
+
+    result = json.loads(await tool.on_invoke_tool(_wrapper(), _args(recipients)))
+    assert result["succeeded"] == 2
+    assert log == [("start", "Analyst"), ("end", "Analyst"), ("start", "Designer"), ("end", "Designer")]
+
+    log.clear()
+    unknown = await tool.on_invoke_tool(_wrapper(), _args([{"recipient_agent": "Nobody", "message": ""}]))
+    assert unknown.startswith("Error: Unknown recipient agent 'Nobody'")
+    missing = await tool.on_invoke_tool(_wrapper(), _args([{"recipient_agent": "Analyst", "message": ""}], ""))
+    assert missing.startswith("Error: Missing message for recipient 'Analyst'")
+    assert log == []
+
+
+@pytest.mark.asyncio
+async def test_broadcast_streams_sub_agent_events():
+    """Tests that streamed sub-agent events of every recipient reach the streaming context."""
+    events = []
+
+    async def sink(event):
+        events.append(event)
+
+    tool = _broadcast([], names=("Analyst", "Designer"))
+    recipients = [{"recipient_agent": "Analyst", "message": ""}, {"recipient_agent": "Designer", "message": ""}]
+
+    result = json.loads(await tool.on_invoke_tool(_wrapper(SimpleNamespace(put_event=sink)), _args(recipients)))
+
+    assert {event.agent for event in events} == {"Analyst", "Designer"}
+    assert all(event.parent_run_id == "call_broadcast" for event in events)
+    assert [r["response"] for r in result["responses"]] == [
+        "Analyst: What do you think?",
+        "Designer: What do you think?",
+    ]
+
+
+def test_broadcast_schema_and_flow_registration():
+    """Tests the recipients schema (with ExtraParams) and registration next to a plain send_message tool."""
+
+    class PrioritizedBroadcast(SendMessageBroadcast):
+        class ExtraParams(BaseModel):
+            priority: str = Field(description="Priority of the request")
+
+    lead = Agent(name="Lead", instructions="Coordinate")
+    analyst = Agent(name="Analyst", instructions="Analyze")
+    designer = Agent(name="Designer", instructions="Design")
+    writer = Agent(name="Writer", instructions="Write")
+    Agency(
+        lead,
+        communication_flows=[
+            (lead > analyst, PrioritizedBroadcast),
+            (lead > designer, PrioritizedBroadcast),
+            lead > writer,
+        ],
+    )
+
+    broadcast = next(t for t in lead.tools if isinstance(t, PrioritizedBroadcast))
+    plain = next(t for t in lead.tools if type(t) is SendMessage)
+    schema = broadcast.params_json_schema
+    assert broadcast.name == "send_message_broadcast"
+    assert schema["properties"]["recipients"]["items"]["properties"]["recipient_agent"]["enum"] == [
+        "Analyst",
+        "Designer",
+    ]
+    assert "recipient_agent" not in schema["properties"] and "priority" in schema["required"]
+    assert "recipients" in schema["required"]
+    assert plain.params_json_schema["properties"]["recipient_agent"]["enum"] == ["Writer"]
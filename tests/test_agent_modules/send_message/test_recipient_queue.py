@@ -0,0 +1,115 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agency_swarm.tools.send_message import SendMessage
+
+
+class SlowAgent:
+    """Recipient stub recording when each message is being answered."""
+
+    def __init__(self, name: str, log: list, delay: float = 0.02):
+        self.name = name
+        self.description = ""
+        self.throw_input_guardrail_error = True
+        self.log = log
+        self.delay = delay
+
+    async def get_response(self, message, sender_name, additional_instructions, agency_context, parent_run_id):
+        self.log.append(("start", self.name, message))
+        await asyncio.sleep(self.delay)
+        self.log.append(("end", self.name, message))
+        return SimpleNamespace(final_output=f"{self.name} answered {message} for {parent_run_id}")
+
+
+def _wrapper(call_id: str, thread_manager: object) -> SimpleNamespace:
+    context = SimpleNamespace(
+        agents={},
+        user_context=None,
+        thread_manager=thread_manager,
+        shared_instructions=None,
+        _is_streaming=False,
+        _streaming_context=None,
+    )
+    return SimpleNamespace(context=context, tool_call_id=call_id)
+
+
+def _args(recipient: str, message: str) -> str:
+    return json.dumps(
+        {
+            "recipient_agent": recipient,
+            "my_primary_instructions": "instructions",
+            "message": message,
+            "additional_instructions": "",
+        }
+    )
+
+
+def _tool(*recipients, **kwargs) -> SendMessage:
+    return SendMessage(SimpleNamespace(name="Sender"), recipients={agent.name: agent for agent in recipients}, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_same_recipient_is_queued_in_order_while_others_run_in_parallel():
+    """Tests FIFO delivery per recipient, parallel recipients and results matching their call ids."""
+    log: list = []
+    worker, analyst = SlowAgent("Worker", log), SlowAgent("Analyst", log)
+    tool = _tool(worker, analyst)
+    thread_manager = type("ThreadManagerStub", (), {})()
+
+    results = await asyncio.gather(
+        tool.on_invoke_tool(_wrapper("call_1", thread_manager), _args("Worker", "first")),
+        tool.on_invoke_tool(_wrapper("call_2", thread_manager), _args("Worker", "second")),
+        tool.on_invoke_tool(_wrapper("call_3", thread_manager), _args("Analyst", "third")),
+    )
+
+    assert results == [
+        "Worker answered first for call_1",
+        "Worker answered second for call_2",
+        "Analyst answered third for call_3",
+    ]
+    worker_events = [(event, message) for event, name, message in log if name == "Worker"]
+    assert worker_events == [("start", "first"), ("end", "first"), ("start", "second"), ("end", "second")]
+    assert log.index(("start", "Analyst", "third")) < log.index(("end", "Worker", "first"))
+
+    stats = tool.get_queue_stats()
+    assert stats["Worker"].calls == 2 and stats["Worker"].max_wait_seconds >= 0.015
+    assert stats["Worker"].active == 0 and stats["Worker"].waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_size_and_timeout_limits():
+    """Tests rejection when the recipient's queue is full and the error after queue_timeout."""
+    thread_manager = type("ThreadManagerStub", (), {})()
+    bounded = _tool(SlowAgent("Worker", [], delay=0.05), max_queue_size=1)
+    results = await asyncio.gather(
+        *(bounded.on_invoke_tool(_wrapper(f"call_{i}", thread_manager), _args("Worker", str(i))) for i in range(3))
+    )
+    assert results[0].startswith("Worker answered") and results[1].startswith("Worker answered")
+    assert results[2].startswith("Error: Cannot send another message to 'Worker'")
+
+    impatient = _tool(SlowAgent("Worker", [], delay=0.05), queue_timeout=0.01)
+    first, second = await asyncio.gather(
+        impatient.on_invoke_tool(_wrapper("call_a", thread_manager), _args("Worker", "a")),
+        impatient.on_invoke_tool(_wrapper("call_b", thread_manager), _args("Worker", "b")),
+    )
+    assert first.startswith("Worker answered")
+    assert second.startswith("Error: Message to 'Worker' was not delivered within 0.01 seconds")
+    assert impatient.get_queue_stats()["Worker"].timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_separate_conversations_do_not_wait_on_each_other():
+    """Tests that queues are per conversation thread, e.g. for pooled agency clones."""
+    log: list = []
+    tool = _tool(SlowAgent("Worker", log))
+    first_thread, second_thread = (type("ThreadManagerStub", (), {})() for _ in range(2))
+
+    await asyncio.gather(
+        tool.on_invoke_tool(_wrapper("call_1", first_thread), _args("Worker", "one")),
+        tool.on_invoke_tool(_wrapper("call_2", second_thread), _args("Worker", "two")),
+    )
+
+    assert [event for event, _, _ in log] == ["start", "start", "end", "end"]
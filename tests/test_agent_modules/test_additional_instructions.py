@@ -2,8 +2,8 @@
 Test the additional_instructions parameter functionality for Agent and Agency.
 
 This module tests the core additional_instructions feature to ensure:
-1. Instructions are temporarily modified during execution
-2. Original instructions are properly restored after execution
+1. Additional instructions are part of the system prompt during execution
+2. The shared agent's instructions are never modified
 3. The parameter is correctly passed through Agency to Agent
 4. Both get_response and get_response_stream handle additional_instructions
 """
@@ -11,7 +11,7 @@ This module tests the core additional_instructions feature to ensure:
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from agents import RunResult
+from agents import RunContextWrapper, RunResult
 
 from agency_swarm import Agency, Agent
 
@@ -39,15 +39,16 @@ def mock_run_result():
 
 @pytest.mark.asyncio
 async def test_agent_get_response_modifies_instructions_temporarily(sample_agent, mock_run_result):
-    """Test that Agent.get_response temporarily modifies instructions with additional_instructions."""
+    """Test that Agent.get_response adds additional_instructions to the system prompt of the run only."""
     original_instructions = sample_agent.instructions
     additional_text = "Additional test instructions"
 
-    # Track instruction changes during execution
+    # Track the effective system prompt during execution
     instruction_history = []
 
     async def mock_runner_run(*args, **kwargs):
-        instruction_history.append(sample_agent.instructions)
+        assert sample_agent.instructions == original_instructions
+        instruction_history.append(await sample_agent.get_system_prompt(RunContextWrapper(kwargs["context"])))
         return mock_run_result
 
     with patch("agents.Runner.run", side_effect=mock_runner_run):
@@ -81,21 +82,27 @@ async def test_agent_get_response_restores_instructions_on_error(sample_agent):
 
 @pytest.mark.asyncio
 async def test_agent_get_response_stream_modifies_instructions_temporarily(sample_agent):
-    """Test that Agent.get_response_stream temporarily modifies instructions with additional_instructions."""
+    """Test that Agent.get_response_stream adds additional_instructions to the system prompt of the run only."""
     original_instructions = sample_agent.instructions
     additional_text = "Additional streaming instructions"
 
-    # Track instruction changes during execution
+    # Track the effective system prompt during execution
     instruction_history = []
+    run_kwargs = {}
 
     async def mock_stream_events():
-        instruction_history.append(sample_agent.instructions)
+        assert sample_agent.instructions == original_instructions
+        instruction_history.append(await sample_agent.get_system_prompt(RunContextWrapper(run_kwargs["context"])))
         yield {"event": "text", "data": "test"}
 
     mock_streamed_result = MagicMock()
     mock_streamed_result.stream_events = mock_stream_events
 
-    with patch("agents.Runner.run_streamed", return_value=mock_streamed_result):
+    def mock_run_streamed(*args, **kwargs):
+        run_kwargs.update(kwargs)
+        return mock_streamed_result
+
+    with patch("agents.Runner.run_streamed", side_effect=mock_run_streamed):
         events = []
         async for event in sample_agent.get_response_stream(
             message="Test message", additional_instructions=additional_text
@@ -201,11 +208,11 @@ async def test_agent_with_none_original_instructions(mock_run_result):
     agent = Agent(name="NoInstructionsAgent", instructions=None)
     additional_text = "Only additional instructions"
 
-    # Track instruction changes during execution
+    # Track the effective system prompt during execution
     instruction_history = []
 
     async def mock_runner_run(*args, **kwargs):
-        instruction_history.append(agent.instructions)
+        instruction_history.append(await agent.get_system_prompt(RunContextWrapper(kwargs["context"])))
         return mock_run_result
 
     with patch("agents.Runner.run", side_effect=mock_runner_run):
@@ -215,5 +222,5 @@ async def test_agent_with_none_original_instructions(mock_run_result):
     assert len(instruction_history) == 1
     assert instruction_history[0] == additional_text
 
-    # Verify original None instructions are restored
+    # Verify the agent's None instructions were never replaced
     assert agent.instructions is None
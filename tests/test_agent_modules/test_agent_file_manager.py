@@ -384,3 +384,66 @@ class TestAgentFileManager:
                 assert "Absolute path instructions" in mock_agent.instructions
         finally:
             os.unlink(tmp_file_path)
+
+
+def _sync_agent(folder: Path) -> Mock:
+    """Agent stub whose uploads return sequential file ids."""
+    mock_agent = Mock()
+    mock_agent.name = "TestAgent"
+    mock_agent.files_folder_path = folder
+    mock_agent._associated_vector_store_id = "vs_123"
+    uploads = iter(range(1, 100))
+    mock_agent.client_sync.files.create.side_effect = lambda file, purpose: Mock(id=f"file-{next(uploads)}")
+    return mock_agent
+
+
+class TestFilesFolderSync:
+    """Test the manifest-based incremental sync of the files folder."""
+
+    def test_sync_uploads_only_new_or_changed_files(self, tmp_path):
+        """Test batched first upload, a no-op resync, and renamed, changed and deleted files."""
+        (tmp_path / "a.txt").write_text("alpha")
+        (tmp_path / "b.md").write_text("beta")
+        (tmp_path / "data.csv").write_text("x,y")
+        mock_agent = _sync_agent(tmp_path)
+        client = mock_agent.client_sync
+        file_manager = AgentFileManager(mock_agent)
+
+        code_interpreter_ids = file_manager.sync_files_folder()
+
+        assert client.files.create.call_count == 3
+        (batch_call,) = client.vector_stores.file_batches.create.call_args_list
+        assert batch_call.kwargs["vector_store_id"] == "vs_123" and len(batch_call.kwargs["file_ids"]) == 2
+        assert sorted(p.name for p in tmp_path.iterdir()) == [".agency_swarm_files.json", "a.txt", "b.md", "data.csv"]
+        assert code_interpreter_ids == [file_manager.get_id_from_file(tmp_path / "data.csv")]
+
+        file_manager.sync_files_folder()
+        assert client.files.create.call_count == 3
+        assert client.vector_stores.file_batches.create.call_count == 1
+
+        old_b_id = file_manager.get_id_from_file(tmp_path / "b.md")
+        a_id = file_manager.get_id_from_file(tmp_path / "a.txt")
+        (tmp_path / "a.txt").rename(tmp_path / "renamed.txt")
+        (tmp_path / "b.md").write_text("beta, edited")
+        (tmp_path / "data.csv").unlink()
+
+        assert file_manager.sync_files_folder() == []
+        assert client.files.create.call_count == 4
+        assert file_manager.get_id_from_file(tmp_path / "renamed.txt") == a_id
+        client.vector_stores.files.create.assert_called_once_with(
+            vector_store_id="vs_123", file_id=file_manager.get_id_from_file(tmp_path / "b.md")
+        )
+        client.vector_stores.files.delete.assert_called_once_with(old_b_id, vector_store_id="vs_123")
+
+    def test_sync_reuses_ids_from_legacy_file_names(self, tmp_path):
+        """Test that files renamed with their id by older versions are not uploaded again."""
+        (tmp_path / "notes_file-legacy1.txt").write_text("old upload")
+        mock_agent = _sync_agent(tmp_path)
+        file_manager = AgentFileManager(mock_agent)
+
+        file_manager.sync_files_folder()
+        assert file_manager.upload_file(str(tmp_path / "notes_file-legacy1.txt")) == "file-legacy1"
+
+        mock_agent.client_sync.files.create.assert_not_called()
+        mock_agent.client_sync.vector_stores.file_batches.create.assert_not_called()
+        assert file_manager.get_id_from_file(tmp_path / "notes_file-legacy1.txt") == "file-legacy1"
@@ -1,4 +1,7 @@
-from agency_swarm import Agent
+import pytest
+
+from agency_swarm import Agency, Agent
+from agency_swarm.tools import SendMessage, SendMessageBroadcast
 
 # --- Subagent Registration Tests ---
 
@@ -34,3 +37,23 @@ def test_register_subagent_idempotent(minimal_agent):
     minimal_agent.register_subagent(recipient)
     assert len(minimal_agent.tools) == initial_tool_count
     assert len(minimal_agent._subagents) == initial_subagent_count
+
+
+class CustomSendMessage(SendMessage):
+    """Custom send message tool keeping the default name."""
+
+
+@pytest.mark.parametrize("custom_first", [True, False])
+def test_mixed_send_message_classes_keep_every_recipient(custom_first):
+    """Test that a SendMessage subclass and the default tool share one send_message tool and all recipients."""
+    lead = Agent(name="Lead", instructions="Coordinate")
+    workers = [Agent(name=name, instructions="Work") for name in ("Analyst", "Designer", "Writer", "Editor")]
+    flows = [(lead, workers[0], CustomSendMessage), (lead, workers[1], CustomSendMessage), lead > workers[2]]
+    flows = flows if custom_first else flows[::-1]
+    Agency(lead, communication_flows=[*flows, (lead, workers[3], SendMessageBroadcast)])
+
+    direct = [t for t in lead.tools if t.name == "send_message"]
+    broadcast = [t for t in lead.tools if t.name == "send_message_broadcast"]
+    assert len(direct) == 1 and len(broadcast) == 1
+    assert set(direct[0].recipients) == {"analyst", "designer", "writer"}
+    assert set(broadcast[0].recipients) == {"editor"}
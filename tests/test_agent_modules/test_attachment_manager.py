@@ -5,13 +5,26 @@ Tests the AttachmentManager class functionality including vector store managemen
 file attachment handling, and cleanup operations.
 """
 
-from unittest.mock import Mock
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from agents import CodeInterpreterTool
 from agents.exceptions import AgentsException
 
 from agency_swarm.agent.attachment_manager import AttachmentManager
+from agency_swarm.agent.run_overlay import RunOverlay
+from agency_swarm.utils import file_metadata as file_metadata_module, vector_store_cache as vector_store_cache_module
+from agency_swarm.utils.file_metadata import FileMetadataCache, get_file_metadata_cache
+from agency_swarm.utils.vector_store_cache import configure_vector_store_cache
+
+
+@pytest.fixture
+def vector_store_cache(tmp_path, monkeypatch):
+    """Swap in an empty process-wide vector store cache persisted under tmp_path."""
+    monkeypatch.setattr(vector_store_cache_module, "_vector_store_cache", None)
+    return configure_vector_store_cache(path=tmp_path / "vector_stores.json")
 
 
 class TestAttachmentManager:
@@ -30,7 +43,7 @@ class TestAttachmentManager:
         ):
             AttachmentManager(mock_agent)
 
-    def test_init_attachments_vs_existing_vector_store(self):
+    def test_init_attachments_vs_existing_vector_store(self, vector_store_cache):
         """Test init_attachments_vs when vector store already exists."""
         # Setup mock agent with file_manager
         mock_agent = Mock()
@@ -42,10 +55,7 @@ class TestAttachmentManager:
         mock_vs_data.name = "attachments_vs"
         mock_vs_data.id = "vs_test123"
 
-        mock_vs_list = Mock()
-        mock_vs_list.data = [mock_vs_data]
-
-        mock_agent.client_sync.vector_stores.list.return_value = mock_vs_list
+        mock_agent.client_sync.vector_stores.list.return_value = [mock_vs_data]
 
         attachment_manager = AttachmentManager(mock_agent)
 
@@ -56,21 +66,18 @@ class TestAttachmentManager:
         mock_agent.client_sync.vector_stores.list.assert_called_once()
         mock_agent.client_sync.vector_stores.create.assert_not_called()
 
-    def test_init_attachments_vs_create_new(self):
+    def test_init_attachments_vs_create_new(self, vector_store_cache):
         """Test init_attachments_vs when creating new vector store."""
         mock_agent = Mock()
         mock_agent.name = "TestAgent"
         mock_agent.file_manager = Mock()
 
         # Mock vector store list response with no existing VS
-        mock_vs_list = Mock()
-        mock_vs_list.data = []
-
         # Mock create response
         mock_created_vs = Mock()
         mock_created_vs.id = "vs_new456"
 
-        mock_agent.client_sync.vector_stores.list.return_value = mock_vs_list
+        mock_agent.client_sync.vector_stores.list.return_value = []
         mock_agent.client_sync.vector_stores.create.return_value = mock_created_vs
 
         attachment_manager = AttachmentManager(mock_agent)
@@ -82,6 +89,27 @@ class TestAttachmentManager:
         mock_agent.client_sync.vector_stores.list.assert_called_once()
         mock_agent.client_sync.vector_stores.create.assert_called_once_with(name="new_vs")
 
+    def test_init_attachments_vs_is_cached_and_persisted(self, vector_store_cache):
+        """Test that every page is searched once and the id is reused from memory and from the mapping file."""
+        mock_agent = Mock()
+        mock_agent.name = "TestAgent"
+        mock_agent.file_manager = Mock()
+        stores = [SimpleNamespace(name=f"vs_{i}", id=f"vs_id_{i}") for i in range(150)]
+        mock_agent.client_sync.vector_stores.list.return_value = iter(stores)
+        attachment_manager = AttachmentManager(mock_agent)
+
+        assert attachment_manager.init_attachments_vs("vs_120") == "vs_id_120"
+        assert attachment_manager.init_attachments_vs("vs_120") == "vs_id_120"
+        mock_agent.client_sync.vector_stores.list.assert_called_once_with(limit=100)
+
+        # A new process reads the mapping file and only checks that the store still exists
+        configure_vector_store_cache(path=vector_store_cache.path)
+        mock_agent.client_sync.vector_stores.retrieve.return_value = stores[120]
+        assert attachment_manager.init_attachments_vs("vs_120") == "vs_id_120"
+        mock_agent.client_sync.vector_stores.retrieve.assert_called_once_with("vs_id_120")
+        assert mock_agent.client_sync.vector_stores.list.call_count == 1
+        mock_agent.client_sync.vector_stores.create.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_sort_file_attachments_unsupported_extension(self):
         """Test sort_file_attachments with unsupported file extension."""
@@ -89,14 +117,47 @@ class TestAttachmentManager:
         mock_agent.name = "TestAgent"
         mock_agent.file_manager = Mock()
 
-        # Mock _get_filename_by_id to return file with unsupported extension
+        # Mock _get_filenames_by_ids to return file with unsupported extension
         attachment_manager = AttachmentManager(mock_agent)
-        attachment_manager._get_filename_by_id = Mock(return_value="test.xyz")
+        attachment_manager._get_filenames_by_ids = AsyncMock(return_value={"file-123": "test.xyz"})
 
         # Should raise AgentsException
         with pytest.raises(AgentsException, match="Unsupported file extension: .xyz for file test.xyz"):
             await attachment_manager.sort_file_attachments(["file-123"])
 
+    @pytest.mark.asyncio
+    async def test_sort_file_attachments_looks_up_files_concurrently_and_caches(self, monkeypatch):
+        """Test that filename lookups run concurrently on the async client and are cached."""
+        monkeypatch.setattr(file_metadata_module, "_file_metadata_cache", FileMetadataCache())
+        in_flight = 0
+        max_in_flight = 0
+
+        async def retrieve(file_id):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            extension = {"file-a": "csv", "file-b": "pdf", "file-c": "png"}[file_id]
+            return SimpleNamespace(id=file_id, filename=f"{file_id}.{extension}", bytes=10, purpose="assistants")
+
+        mock_agent = Mock()
+        mock_agent.name = "TestAgent"
+        mock_agent.file_manager = Mock()
+        mock_agent.client.files.retrieve = AsyncMock(side_effect=retrieve)
+        attachment_manager = AttachmentManager(mock_agent)
+        overlay = RunOverlay(agent_name="TestAgent")
+
+        content = await attachment_manager.sort_file_attachments(["file-a", "file-b", "file-c", "file-a"], overlay)
+        await attachment_manager.sort_file_attachments(["file-b", "file-c"], RunOverlay(agent_name="TestAgent"))
+
+        assert [item["file_id"] for item in content] == ["file-b", "file-c"]
+        assert overlay.code_interpreter_file_ids == ["file-a", "file-a"]
+        assert max_in_flight == 3 and mock_agent.client.files.retrieve.await_count == 3
+        mock_agent.client_sync.files.retrieve.assert_not_called()
+        stats = get_file_metadata_cache().get_stats()
+        assert (stats.hits, stats.misses, stats.size) == (2, 3, 3)
+
     def test_attachments_cleanup_code_interpreter_files(self):
         """Test attachments_cleanup with temporary code interpreter files."""
         mock_agent = Mock()
@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from agency_swarm import Agent, HistoryPolicy
+from agency_swarm.agent.core import AgencyContext
+from agency_swarm.messages import MessageFormatter
+from agency_swarm.utils.thread import ThreadManager
+
+
+def _msg(content: str, role: str = "user") -> dict:
+    return {"role": role, "content": content, "agent": "A", "callerAgent": None}
+
+
+def _call(call_id: str) -> dict:
+    return {"type": "function_call", "call_id": call_id, "name": "tool", "arguments": "{}"}
+
+
+def _output(call_id: str) -> dict:
+    return {"type": "function_call_output", "call_id": call_id, "output": "done"}
+
+
+def _one_token_each(_message) -> int:
+    return 1
+
+
+def test_budget_keeps_first_items_and_recent_tail():
+    """Tests that the window pins the first items and fills the budget from the end."""
+    history = [_msg(f"m{i}") for i in range(10)]
+    policy = HistoryPolicy(max_tokens=5, keep_first=2)
+
+    window = policy.apply(history, _one_token_each)
+
+    assert [m["content"] for m in window] == ["m0", "m1", "m7", "m8", "m9"]
+    assert policy.stats.trimmed_items == 5
+    assert policy.stats.trimmed_tokens == 5
+    assert policy.stats.last_kept_tokens == 5
+
+
+def test_tool_call_pairs_are_never_split():
+    """Tests that a cut never separates a function_call from its output."""
+    history = [_msg("task"), _call("c1"), _call("c2"), _output("c1"), _output("c2"), _msg("answer", "assistant")]
+
+    # Budget fits 3 items, but the call/output block is 4 items long, so it is dropped as a whole
+    window = HistoryPolicy(max_tokens=3).apply(history, _one_token_each)
+    assert window == history[-1:]
+
+    # keep_last inside the block is rounded out to include the matching calls
+    window = HistoryPolicy(keep_last=2).apply(history, _one_token_each)
+    assert window == history[1:]
+
+    # keep_first ending on an open call extends the head through its output
+    window = HistoryPolicy(max_tokens=5, keep_first=2).apply(history, _one_token_each)
+    assert window is history
+
+
+def test_no_trimming_returns_history_unchanged():
+    """Tests that histories within budget are passed through as-is."""
+    history = [_msg("a"), _msg("b")]
+    policy = HistoryPolicy(max_tokens=100)
+
+    assert policy.apply(history) is history
+    assert policy.stats.trimmed_windows == 0
+    assert policy.stats.windows == 1
+
+    with pytest.raises(ValueError):
+        HistoryPolicy(max_tokens=0)
+
+
+def test_prepare_history_applies_agent_policy_with_cached_estimates(mocker):
+    """Tests that prepare_history_for_runner windows the agent thread using cached token estimates."""
+    thread_manager = ThreadManager()
+    thread_manager.add_messages([_msg(f"old {i}") for i in range(50)])
+    agent = Agent(name="A", instructions="x", history_policy=HistoryPolicy(keep_first=1, keep_last=3))
+    context = AgencyContext(agency_instance=MagicMock(), thread_manager=thread_manager, subagents={})
+    estimate = mocker.spy(thread_manager, "estimate_tokens")
+
+    history = MessageFormatter.prepare_history_for_runner([{"role": "user", "content": "new"}], agent, None, context)
+
+    assert [m["content"] for m in history] == ["old 0", "old 48", "old 49", "new"]
+    assert "seq" not in history[0]
+    assert agent.history_policy.stats.trimmed_items == 47
+
+    first_calls = estimate.call_count
+    MessageFormatter.prepare_history_for_runner([], agent, None, context)
+    assert len(thread_manager._token_estimates) == 51
+    assert estimate.call_count > first_calls
@@ -0,0 +1,97 @@
+import asyncio
+import gc
+import importlib.util
+import weakref
+
+import httpx
+import pytest
+
+from agency_swarm.tools import http_pool
+from agency_swarm.tools.http_pool import HTTPClientConfig, aclose_http_clients, get_http_client, send_request
+
+
+def _scripted_client(mocker, responses: list[httpx.Response]) -> list[httpx.Request]:
+    """Route pooled requests to a mock transport answering with ``responses`` in order."""
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return responses[len(requests) - 1]
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    mocker.patch("agency_swarm.tools.http_pool.get_http_client", return_value=client)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_clients_are_pooled_per_origin_and_closed_on_shutdown():
+    """Tests that calls to one origin reuse a client and aclose_http_clients closes it."""
+    first = get_http_client("https://api.example.com/users/1", timeout=10)
+    assert get_http_client("https://api.example.com/posts?x=1", timeout=10) is first
+    assert get_http_client("https://other.example.com/users", timeout=10) is not first
+    assert get_http_client("https://api.example.com/users", timeout=10, config=HTTPClientConfig(max_retries=0)) is not (
+        first
+    )
+
+    await aclose_http_clients()
+
+    assert first.is_closed
+    assert get_http_client("https://api.example.com/users/1", timeout=10) is not first
+    await aclose_http_clients()
+
+
+@pytest.mark.asyncio
+async def test_retries_honor_retry_after(mocker):
+    """Tests retrying 429/5xx responses using Retry-After before the backoff schedule."""
+    sleep = mocker.patch("agency_swarm.tools.http_pool.asyncio.sleep")
+    requests = _scripted_client(
+        mocker,
+        [
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(503),
+            httpx.Response(200, json={"ok": True}),
+        ],
+    )
+
+    response = await send_request("GET", "https://api.example.com/items", config=HTTPClientConfig(backoff_factor=0.1))
+
+    assert response.json() == {"ok": True}
+    assert len(requests) == 3
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert delays[0] == 2 and 0.1 <= delays[1] <= 0.2
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_and_long_retry_after_are_not_retried(mocker):
+    """Tests that POST 5xx responses and over-long Retry-After values are returned as is."""
+    mocker.patch("agency_swarm.tools.http_pool.asyncio.sleep")
+    requests = _scripted_client(mocker, [httpx.Response(500), httpx.Response(429, headers={"Retry-After": "3600"})])
+
+    assert (await send_request("POST", "https://api.example.com/items", json={})).status_code == 500
+    assert (await send_request("POST", "https://api.example.com/items", json={})).status_code == 429
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(importlib.util.find_spec("h2") is not None, reason="h2 is installed")
+async def test_http2_without_h2_explains_install():
+    """Tests the install hint when HTTP/2 is requested without the h2 package."""
+    with pytest.raises(ImportError, match="agency-swarm\\[http2\\]"):
+        get_http_client("https://api.example.com", config=HTTPClientConfig(http2=True))
+
+
+def test_clients_of_closed_loops_are_released():
+    """Tests that a loop closed without aclose_http_clients is not kept alive by its clients."""
+
+    async def open_client():
+        client = get_http_client("https://api.example.com", timeout=10)
+        # Open connections reference their loop, like this attribute does
+        client._held_loop = asyncio.get_running_loop()
+        return weakref.ref(client._held_loop)
+
+    old_loop = asyncio.run(open_client())
+    asyncio.run(open_client())
+    gc.collect()
+
+    assert old_loop() is None
+    assert len(http_pool._clients) <= 1
@@ -0,0 +1,202 @@
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import anyio
+import pytest
+from agents import RunContextWrapper, RunResult
+from agents.mcp import MCPServer
+
+from agency_swarm import Agency, Agent, SendMessage
+from agency_swarm.agent.execution_helpers import mcp_sessions
+from agency_swarm.tools import MCPServerManager
+
+
+class _FakeServer(MCPServer):
+    def __init__(self, name: str = "fake", connect_delay: float = 0.0):
+        super().__init__()
+        self._name = name
+        self.connect_delay = connect_delay
+        self.connects = 0
+        self.cleanups = 0
+        self.fail_calls = False
+        self.active_calls = 0
+        self.max_active_calls = 0
+        self.cache_tools_list = False
+        self.cache_invalidations = 0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        await asyncio.sleep(self.connect_delay)
+        self.connects += 1
+
+    async def cleanup(self):
+        self.cleanups += 1
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.cleanup()
+
+    def invalidate_tools_cache(self):
+        self.cache_invalidations += 1
+
+    async def list_tools(self, run_context=None, agent=None):
+        return []
+
+    async def call_tool(self, tool_name, arguments):
+        if self.fail_calls:
+            raise anyio.ClosedResourceError()
+        self.active_calls += 1
+        self.max_active_calls = max(self.max_active_calls, self.active_calls)
+        await asyncio.sleep(0.01)
+        self.active_calls -= 1
+        return tool_name
+
+    async def list_prompts(self):
+        return None
+
+    async def get_prompt(self, name, arguments=None):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_sessions_are_reused_across_runs_and_concurrent_callers():
+    """Tests that one session is opened per server no matter how many runs need it."""
+    server = _FakeServer(connect_delay=0.02)
+    manager = MCPServerManager()
+
+    await asyncio.gather(*(manager.ensure_connected([server]) for _ in range(5)))
+    await manager.ensure_connected([server])
+
+    assert server.connects == 1
+    assert manager.stats.connects == 1
+    assert manager.stats.reuses == 1
+    assert manager.is_connected(server)
+    assert server.cache_tools_list is True
+
+    await manager.aclose()
+    assert server.cleanups == 1
+    assert not manager.is_connected(server)
+
+
+@pytest.mark.asyncio
+async def test_broken_transport_reconnects_on_next_run():
+    """Tests that a transport error marks the session broken and the next run reconnects."""
+    server = _FakeServer()
+    manager = MCPServerManager()
+    await manager.ensure_connected([server])
+
+    server.fail_calls = True
+    with pytest.raises(anyio.ClosedResourceError):
+        await server.call_tool("greet", {})
+    assert not manager.is_connected(server)
+
+    server.fail_calls = False
+    await manager.ensure_connected([server])
+
+    assert server.connects == 2
+    assert server.cleanups == 1
+    assert manager.stats.reconnects == 1
+    assert server.cache_invalidations == 2
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_is_raised_and_retried():
+    """Tests that connection errors reach the caller and do not leave a dead session behind."""
+    server = _FakeServer()
+    manager = MCPServerManager(connect_timeout=0.01)
+    server.connect_delay = 1
+
+    with pytest.raises(TimeoutError):
+        await manager.ensure_connected([server])
+    assert manager.stats.failures == 1
+
+    server.connect_delay = 0
+    await manager.ensure_connected([server])
+    assert manager.is_connected(server)
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_serialize_calls_allows_one_request_per_session():
+    """Tests that serialize_calls queues concurrent tool calls on the same session."""
+    server = _FakeServer()
+    manager = MCPServerManager(serialize_calls=True)
+    await manager.ensure_connected([server])
+
+    assert await asyncio.gather(*(server.call_tool(f"t{i}", {}) for i in range(4))) == ["t0", "t1", "t2", "t3"]
+    assert server.max_active_calls == 1
+    await manager.aclose()
+
+
+@pytest.mark.asyncio
+async def test_agency_runs_share_the_agency_manager():
+    """Tests that mcp_sessions uses the agency manager and agencies can share one."""
+    server = _FakeServer()
+    agent = Agent(name="MCPAgent", instructions="x", mcp_servers=[server])
+    agency = Agency(agent)
+    other = Agency(agent, mcp_manager=agency.mcp_manager)
+    context = agency._get_agent_context("MCPAgent")
+
+    async with mcp_sessions(agent, context):
+        pass
+    async with mcp_sessions(agent, other._get_agent_context("MCPAgent")):
+        pass
+    assert server.connects == 1
+    assert server.cleanups == 0
+
+    # Without an agency the servers are connected for the run only
+    async with mcp_sessions(agent, None):
+        pass
+    assert server.connects == 2
+    assert server.cleanups == 1
+
+    await agency.aclose()
+    assert server.cleanups == 2
+
+
+@pytest.mark.asyncio
+async def test_send_message_recipient_uses_the_agency_manager():
+    """Tests that a recipient reached through send_message keeps its server on the agency's session."""
+    server = _FakeServer()
+    sender = Agent(name="Sender", instructions="x")
+    recipient = Agent(name="Recipient", instructions="x", mcp_servers=[server])
+    agency = Agency(sender, communication_flows=[(sender, recipient)])
+    send_message = next(tool for tool in sender.tools if isinstance(tool, SendMessage))
+    arguments = json.dumps(
+        {
+            "recipient_agent": "Recipient",
+            "my_primary_instructions": "x",
+            "message": "hello",
+            "additional_instructions": "",
+        }
+    )
+    recipient_sessions = []
+
+    async def fake_run(*, starting_agent, context, **_kwargs):
+        if starting_agent is sender:
+            await send_message.on_invoke_tool(RunContextWrapper(context), arguments)
+        else:
+            recipient_sessions.append(agency.mcp_manager.is_connected(server))
+        result = MagicMock(spec=RunResult)
+        result.final_output = "done"
+        result.new_items = []
+        return result
+
+    with patch("agents.Runner.run", side_effect=fake_run):
+        await agency.get_response("first")
+        await agency.get_response("second")
+
+    assert recipient_sessions == [True, True]
+    assert server.connects == 1
+    assert server.cleanups == 0
+
+    await agency.aclose()
+    assert server.cleanups == 1
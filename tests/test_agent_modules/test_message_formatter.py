@@ -0,0 +1,75 @@
+from agency_swarm.messages import MessageFormatter
+
+
+def _history() -> list[dict]:
+    return [
+        {"role": "user", "content": "hi", "agent": "A", "callerAgent": None, "seq": 0, "timestamp": 1},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"function": {"name": "old_tool"}}],
+            "agent": "A",
+            "callerAgent": None,
+            "seq": 1,
+            "citations": [],
+        },
+        {"type": "function_call_output", "call_id": "c1", "output": "ok", "agent": "A", "seq": 2},
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [{"function": {"name": "lookup"}}],
+            "agent": "A",
+            "callerAgent": None,
+            "agent_run_id": "agent_run_1",
+            "seq": 3,
+        },
+    ]
+
+
+def test_fused_pass_matches_separate_passes():
+    """Tests that clean_history_for_runner equals sanitize + content safety + strip metadata."""
+    history = _history()
+    expected = MessageFormatter.strip_agency_metadata(
+        MessageFormatter.ensure_tool_calls_content_safety(MessageFormatter.sanitize_tool_calls_in_history(history))
+    )
+
+    assert MessageFormatter.clean_history_for_runner(history) == expected
+    assert expected[1] == {"role": "assistant", "content": None}
+    assert expected[3]["content"] == "Using tools: lookup"
+    # Stored messages are never modified
+    assert history == _history()
+
+
+def test_cache_reuses_cleaned_messages_until_they_change():
+    """Tests that cached cleaned messages are reused and invalidated when a message is modified."""
+    history = _history()
+    cache: dict = {}
+    first = MessageFormatter.clean_history_for_runner(history, cache=cache)
+    second = MessageFormatter.clean_history_for_runner(history, cache=cache)
+    assert all(a is b for a, b in zip(first, second, strict=True))
+
+    history[0]["content"] = "edited"
+    history.append({"role": "assistant", "content": "done", "agent": "A", "seq": 4})
+    third = MessageFormatter.clean_history_for_runner(history, cache=cache)
+
+    assert third[0]["content"] == "edited"
+    # The previous last assistant message lost its tool calls once a newer assistant message arrived
+    assert "tool_calls" not in third[3]
+    assert third[2] is first[2]
+
+
+def test_cache_is_invalidated_when_any_field_changes_in_place():
+    """Tests that replacing, adding or removing any field of a stored message refreshes its cleaned copy."""
+    history = _history()
+    cache: dict = {}
+    MessageFormatter.clean_history_for_runner(history, cache=cache)
+
+    history[2]["output"] = "retried"
+    history[2]["call_id"] = "c2"
+    del history[0]["timestamp"]
+    history[0]["type"] = "message"
+    cleaned = MessageFormatter.clean_history_for_runner(history, cache=cache)
+
+    assert cleaned[2] == {"type": "function_call_output", "call_id": "c2", "output": "retried"}
+    assert cleaned[0] == {"role": "user", "content": "hi", "type": "message"}
+    assert cleaned == MessageFormatter.clean_history_for_runner(history)
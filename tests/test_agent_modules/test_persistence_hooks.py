@@ -156,3 +156,19 @@ class TestPersistenceHooksUnit:
 
         with pytest.raises(TypeError, match="load_threads_callback and save_threads_callback must be callable"):
             PersistenceHooks(load_threads_callback=mock_load_callback, save_threads_callback="not_callable")
+
+    def test_on_run_end_skips_save_without_new_messages(self, mock_load_callback, mock_save_callback):
+        """Test PersistenceHooks.on_run_end only saves when the ThreadManager cursor moved."""
+        manager = ThreadManager()
+        context = MagicMock(spec=MasterContext)
+        context.thread_manager = manager
+        hooks = PersistenceHooks(load_threads_callback=mock_load_callback, save_threads_callback=mock_save_callback)
+
+        manager.add_message({"role": "user", "content": "Hello", "agent": "Agent1", "callerAgent": None})
+        hooks.on_run_end(context=context, result=MagicMock(spec=RunResult))
+        hooks.on_run_end(context=context, result=MagicMock(spec=RunResult))
+        assert mock_save_callback.call_count == 1
+
+        manager.add_message({"role": "assistant", "content": "Hi", "agent": "Agent1", "callerAgent": None})
+        hooks.on_run_end(context=context, result=MagicMock(spec=RunResult))
+        assert mock_save_callback.call_count == 2
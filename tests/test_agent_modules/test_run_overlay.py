@@ -0,0 +1,73 @@
+import asyncio
+import random
+from unittest.mock import MagicMock, patch
+
+import pytest
+from agents import CodeInterpreterTool, RunContextWrapper, RunResult
+
+from agency_swarm import Agency, Agent
+from agency_swarm.agent.run_overlay import RunOverlay
+
+
+def _code_interpreter_file_ids(tools) -> list[str]:
+    return [
+        file_id
+        for tool in tools
+        if isinstance(tool, CodeInterpreterTool)
+        for file_id in tool.tool_config["container"]["file_ids"]
+    ]
+
+
+def test_overlay_copies_code_interpreter_tool_instead_of_mutating_it():
+    """Tests that per-run files are added to a copy of an existing CodeInterpreterTool."""
+    tool = CodeInterpreterTool(
+        tool_config={"type": "code_interpreter", "container": {"type": "auto", "file_ids": ["file-a"]}}
+    )
+    tools = [tool]
+
+    run_tools = RunOverlay(agent_name="A", code_interpreter_file_ids=["file-b", "file-a"]).apply_tools(tools)
+
+    assert _code_interpreter_file_ids(run_tools) == ["file-a", "file-b"]
+    assert tools == [tool] and tool.tool_config["container"]["file_ids"] == ["file-a"]
+    assert RunOverlay(agent_name="A", additional_instructions="extra").apply_instructions(None) == "extra"
+
+
+@pytest.mark.asyncio
+async def test_interleaved_runs_on_one_agency_do_not_leak_instructions_or_tools():
+    """Stress test: hundreds of concurrent runs with different instructions and attachments on one warm agency."""
+    agent = Agent(name="Worker", instructions="Base instructions")
+    agency = Agency(agent, shared_instructions="Shared rules")
+    original_tools = list(agent.tools)
+
+    async def fake_filenames(file_ids):
+        return {file_id: f"{file_id}.csv" for file_id in file_ids}
+
+    agent.attachment_manager._get_filenames_by_ids = fake_filenames
+
+    async def fake_run(*, starting_agent, context, **_kwargs):
+        wrapper = RunContextWrapper(context)
+        await asyncio.sleep(random.random() / 100)
+        prompt = await starting_agent.get_system_prompt(wrapper)
+        await asyncio.sleep(random.random() / 100)
+        tools = await starting_agent.get_all_tools(wrapper)
+        result = MagicMock(spec=RunResult)
+        result.final_output = (prompt, _code_interpreter_file_ids(tools))
+        result.new_items = []
+        return result
+
+    async def one_run(i: int):
+        file_ids = [f"file-{i}"] if i % 3 == 0 else None
+        result = await agency.get_response(
+            f"message {i}", additional_instructions=f"Run marker {i}.", file_ids=file_ids
+        )
+        return i, result.final_output
+
+    with patch("agents.Runner.run", side_effect=fake_run):
+        results = await asyncio.gather(*(one_run(i) for i in range(300)))
+
+    for i, (prompt, file_ids) in results:
+        assert prompt == f"Base instructions\n\nShared rules\n\n---\n\nRun marker {i}."
+        assert file_ids == ([f"file-{i}"] if i % 3 == 0 else [])
+
+    assert agent.instructions == "Base instructions"
+    assert agent.tools == original_tools
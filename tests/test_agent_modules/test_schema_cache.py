@@ -0,0 +1,74 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from agency_swarm.tools import (
+    ToolFactory,
+    get_schema_cache_stats,
+    schema_cache as schema_cache_module,
+    utils as tools_utils,
+)
+from agency_swarm.tools.schema_cache import SchemaCache
+
+SPEC = (Path(__file__).parents[1] / "data" / "schemas" / "ga4.json").read_text()
+
+
+@pytest.fixture
+def fresh_cache(monkeypatch):
+    """Swap in an empty process-wide schema cache; pass a directory to persist it."""
+
+    def make(directory=None) -> SchemaCache:
+        cache = SchemaCache(directory=directory)
+        monkeypatch.setattr(schema_cache_module, "_schema_cache", cache)
+        return cache
+
+    return make
+
+
+def test_same_spec_is_compiled_once(fresh_cache, mocker):
+    """Tests that rebuilding tools from an unchanged spec reuses the compiled spec and models."""
+    fresh_cache()
+    compile_spec = mocker.spy(ToolFactory, "_compile_openapi_schema")
+    codegen = mocker.spy(tools_utils, "_generate_model_source")
+
+    first = ToolFactory.from_openapi_schema(SPEC, headers={"Authorization": "Bearer a"})
+    models = codegen.call_count
+    second = ToolFactory.from_openapi_schema(SPEC, headers={"Authorization": "Bearer b"})
+
+    assert compile_spec.call_count == 1
+    assert models > 0 and codegen.call_count == models
+    assert [t.params_json_schema for t in first] == [t.params_json_schema for t in second]
+    assert first[0].params_json_schema is not second[0].params_json_schema
+    assert get_schema_cache_stats().hits == 1 + models
+
+
+def test_changed_spec_is_recompiled(fresh_cache, mocker):
+    """Tests that editing the spec invalidates the cached compilation."""
+    fresh_cache()
+    compile_spec = mocker.spy(ToolFactory, "_compile_openapi_schema")
+    ToolFactory.from_openapi_schema(SPEC)
+
+    changed = json.loads(SPEC)
+    path_item = next(iter(changed["paths"].values()))
+    next(iter(path_item.values()))["description"] = "Changed description"
+    tools = ToolFactory.from_openapi_schema(changed)
+
+    assert compile_spec.call_count == 2
+    assert tools[0].description == "Changed description"
+
+
+def test_disk_cache_is_reused_by_new_process_cache(fresh_cache, mocker, tmp_path):
+    """Tests that a new cache on the same directory skips ref resolution and codegen."""
+    compile_spec = mocker.spy(ToolFactory, "_compile_openapi_schema")
+    codegen = mocker.spy(tools_utils, "_generate_model_source")
+    fresh_cache(tmp_path)
+    expected = [t.params_json_schema for t in ToolFactory.from_openapi_schema(SPEC, strict=True)]
+    models = codegen.call_count
+
+    fresh_cache(tmp_path)
+    tools = ToolFactory.from_openapi_schema(SPEC, strict=True)
+
+    assert [t.params_json_schema for t in tools] == expected
+    assert compile_spec.call_count == 1 and codegen.call_count == models
+    assert get_schema_cache_stats().disk_hits == 1 + models
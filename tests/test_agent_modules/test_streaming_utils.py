@@ -1,4 +1,8 @@
-from agency_swarm.streaming.utils import add_agent_name_to_event
+import asyncio
+
+import pytest
+
+from agency_swarm.streaming.utils import EventStreamMerger, StreamingContext, StreamMultiplexer, add_agent_name_to_event
 
 
 def test_add_agent_name_to_event_dict_basic():
@@ -102,3 +106,63 @@ def test_add_agent_name_to_event_preserves_run_ids():
     assert out["agent_run_id"] == "ExistingRunId"
     # parent_run_id should be added since it wasn't present
     assert out["parent_run_id"] == "NewParentId"
+
+
+@pytest.mark.asyncio
+async def test_stream_multiplexer_merges_producers_and_ends_when_all_finish():
+    mux = StreamMultiplexer(buffer_size=1)
+
+    async def produce(prefix: str):
+        for i in range(3):
+            await mux.put(f"{prefix}{i}")
+            await asyncio.sleep(0)
+
+    mux.add_producer(lambda: produce("a"))
+    mux.add_producer(lambda: produce("b"))
+    events = [e async for e in mux.events()]
+
+    assert sorted(events) == ["a0", "a1", "a2", "b0", "b1", "b2"]
+    assert [e for e in events if e.startswith("a")] == ["a0", "a1", "a2"]
+    assert mux.closed
+    await mux.put("late")  # dropped, does not block
+
+
+@pytest.mark.asyncio
+async def test_stream_multiplexer_propagates_producer_errors_and_cancels_others():
+    mux = StreamMultiplexer()
+    cancelled = asyncio.Event()
+
+    async def failing():
+        await mux.put("first")
+        raise RuntimeError("boom")
+
+    async def endless():
+        try:
+            await asyncio.Event().wait()
+        finally:
+            cancelled.set()
+
+    mux.add_producer(endless)
+    mux.add_producer(failing)
+    received = []
+    with pytest.raises(RuntimeError, match="boom"):
+        async for event in mux.events():
+            received.append(event)
+
+    assert received == ["first"]
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_merge_streams_delivers_context_events_in_order_with_primary():
+    context = StreamingContext()
+
+    async def primary():
+        yield "tool_call"
+        await context.put_event("sub_event")
+        yield "tool_output"
+
+    events = [e async for e in EventStreamMerger().merge_streams(primary(), context)]
+
+    assert events == ["tool_call", "sub_event", "tool_output"]
+    assert context.sink is None
@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+from agency_swarm import CompactionConfig
+from agency_swarm.messages.history_window import estimate_message_tokens
+from agency_swarm.utils.compaction import SUMMARY_PREFIX, ThreadCompactor
+from agency_swarm.utils.thread import ThreadManager
+
+
+class _FakeResponses:
+    def __init__(self, delay: float = 0.0):
+        self.inputs: list[str] = []
+        self.delay = delay
+
+    async def create(self, *, model: str, input: str):
+        self.inputs.append(input)
+        await asyncio.sleep(self.delay)
+
+        class _R:
+            output_text = f"summary #{len(self.inputs)}"
+
+        return _R()
+
+
+class _FakeClient:
+    def __init__(self, delay: float = 0.0):
+        self.responses = _FakeResponses(delay)
+
+
+def _user(content: str) -> dict:
+    return {"role": "user", "content": content, "agent": "A", "callerAgent": None}
+
+
+@pytest.mark.asyncio
+async def test_threshold_triggers_background_compaction_and_persists():
+    """Tests that crossing max_messages summarizes older turns per conversation and keeps recent ones."""
+    saved: list[tuple[list, int]] = []
+    manager = ThreadManager(append_threads_callback=lambda new, start: saved.append((list(new), start)))
+    client = _FakeClient()
+    compactor = ThreadCompactor(CompactionConfig(max_messages=12, keep_recent=4, min_batch=4), client=client)
+    manager.set_compactor(compactor)
+
+    manager.add_messages([_user(f"u{i}") for i in range(6)])
+    manager.add_messages([{"role": "user", "content": f"a2b{i}", "agent": "B", "callerAgent": "A"} for i in range(4)])
+    manager.add_messages([_user(f"recent{i}") for i in range(3)])
+    await compactor.wait()
+
+    messages = manager.get_all_messages()
+    summaries = [m for m in messages if str(m.get("content", "")).startswith(SUMMARY_PREFIX)]
+    assert [(m["agent"], m["callerAgent"]) for m in summaries] == [("A", None), ("B", "A")]
+    assert [m["content"] for m in messages[2:]] == ["a2b3", "recent0", "recent1", "recent2"]
+    assert [m["seq"] for m in messages] == sorted(m["seq"] for m in messages)
+    assert [m["content"] for m in manager.get_conversation_history("B", "A")] == [summaries[1]["content"], "a2b3"]
+
+    # The compacted thread is rewritten from the start
+    assert saved[-1] == (messages, 0)
+    assert compactor.stats.runs == 1
+    assert compactor.stats.compacted_messages == 9
+    assert "<transcript>\n[user] u0" in client.responses.inputs[0]
+
+
+@pytest.mark.asyncio
+async def test_long_threads_are_summarized_in_chunks_and_merged():
+    """Tests map-reduce summarization: parallel chunk summaries followed by a merge request."""
+    manager = ThreadManager()
+    manager.add_messages([_user("x" * 400) for _ in range(10)])
+    client = _FakeClient()
+    compactor = ThreadCompactor(
+        CompactionConfig(max_tokens=10, keep_recent=1, min_batch=2, chunk_tokens=250), client=client
+    )
+
+    assert await compactor.compact(manager)
+
+    assert compactor.stats.summary_requests == len(client.responses.inputs) > 2
+    assert client.responses.inputs[-1].startswith(CompactionConfig.merge_prompt)
+    assert len(manager.get_all_messages()) == 2
+
+
+@pytest.mark.asyncio
+async def test_total_tokens_are_estimated_for_the_summary_after_compaction():
+    """Tests that the summary item does not inherit the token estimate of the message whose seq it reuses."""
+    manager = ThreadManager()
+    manager.add_messages([_user("x" * 4000) for _ in range(6)])
+    before = manager.total_tokens()
+    compactor = ThreadCompactor(CompactionConfig(max_messages=4, keep_recent=2, min_batch=2), client=_FakeClient())
+
+    assert await compactor.compact(manager)
+
+    messages = manager.get_all_messages()
+    assert manager.total_tokens() == sum(estimate_message_tokens(m) for m in messages) < before / 2
+
+
+@pytest.mark.asyncio
+async def test_compaction_is_discarded_when_thread_is_cleared():
+    """Tests that a compaction finishing after clear() does not resurrect old messages."""
+    manager = ThreadManager()
+    manager.add_messages([_user(f"u{i}") for i in range(10)])
+    compactor = ThreadCompactor(CompactionConfig(max_messages=5, keep_recent=2, min_batch=2), client=_FakeClient(0.05))
+
+    task = asyncio.create_task(compactor.compact(manager))
+    await asyncio.sleep(0.01)
+    manager.clear()
+    manager.add_message(_user("fresh"))
+
+    assert await task is False
+    assert [m["content"] for m in manager.get_all_messages()] == ["fresh"]
+    assert compactor.stats.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_empty_summary_leaves_history_untouched():
+    """Tests that a summary without text counts as a failure instead of replacing the older messages."""
+    manager = ThreadManager()
+    manager.add_messages([_user(f"u{i}") for i in range(10)])
+    client = _FakeClient()
+
+    async def empty_create(*, model: str, input: str):
+        class _R:
+            output_text = ""
+
+        return _R()
+
+    client.responses.create = empty_create
+    compactor = ThreadCompactor(CompactionConfig(max_messages=5, keep_recent=2, min_batch=2), client=client)
+
+    assert await compactor.compact(manager) is False
+    assert [m["content"] for m in manager.get_all_messages()] == [f"u{i}" for i in range(10)]
+    assert compactor.stats.failures == 1
+
+
+def test_compactor_can_be_reused_across_event_loops():
+    """Tests that runs on separate asyncio.run loops (as in get_response_sync) do not share a semaphore."""
+    compactor = ThreadCompactor(
+        CompactionConfig(max_messages=5, keep_recent=2, min_batch=2, chunk_tokens=1, max_parallel=1),
+        client=_FakeClient(0.01),
+    )
+
+    for _ in range(2):
+        manager = ThreadManager()
+        manager.add_messages([_user(f"u{i}") for i in range(10)])
+        assert asyncio.run(compactor.compact(manager)) is True
+
+    assert compactor.stats.failures == 0
@@ -155,3 +155,278 @@ def test_thread_manager_pickleable():
     # Verify the data is preserved
     assert isinstance(unpickled_manager, ThreadManager)
     assert unpickled_manager._store.messages == messages
+
+
+def test_conversation_between_uses_both_directions_in_order():
+    """Tests that pair lookups return both directions in sequence order, ignoring wall-clock timestamps."""
+    manager = ThreadManager()
+    manager.add_messages(
+        [
+            {"role": "user", "content": "A->B", "agent": "B", "callerAgent": "A", "timestamp": 10},
+            {"role": "user", "content": "user", "agent": "A", "callerAgent": None, "timestamp": 20},
+            {"role": "user", "content": "B->A", "agent": "A", "callerAgent": "B", "timestamp": 30},
+            {"role": "user", "content": "late A->B", "agent": "B", "callerAgent": "A", "timestamp": 15},
+        ]
+    )
+
+    between = manager.get_conversation_history("B", "A")
+    assert [m["content"] for m in between] == ["A->B", "B->A", "late A->B"]
+    assert [m["content"] for m in manager._store.get_messages(agent="B", caller_agent="A")] == ["A->B", "late A->B"]
+    assert [m["content"] for m in manager.get_conversation_history("A", None)] == ["user"]
+    assert [m["seq"] for m in manager.get_all_messages()] == [0, 1, 2, 3]
+    assert [m["timestamp"] for m in manager._store.messages] == [10, 20, 30, 15]
+
+
+def test_store_indexes_follow_direct_list_changes():
+    """Tests that indexes are rebuilt when the flat list is replaced or cleared."""
+    manager = ThreadManager()
+    manager.add_message({"role": "user", "content": "old", "agent": "A", "callerAgent": None, "timestamp": 1})
+
+    manager._store.messages = [{"role": "user", "content": "new", "agent": "A", "callerAgent": None, "timestamp": 2}]
+    assert [m["content"] for m in manager.get_conversation_history("A")] == ["new"]
+
+    manager._store.messages.append({"role": "user", "content": "tail", "agent": "A", "callerAgent": None})
+    assert [m["content"] for m in manager.get_all_messages()] == ["new", "tail"]
+
+    manager.clear()
+    assert manager.get_conversation_history("A") == []
+
+
+def test_append_callback_receives_only_new_messages(mocker):
+    """Tests that the append callback gets deltas with their start index instead of the full history."""
+    loaded = [{"role": "user", "content": "old", "agent": "A", "callerAgent": None, "timestamp": 1}]
+    mock_append = mocker.MagicMock()
+    mock_save = mocker.MagicMock()
+    manager = ThreadManager(
+        load_threads_callback=lambda: list(loaded),
+        save_threads_callback=mock_save,
+        append_threads_callback=mock_append,
+    )
+
+    first = {"role": "user", "content": "one", "agent": "A", "callerAgent": None, "timestamp": 2}
+    second = {"role": "assistant", "content": "two", "agent": "A", "callerAgent": None, "timestamp": 3}
+    manager.add_message(first)
+    manager.add_messages([second])
+
+    assert mock_append.call_args_list == [mocker.call([first], 1), mocker.call([second], 2)]
+    mock_save.assert_not_called()
+
+    # After a reset the history is rewritten from index 0
+    manager.clear()
+    manager.add_message(first)
+    mock_append.assert_called_with([first], 0)
+
+
+def test_append_callback_retries_failed_messages(mocker):
+    """Tests that messages from a failed append are resent with the next save."""
+    mock_append = mocker.MagicMock(side_effect=[RuntimeError("db down"), None])
+    manager = ThreadManager(append_threads_callback=mock_append)
+
+    first = {"role": "user", "content": "one", "agent": "A", "callerAgent": None, "timestamp": 1}
+    second = {"role": "user", "content": "two", "agent": "A", "callerAgent": None, "timestamp": 2}
+    manager.add_message(first)
+    manager.add_message(second)
+
+    assert mock_append.call_args_list[-1] == mocker.call([first, second], 0)
+    assert manager._persisted_count == 2
+
+
+def test_write_behind_coalesces_saves_until_flush():
+    """Tests that write-behind mode saves off the caller thread and batches bursts."""
+    import threading
+
+    from agency_swarm.utils.write_behind import WriteBehindConfig
+
+    release = threading.Event()
+    saved: list[tuple[list, int]] = []
+
+    def slow_append(new_messages, start_index):
+        release.wait(timeout=5)
+        saved.append((new_messages, start_index))
+
+    manager = ThreadManager(
+        append_threads_callback=slow_append, write_behind=WriteBehindConfig(debounce_seconds=10, max_pending=100)
+    )
+    messages = [
+        {"role": "user", "content": str(i), "agent": "A", "callerAgent": None, "timestamp": i} for i in range(5)
+    ]
+    for message in messages:
+        manager.add_message(message)
+
+    # Nothing is written inline; all five messages are waiting in the queue
+    assert saved == []
+    stats = manager.persistence_stats()
+    assert stats is not None and stats.queue_depth == 5
+
+    release.set()
+    manager.flush()
+
+    assert saved == [(messages, 0)]
+    stats = manager.persistence_stats()
+    assert stats.queue_depth == 0 and stats.saves == 1 and stats.coalesced == 4
+    manager.close()
+
+
+def test_write_behind_backpressure_and_pickling():
+    """Tests that exceeding max_pending saves inline and that write-behind managers stay pickleable."""
+    from agency_swarm.utils.write_behind import WriteBehindConfig
+
+    saved: list[int] = []
+    manager = ThreadManager(
+        save_threads_callback=lambda messages: saved.append(len(messages)),
+        write_behind=WriteBehindConfig(debounce_seconds=10, max_pending=2),
+    )
+    for i in range(3):
+        manager.add_message({"role": "user", "content": str(i), "agent": "A", "callerAgent": None, "timestamp": i})
+
+    assert saved == [3]
+    assert manager.persistence_stats().inline_saves == 1
+
+    unpickled = pickle.loads(pickle.dumps(ThreadManager(write_behind=True)))
+    assert unpickled.persistence_stats() is None  # No save callback configured
+    manager.close()
+
+
+def test_write_behind_thread_exits_when_idle():
+    """Tests that the writer thread stops once everything is saved and restarts for new messages."""
+    import gc
+    import time
+    import weakref
+
+    from agency_swarm.utils.write_behind import WriteBehindConfig
+
+    saved: list[int] = []
+    manager = ThreadManager(
+        save_threads_callback=lambda messages: saved.append(len(messages)),
+        write_behind=WriteBehindConfig(debounce_seconds=0, idle_seconds=0.01),
+    )
+
+    def wait_until_idle(writer):
+        deadline = time.monotonic() + 5
+        while writer._thread is not None and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert writer._thread is None
+
+    manager.add_message({"role": "user", "content": "1", "agent": "A", "callerAgent": None, "timestamp": 1})
+    wait_until_idle(manager._writer)
+    manager.add_message({"role": "user", "content": "2", "agent": "A", "callerAgent": None, "timestamp": 2})
+    wait_until_idle(manager._writer)
+    assert saved == [1, 2]
+
+    # Without a running thread nothing keeps an unclosed manager alive
+    ref = weakref.ref(manager)
+    del manager
+    gc.collect()
+    assert ref() is None
+
+
+@pytest.mark.asyncio
+async def test_agency_aclose_flushes_without_blocking_the_event_loop():
+    """Tests that closing an agency waits for a slow save off the event loop."""
+    import asyncio
+    import threading
+
+    from agency_swarm import Agency, Agent
+    from agency_swarm.utils.write_behind import WriteBehindConfig
+
+    release = threading.Event()
+    saved: list[int] = []
+
+    def slow_save(messages):
+        release.wait(timeout=5)
+        saved.append(len(messages))
+
+    agency = Agency(
+        Agent(name="A", instructions="x"),
+        save_threads_callback=slow_save,
+        write_behind=WriteBehindConfig(debounce_seconds=10),
+    )
+    agency.thread_manager.add_message({"role": "user", "content": "1", "agent": "A", "callerAgent": None})
+
+    closing = asyncio.create_task(agency.aclose())
+    await asyncio.sleep(0.01)
+    # The loop keeps running while the save is blocked
+    assert not closing.done() and saved == []
+
+    release.set()
+    await asyncio.wait_for(closing, timeout=5)
+    assert saved == [1]
+
+
+def test_sqlite_thread_store_loads_slices_lazily(tmp_path, mocker):
+    """Tests that a thread store is read per conversation slice and appended to incrementally."""
+    from agency_swarm.utils.sqlite_store import SQLiteThreadStore
+
+    db_path = tmp_path / "threads.db"
+    store = SQLiteThreadStore(db_path, thread_id="chat-1")
+    history = [
+        {"role": "user", "content": "hi", "agent": "A", "callerAgent": None, "timestamp": 1},
+        {"role": "user", "content": "A->B", "agent": "B", "callerAgent": "A", "timestamp": 2},
+        {"role": "assistant", "content": "B reply", "agent": "B", "callerAgent": "A", "timestamp": 3},
+        {"role": "assistant", "content": "hello", "agent": "A", "callerAgent": None, "timestamp": 4},
+    ]
+    store.append_messages(history, 0)
+    SQLiteThreadStore(db_path, thread_id="other-chat").append_messages(history[:1], 0)
+
+    spy = mocker.spy(store, "get_messages")
+    manager = ThreadManager(thread_store=store)
+    assert spy.call_count == 0  # Nothing is loaded upfront
+
+    new_message = {"role": "user", "content": "again", "agent": "A", "callerAgent": None, "timestamp": 5}
+    manager.add_message(new_message)
+
+    user_thread = manager.get_conversation_history("A")
+    assert [m["content"] for m in user_thread] == ["hi", "hello", "again"]
+    manager.get_conversation_history("A")
+    assert spy.call_count == 1  # Slice is cached after the first read
+    assert [m["content"] for m in manager.get_conversation_history("B", "A")] == ["A->B", "B reply"]
+
+    reopened = SQLiteThreadStore(db_path, thread_id="chat-1")
+    assert reopened.load_messages() == [*history, new_message]
+    assert [seq for seq, _ in reopened.get_page(user_thread=True, limit=2)] == [3, 4]
+
+    with pytest.raises(ValueError):
+        ThreadManager(thread_store=store, load_threads_callback=list)
+
+
+def test_legacy_history_is_migrated_to_sequence_numbers():
+    """Tests that histories without seq are ordered by timestamp once and numbered on load."""
+    legacy = [
+        {"role": "assistant", "content": "second", "agent": "A", "callerAgent": None, "timestamp": 20},
+        {"role": "user", "content": "first", "agent": "A", "callerAgent": None, "timestamp": 10},
+    ]
+    manager = ThreadManager(load_threads_callback=lambda: legacy)
+
+    assert [(m["content"], m["seq"]) for m in manager.get_all_messages()] == [("first", 0), ("second", 1)]
+
+    # New messages continue the sequence regardless of their wall-clock timestamp
+    manager.add_message({"role": "user", "content": "third", "agent": "A", "callerAgent": None, "timestamp": 0})
+    assert [m["content"] for m in manager.get_conversation_history("A")] == ["first", "second", "third"]
+    assert manager.get_all_messages()[-1]["seq"] == 2
+
+    # Already-numbered histories are restored in seq order
+    reloaded = ThreadManager(load_threads_callback=lambda: list(reversed(manager.get_all_messages())))
+    assert [m["content"] for m in reloaded.get_all_messages()] == ["first", "second", "third"]
+
+
+def test_cursor_returns_only_messages_added_since():
+    """Tests that messages_since yields the new tail and cursors survive clear()."""
+    manager = ThreadManager(
+        load_threads_callback=lambda: [{"role": "user", "content": "old", "agent": "A", "callerAgent": None}]
+    )
+    cursor = manager.cursor()
+    assert manager.messages_since(cursor) == []
+
+    manager.add_messages(
+        [
+            {"role": "user", "content": "hi", "agent": "A", "callerAgent": None},
+            {"role": "assistant", "content": "hello", "agent": "A", "callerAgent": None},
+        ]
+    )
+    assert [m["content"] for m in manager.messages_since(cursor)] == ["hi", "hello"]
+    assert [m["content"] for m in manager.messages_since(0)] == ["old", "hi", "hello"]
+
+    cursor = manager.cursor()
+    manager.clear()
+    manager.add_message({"role": "user", "content": "fresh", "agent": "A", "callerAgent": None})
+    assert [m["content"] for m in manager.messages_since(cursor)] == ["fresh"]
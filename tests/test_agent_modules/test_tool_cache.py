@@ -0,0 +1,181 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from agents import FunctionTool
+from pydantic import Field
+
+from agency_swarm import Agency, Agent, BaseTool
+from agency_swarm.tools import ToolCacheConfig, get_tool_cache_stats
+from agency_swarm.tools.cache import ToolResultCache
+
+
+def _counting_tool(name: str, calls: list, delay: float = 0.0, cache=True) -> FunctionTool:
+    async def on_invoke(ctx, input_json: str) -> str:
+        calls.append(input_json)
+        await asyncio.sleep(delay)
+        if "fail" in input_json:
+            return "Error: upstream unavailable"
+        return f"result for {input_json}"
+
+    tool = FunctionTool(name=name, description=name, params_json_schema={}, on_invoke_tool=on_invoke)
+    tool.cache = cache  # type: ignore[attr-defined]
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_base_tool_cache_config_serves_repeated_calls():
+    """Tests ToolConfig.cache on a BaseTool: identical calls hit, other arguments and errors miss."""
+    runs = []
+
+    class CachedLookupTool(BaseTool):
+        """Looks up an artist."""
+
+        artist_id: int = Field(description="Artist id")
+
+        class ToolConfig:
+            cache = ToolCacheConfig(ttl=60, key=lambda args: args["artist_id"])
+
+        def run(self):
+            runs.append(self.artist_id)
+            if self.artist_id < 0:
+                raise ValueError("not found")
+            return f"artist {self.artist_id}"
+
+    agent = Agent(name="CacheAgent", instructions="test", tools=[CachedLookupTool])
+    tool = next(t for t in agent.tools if t.name == "CachedLookupTool")
+
+    assert await tool.on_invoke_tool(None, '{"artist_id": 1}') == "artist 1"
+    assert await tool.on_invoke_tool(None, '{ "artist_id" : 1 }') == "artist 1"
+    assert await tool.on_invoke_tool(None, '{"artist_id": 2}') == "artist 2"
+    await tool.on_invoke_tool(None, '{"artist_id": -1}')
+    await tool.on_invoke_tool(None, '{"artist_id": -1}')
+
+    assert runs == [1, 2, -1, -1]
+    stats = get_tool_cache_stats()["CachedLookupTool"]
+    assert stats.hits == 1 and stats.misses == 4 and stats.size == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_run_once():
+    """Tests single-flight: identical calls issued together share one execution."""
+    calls = []
+    tool = _counting_tool("single_flight_tool", calls, delay=0.02)
+    Agent(name="CacheAgent", instructions="test", tools=[tool])
+
+    results = await asyncio.gather(*(tool.on_invoke_tool(None, '{"q": 1}') for _ in range(5)))
+
+    assert results == ['result for {"q": 1}'] * 5
+    assert len(calls) == 1
+    assert get_tool_cache_stats()["single_flight_tool"].coalesced == 4
+
+
+def test_result_cache_ttl_and_lru_eviction():
+    """Tests expiry after the TTL and eviction of the least recently used output."""
+    cache = ToolResultCache("lru_tool", ToolCacheConfig(ttl=0.05, max_entries=2))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == (True, 1)
+    cache.set("c", 3)
+
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    time.sleep(0.06)
+    assert cache.get("c") == (False, None)
+    stats = cache.get_stats()
+    assert stats.evictions == 1 and stats.expirations == 1 and stats.size == 1
+
+
+@pytest.mark.asyncio
+async def test_thread_and_agency_scopes():
+    """Tests that thread scope is per conversation while agency scope is shared by clones."""
+    thread_calls, agency_calls = [], []
+    thread_tool = _counting_tool("thread_scoped_tool", thread_calls, cache=ToolCacheConfig(scope="thread"))
+    agency_tool = _counting_tool("agency_scoped_tool", agency_calls, cache={"scope": "agency"})
+    agency = Agency(Agent(name="ScopeAgent", instructions="test", tools=[thread_tool, agency_tool]))
+    clone = agency.clone()
+
+    for instance in (agency, agency, clone):
+        ctx = SimpleNamespace(
+            context=SimpleNamespace(thread_manager=instance.thread_manager, _tool_caches=instance.tool_caches)
+        )
+        await thread_tool.on_invoke_tool(ctx, "{}")
+        await agency_tool.on_invoke_tool(ctx, "{}")
+
+    assert len(thread_calls) == 2
+    assert len(agency_calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_backend_survives_new_process_cache(tmp_path):
+    """Tests that process-scoped outputs are reloaded from the SQLite file."""
+    config = ToolCacheConfig(ttl=60, disk_path=tmp_path / "tool_cache.db")
+    calls = []
+
+    async def call():
+        calls.append(1)
+        return {"listeners": 42}
+
+    assert await ToolResultCache("disk_tool", config).get_or_call("k", call) == {"listeners": 42}
+    assert await ToolResultCache("disk_tool", config).get_or_call("k", call) == {"listeners": 42}
+    assert len(calls) == 1
+
+    with pytest.raises(ValueError):
+        ToolCacheConfig(scope="thread", disk_path=tmp_path / "tool_cache.db")
+
+
+@pytest.mark.asyncio
+async def test_same_named_tools_of_different_agents_do_not_share_outputs():
+    """Tests that process-scoped caches are keyed by tool identity and settings, not only by name."""
+    first_calls, second_calls = [], []
+    first = _counting_tool("get_status", first_calls, cache=ToolCacheConfig(ttl=60))
+    second = _counting_tool("get_status", second_calls, cache=ToolCacheConfig(ttl=60))
+    Agent(name="BillingAgent", instructions="test", tools=[first])
+    Agent(name="ShippingAgent", instructions="test", tools=[second])
+
+    for tool in (first, second, first, second):
+        await tool.on_invoke_tool(None, '{"id": 1}')
+
+    assert len(first_calls) == 1 and len(second_calls) == 1
+    assert get_tool_cache_stats()["get_status"].size == 2
+
+
+@pytest.mark.asyncio
+async def test_base_tool_cache_is_shared_across_agents():
+    """Tests that agents using the same BaseTool class share its process-scoped outputs."""
+    runs = []
+
+    class SharedLookupTool(BaseTool):
+        """Looks up a value."""
+
+        class ToolConfig:
+            cache = True
+
+        def run(self):
+            runs.append(1)
+            return "value"
+
+    tools = [
+        next(t for t in Agent(name=name, instructions="test", tools=[SharedLookupTool]).tools)
+        for name in ("First", "Second")
+    ]
+    for tool in tools:
+        assert await tool.on_invoke_tool(None, "{}") == "value"
+
+    assert runs == [1]
+
+
+def test_disk_caches_are_opened_once_under_concurrency(tmp_path):
+    """Tests that concurrent first use of a disk path opens a single SQLite connection."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from agency_swarm.tools import cache as cache_module
+
+    path = tmp_path / "concurrent.db"
+    with patch.object(cache_module, "_DiskCache", side_effect=lambda p: time.sleep(0.01) or object()) as disk:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            opened = list(pool.map(lambda _: cache_module._get_disk_cache(path), range(8)))
+
+    assert disk.call_count == 1 and all(o is opened[0] for o in opened)
@@ -1,8 +1,19 @@
 """Unit tests for tool concurrency management."""
 
+import asyncio
+from types import SimpleNamespace
+
 import pytest
+from agents import FunctionTool
 
-from agency_swarm.tools.concurrency import LockState, ToolConcurrencyManager
+from agency_swarm import Agency, Agent, BaseTool, SendMessage
+from agency_swarm.tools import ToolFactory
+from agency_swarm.tools.concurrency import (
+    DEFAULT_QUEUE_TIMEOUT,
+    ConcurrencyGroup,
+    LockState,
+    ToolConcurrencyManager,
+)
 
 
 class TestLockState:
@@ -182,3 +193,154 @@ class TestToolConcurrencyManager:
         busy, owner = manager.is_lock_active()
         assert busy is False
         assert owner is None
+
+
+def _tracked_tool(name: str, tracker: dict, delay: float = 0.01, **settings) -> FunctionTool:
+    """FunctionTool recording its peak parallelism and the order calls started in."""
+
+    async def on_invoke(ctx, input_json: str) -> str:
+        tracker["running"] += 1
+        tracker["peak"] = max(tracker["peak"], tracker["running"])
+        tracker["order"].append(input_json)
+        await asyncio.sleep(delay)
+        tracker["running"] -= 1
+        return f"{name} done {input_json}"
+
+    tool = FunctionTool(name=name, description=name, params_json_schema={}, on_invoke_tool=on_invoke)
+    for key, value in settings.items():
+        setattr(tool, key, value)
+    return tool
+
+
+def _tracker() -> dict:
+    return {"running": 0, "peak": 0, "order": []}
+
+
+class _CallBackSendMessage(SendMessage):
+    """Stands in for a recipient whose run calls the sender's exclusive tool (A -> B -> A)."""
+
+    async def on_invoke_tool(self, wrapper, arguments_json_string: str) -> str:
+        exclusive = next(tool for tool in self.sender_agent.tools if tool.name == "exclusive")
+        return await exclusive.on_invoke_tool(wrapper, "nested")
+
+
+class TestToolScheduling:
+    """Test queueing of concurrent tool calls through the agent's scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_one_call_tool_calls_are_queued_in_order(self):
+        tracker = _tracker()
+        tool = _tracked_tool("exclusive", tracker, one_call_at_a_time=True)
+        agent = Agent(name="Scheduler", instructions="test", tools=[tool])
+
+        results = await asyncio.gather(*(tool.on_invoke_tool(None, str(i)) for i in range(5)))
+
+        assert results == [f"exclusive done {i}" for i in range(5)]
+        assert tracker["peak"] == 1 and tracker["order"] == [str(i) for i in range(5)]
+        stats = agent.tool_concurrency_manager.get_stats()["exclusive"]
+        assert stats.calls == 5 and stats.active == 0 and stats.waiting == 0
+        assert stats.max_wait_seconds > 0
+
+    @pytest.mark.asyncio
+    async def test_max_concurrency_limits_parallel_calls(self):
+        tracker = _tracker()
+        tool = _tracked_tool("limited", tracker, max_concurrency=2)
+        agent = Agent(name="Scheduler", instructions="test", tools=[tool])
+
+        calls = [asyncio.create_task(tool.on_invoke_tool(None, str(i))) for i in range(6)]
+        await asyncio.sleep(0.001)
+        assert agent.tool_concurrency_manager.get_queue_depth("limited") == 4
+        await asyncio.gather(*calls)
+
+        assert tracker["peak"] == 2
+        assert agent.tool_concurrency_manager.get_queue_depth() == 0
+
+    @pytest.mark.asyncio
+    async def test_waiting_exclusive_call_is_not_starved(self):
+        tracker = _tracker()
+        normal = _tracked_tool("normal", tracker)
+        exclusive = _tracked_tool("exclusive", tracker, one_call_at_a_time=True)
+        Agent(name="Scheduler", instructions="test", tools=[normal, exclusive])
+
+        first = asyncio.create_task(normal.on_invoke_tool(None, "a"))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(exclusive.on_invoke_tool(None, "b")),
+            asyncio.create_task(normal.on_invoke_tool(None, "c")),
+        ]
+        await asyncio.gather(first, *queued)
+
+        assert tracker["order"] == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_returns_error_message(self):
+        tracker = _tracker()
+        tool = _tracked_tool("slow", tracker, delay=0.2, one_call_at_a_time=True, queue_timeout=0.01)
+        agent = Agent(name="Scheduler", instructions="test", tools=[tool])
+
+        results = await asyncio.gather(tool.on_invoke_tool(None, "1"), tool.on_invoke_tool(None, "2"))
+
+        assert results[0] == "slow done 1"
+        assert results[1].startswith("Error: Tool slow could not start within 0.01 seconds")
+        stats = agent.tool_concurrency_manager.get_stats()["slow"]
+        assert stats.timeouts == 1 and stats.calls == 1 and stats.waiting == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrency_group_is_shared_across_agents(self):
+        tracker = _tracker()
+        tool_a = _tracked_tool("query_a", tracker, concurrency_group="database")
+        tool_b = _tracked_tool("query_b", tracker, concurrency_group="database")
+        agent_a = Agent(name="A", instructions="test", tools=[tool_a])
+        agent_b = Agent(name="B", instructions="test", tools=[tool_b])
+        agency = Agency(agent_a, communication_flows=[(agent_a, agent_b)], tool_concurrency_limits={"database": 1})
+        ctx = SimpleNamespace(context=SimpleNamespace(_tool_concurrency_groups=agency.tool_concurrency_groups))
+
+        await asyncio.gather(*(tool.on_invoke_tool(ctx, "q") for tool in (tool_a, tool_b, tool_a, tool_b)))
+
+        assert tracker["peak"] == 1
+        assert agency.tool_concurrency_groups["database"].get_stats().calls == 4
+        assert isinstance(agency.tool_concurrency_groups["database"], ConcurrencyGroup)
+
+    @pytest.mark.asyncio
+    async def test_nested_run_can_call_exclusive_tool_of_sender(self):
+        tracker = _tracker()
+        agent_a = Agent(
+            name="A", instructions="test", tools=[_tracked_tool("exclusive", tracker, one_call_at_a_time=True)]
+        )
+        agent_b = Agent(name="B", instructions="test")
+        Agency(agent_a, communication_flows=[(agent_a, agent_b, _CallBackSendMessage)])
+        send_message = next(tool for tool in agent_a.tools if isinstance(tool, SendMessage))
+
+        result = await asyncio.wait_for(send_message.on_invoke_tool(None, "{}"), timeout=2)
+
+        assert result == "exclusive done nested"
+        assert agent_a.tool_concurrency_manager.get_stats()["exclusive"].calls == 1
+
+    @pytest.mark.asyncio
+    async def test_cloned_agencies_schedule_tools_separately(self):
+        tracker = _tracker()
+        tool = _tracked_tool("exclusive", tracker, delay=0.05, one_call_at_a_time=True)
+        agent = Agent(name="Scheduler", instructions="test", tools=[tool])
+        agency = Agency(agent)
+        clones = [agency.clone(), agency.clone()]
+        contexts = [SimpleNamespace(context=SimpleNamespace(_tool_schedulers=c.tool_schedulers)) for c in clones]
+
+        await asyncio.gather(*(tool.on_invoke_tool(ctx, "q") for ctx in contexts))
+
+        assert tracker["peak"] == 2
+        assert all(c.tool_schedulers["Scheduler"].get_stats()["exclusive"].calls == 1 for c in clones)
+        assert agent.tool_concurrency_manager.get_stats() == {}
+
+    def test_queue_timeout_defaults_to_finite_wait(self):
+        class Lookup(BaseTool):
+            """Looks something up."""
+
+            def run(self) -> str:
+                return "found"
+
+        class Patient(Lookup):
+            class ToolConfig:
+                queue_timeout = None
+
+        assert ToolFactory.adapt_base_tool(Lookup).queue_timeout == DEFAULT_QUEUE_TIMEOUT
+        assert ToolFactory.adapt_base_tool(Patient).queue_timeout is None
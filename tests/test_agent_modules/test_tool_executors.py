@@ -0,0 +1,95 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+from pydantic import Field
+
+from agency_swarm import BaseTool
+from agency_swarm.tools import ToolFactory, get_tool_executor_stats, register_tool_executor
+
+
+class ProcessTool(BaseTool):
+    """Returns the worker process id."""
+
+    value: int = Field(description="Value to square")
+
+    class ToolConfig:
+        executor = "process"
+
+    def run(self):
+        return f"{self.value**2} from {os.getpid()}"
+
+
+@pytest.mark.asyncio
+async def test_named_thread_pool_bounds_calls_and_records_saturation():
+    """Tests that a named pool runs at most max_workers calls and counts queued submissions."""
+    register_tool_executor("test-io-pool", max_workers=2)
+    state = {"running": 0, "peak": 0, "threads": set()}
+    state_lock = threading.Lock()
+
+    class SlowIOTool(BaseTool):
+        """Simulates blocking I/O."""
+
+        class ToolConfig:
+            executor = "test-io-pool"
+
+        def run(self):
+            with state_lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+                state["threads"].add(threading.current_thread().name)
+            time.sleep(0.02)
+            with state_lock:
+                state["running"] -= 1
+            return "done"
+
+    tool = ToolFactory.adapt_base_tool(SlowIOTool)
+    results = await asyncio.gather(*(tool.on_invoke_tool(None, "{}") for _ in range(6)))
+
+    assert results == ["done"] * 6
+    assert state["peak"] == 2
+    assert all(name.startswith("agency-swarm-tool-test-io-pool") for name in state["threads"])
+    stats = get_tool_executor_stats()["test-io-pool"]
+    assert stats.submitted == stats.completed == 6
+    assert stats.saturated == 4 and stats.peak_in_flight == 6 and stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_runs_on_event_loop_thread():
+    """Tests that inline tools run on the calling thread and errors are reported to the model."""
+
+    class InlineTool(BaseTool):
+        """Returns the thread it ran on."""
+
+        fail: bool = False
+
+        class ToolConfig:
+            executor = "inline"
+
+        def run(self):
+            if self.fail:
+                raise ValueError("boom")
+            return threading.current_thread().name
+
+    tool = ToolFactory.adapt_base_tool(InlineTool)
+
+    assert await tool.on_invoke_tool(None, "{}") == threading.current_thread().name
+    assert await tool.on_invoke_tool(None, '{"fail": true}') == "Error running BaseTool: boom"
+    assert get_tool_executor_stats()["inline"].failed >= 1
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_tool_in_worker_process():
+    """Tests that picklable CPU-bound tools run in the shared process pool."""
+    executor = register_tool_executor("process", kind="process", max_workers=1)
+    tool = ToolFactory.adapt_base_tool(ProcessTool)
+
+    try:
+        result = await tool.on_invoke_tool(None, '{"value": 7}')
+    finally:
+        executor.shutdown()
+
+    assert result.startswith("49 from ")
+    assert result != f"49 from {os.getpid()}"
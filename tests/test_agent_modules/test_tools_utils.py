@@ -84,12 +84,12 @@ class TestFromOpenAPISchema:
             }
         }
 
-        with patch("agency_swarm.tools.utils.httpx.AsyncClient") as mock_client_cls:
+        with patch("agency_swarm.tools.http_pool.get_http_client") as mock_get_client:
             client = AsyncMock()
             response = MagicMock()
             response.json.return_value = {"id": "123"}
             client.request.return_value = response
-            mock_client_cls.return_value.__aenter__.return_value = client
+            mock_get_client.return_value = client
 
             from_openapi_schema(base_spec)
             invoke_func = mock_func.call_args.kwargs["on_invoke_tool"]
@@ -112,10 +112,10 @@ class TestFromOpenAPISchema:
             }
         }
 
-        with patch("agency_swarm.tools.utils.httpx.AsyncClient") as mock_client_cls:
+        with patch("agency_swarm.tools.http_pool.get_http_client") as mock_get_client:
             client = AsyncMock()
             client.request.return_value.json.return_value = {"id": "456"}
-            mock_client_cls.return_value.__aenter__.return_value = client
+            mock_get_client.return_value = client
 
             from_openapi_schema(base_spec)
             invoke_func = mock_func.call_args.kwargs["on_invoke_tool"]
@@ -131,13 +131,13 @@ class TestFromOpenAPISchema:
         mock_func, _ = mock_tool_setup
         base_spec["paths"]["/text"] = {"get": {"operationId": "getText", "description": "Get text"}}
 
-        with patch("agency_swarm.tools.utils.httpx.AsyncClient") as mock_client_cls:
+        with patch("agency_swarm.tools.http_pool.get_http_client") as mock_get_client:
             client = AsyncMock()
             response = MagicMock()
             response.json.side_effect = Exception("Not JSON")
             response.text = "plain text"
             client.request.return_value = response
-            mock_client_cls.return_value.__aenter__.return_value = client
+            mock_get_client.return_value = client
 
             from_openapi_schema(base_spec)
             invoke_func = mock_func.call_args.kwargs["on_invoke_tool"]